@@ -0,0 +1,138 @@
+"""
+Auslass-Resonanz aus einem Abgastemperatur-Profil statt einer geschätzten Schallgeschwindigkeit.
+
+Die örtliche Schallgeschwindigkeit folgt aus der Abgastemperatur, c(x) = sqrt(κ R T(x)). Die
+Laufzeit der Welle vom Auslassschlitz bis zur Resonanzlänge ist t = ∫ dx / c(x); aus der
+Bedingung 2 t = φ / (6 n) ergibt sich die Resonanzdrehzahl n = φ / (12 t). Bei konstanter
+Temperatur ist das genau die Formel n = c * φ / (12 * l) aus resonanz.
+
+Temperaturprofile sind Arrays der Form (..., N) auf einem gemeinsamen Gitter x_m (N,), das bei 0
+(Auslassschlitz) beginnt; die führenden Achsen zählen die Profile (z.B. eine Messung pro Lauf
+einer Abstimmfahrt). Die Laufzeit wird einmal pro Profil kumuliert und dann für beliebig viele
+Längen nachgeschlagen, viele Profile × viele Längen sind also eine einzige Array-Operation mit
+Speicherbedarf Profile × (Gitterpunkte + Längen).
+"""
+import numpy as np
+
+from gasdynamik import GAS, schallgeschwindigkeit
+
+
+def temperaturprofil_messpunkte(x_m, mess_x_m, mess_t_k):
+    """
+    Temperaturprofil aus gemessenen Abgastemperaturen (EGT) an festen Messstellen.
+
+    Zwischen den Messstellen wird linear interpoliert, davor und dahinter gilt der
+    nächstgelegene Messwert.
+
+    Args:
+        x_m (array): Gitter in m ab Auslassschlitz, Form (N,).
+        mess_x_m (array): Positionen der Messstellen in m, aufsteigend, Form (M,).
+        mess_t_k (array): Gemessene Temperaturen in K, Form (..., M), eine Zeile pro Profil.
+
+    Returns:
+        np.ndarray: Temperaturen in K, Form (..., N).
+    """
+    x = np.asarray(x_m, dtype=float)
+    mess_x = np.asarray(mess_x_m, dtype=float)
+    mess_t = np.asarray(mess_t_k, dtype=float)
+    if mess_x.ndim != 1 or mess_t.shape[-1:] != mess_x.shape:
+        raise ValueError("mess_t_k braucht als letzte Achse einen Wert pro Messstelle.")
+    if len(mess_x) == 1:
+        return np.broadcast_to(mess_t, mess_t.shape[:-1] + x.shape).copy()
+    if np.any(np.diff(mess_x) <= 0):
+        raise ValueError("Die Messstellen müssen aufsteigend sortiert sein.")
+    rechts = np.clip(np.searchsorted(mess_x, x, side="right"), 1, len(mess_x) - 1)
+    gewicht = np.clip((x - mess_x[rechts - 1]) / (mess_x[rechts] - mess_x[rechts - 1]), 0.0, 1.0)
+    return mess_t[..., rechts - 1] * (1 - gewicht) + mess_t[..., rechts] * gewicht
+
+
+def temperaturprofil_abklingend(x_m, t_auslass_k, t_grenz_k, abklinglaenge_m):
+    """
+    Exponentiell abklingendes Temperaturprofil: T(x) = T_grenz + (T_auslass - T_grenz) * exp(-x / λ).
+
+    Args:
+        x_m (array): Gitter in m ab Auslassschlitz, Form (N,).
+        t_auslass_k (float | array): Abgastemperatur am Auslassschlitz in K.
+        t_grenz_k (float | array): Temperatur, der sich das Abgas weit stromab nähert, in K.
+        abklinglaenge_m (float | array): Länge λ, nach der der Unterschied auf 1/e gefallen ist.
+
+    Returns:
+        np.ndarray: Temperaturen in K, Form (P..., N) mit P... = gemeinsame Form der Parameter.
+    """
+    x = np.asarray(x_m, dtype=float)
+    t_auslass, t_grenz, abklinglaenge = np.broadcast_arrays(
+        *(np.asarray(wert, dtype=float)[..., np.newaxis] for wert in (t_auslass_k, t_grenz_k, abklinglaenge_m))
+    )
+    return t_grenz + (t_auslass - t_grenz) * np.exp(-x / abklinglaenge)
+
+
+def laufzeit_s(x_m, temperatur_k, kappa=GAS["kappa"], r_spezifisch=GAS["r_spezifisch"]):
+    """
+    Kumulierte Laufzeit einer Welle vom Auslassschlitz bis zu jedem Gitterpunkt (Trapezregel).
+
+    Args:
+        x_m (array): Gitter in m, aufsteigend ab 0, Form (N,).
+        temperatur_k (array): Temperaturprofile in K, Form (..., N).
+
+    Returns:
+        np.ndarray: Laufzeit in s, Form (..., N), am ersten Gitterpunkt 0.
+    """
+    x = np.asarray(x_m, dtype=float)
+    if x.ndim != 1 or x[0] != 0 or np.any(np.diff(x) <= 0):
+        raise ValueError("Das Gitter muss bei 0 beginnen und streng aufsteigend sein.")
+    kehrwert = 1.0 / schallgeschwindigkeit(temperatur_k, kappa, r_spezifisch)
+    abschnitte = 0.5 * (kehrwert[..., 1:] + kehrwert[..., :-1]) * np.diff(x)
+    return np.concatenate([np.zeros(kehrwert.shape[:-1] + (1,)), np.cumsum(abschnitte, axis=-1)], axis=-1)
+
+
+def _laufzeit_bis(laenge_m, x_m, laufzeit):
+    """Laufzeit bis zu jeder Länge, Form (..., *laenge.shape); NaN außerhalb des Gitters."""
+    x = np.asarray(x_m, dtype=float)
+    laenge = np.asarray(laenge_m, dtype=float)
+    rechts = np.clip(np.searchsorted(x, laenge, side="right"), 1, len(x) - 1)
+    gewicht = (laenge - x[rechts - 1]) / (x[rechts] - x[rechts - 1])
+    zeit = laufzeit[..., rechts - 1] * (1 - gewicht) + laufzeit[..., rechts] * gewicht
+    return np.where((laenge > 0) & (laenge <= x[-1]), zeit, np.nan)
+
+
+def effektive_schallgeschwindigkeit(laenge_m, x_m, temperatur_k, kappa=GAS["kappa"], r_spezifisch=GAS["r_spezifisch"]):
+    """
+    Mittlere Schallgeschwindigkeit l / t über die Resonanzlänge, für jedes Profil und jede Länge.
+
+    Das ist der Wert, den man in die Formel n = c * φ / (12 * l) einsetzen müsste.
+
+    Args:
+        laenge_m (float | array): Resonanzlängen in m, Form L.
+        x_m (array): Gitter in m, Form (N,); muss die größte Länge abdecken.
+        temperatur_k (array): Temperaturprofile in K, Form (..., N).
+
+    Returns:
+        float | np.ndarray: Schallgeschwindigkeit in m/s, Form (..., *L); NaN für Längen <= 0
+            oder außerhalb des Gitters.
+    """
+    zeit = _laufzeit_bis(laenge_m, x_m, laufzeit_s(x_m, temperatur_k, kappa, r_spezifisch))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c = np.asarray(laenge_m, dtype=float) / zeit
+    return float(c) if c.ndim == 0 else c
+
+
+def auslass_resonanzdrehzahl_profil(laenge_m, oeffnungswinkel_grad, x_m, temperatur_k,
+                                    kappa=GAS["kappa"], r_spezifisch=GAS["r_spezifisch"]):
+    """
+    Auslass-Resonanzdrehzahl aus der Wellenlaufzeit durch ein Temperaturprofil: n = φ / (12 t).
+
+    Args:
+        laenge_m (float | array): Resonanzlängen in m, Form L.
+        oeffnungswinkel_grad (float | array): Auslass-Öffnungswinkel in °KW, muss gegen die
+            Ergebnisform (..., *L) broadcasten.
+        x_m (array): Gitter in m, Form (N,); muss die größte Länge abdecken.
+        temperatur_k (array): Temperaturprofile in K, Form (..., N).
+
+    Returns:
+        float | np.ndarray: Resonanzdrehzahl in U/min, Form (..., *L); NaN für ungültige Eingaben.
+    """
+    zeit = _laufzeit_bis(laenge_m, x_m, laufzeit_s(x_m, temperatur_k, kappa, r_spezifisch))
+    winkel = np.asarray(oeffnungswinkel_grad, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drehzahl = np.where(winkel > 0, winkel / (12 * zeit), np.nan)
+    return float(drehzahl) if drehzahl.ndim == 0 else drehzahl
@@ -0,0 +1,157 @@
+"""
+Umgekehrte Auslegung: aus der Zieldrehzahl die nötige Auslass- und Einlassgeometrie.
+
+Die Resonanzformeln aus resonanz werden geschlossen nach Resonanzlänge, Ansauglänge bzw.
+Vergaserdurchmesser aufgelöst. Für Auslegungen mit Randbedingungen (Längenbereich,
+Vergaser aus einem Katalog) wird für jede Zieldrehzahl und jeden Kandidaten die
+erreichbare Geometrie bestimmt und nach Abweichung von der Zieldrehzahl sortiert.
+Alle Funktionen arbeiten auf Arrays, tausende Zieldrehzahlen gehen in einem Aufruf.
+"""
+import numpy as np
+
+from resonanz import auslass_resonanzdrehzahl, einlass_resonanzdrehzahl
+
+
+def auslass_resonanzlaenge(drehzahl_upm, oeffnungswinkel_grad, schallgeschwindigkeit_ms):
+    """
+    Berechnet die Resonanzlänge, bei der der Auspuff bei der Zieldrehzahl in Resonanz ist.
+
+    Formel: l_r = (c_s * φ) / (12 * n)
+
+    Returns:
+        float | np.ndarray: Die Resonanzlänge in m, NaN für ungültige Eingaben.
+    """
+    drehzahl = np.asarray(drehzahl_upm, dtype=float)
+    winkel = np.asarray(oeffnungswinkel_grad, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        laenge = np.where((drehzahl > 0) & (winkel > 0), schallgeschwindigkeit_ms * winkel / (12 * drehzahl), np.nan)
+    return float(laenge) if laenge.ndim == 0 else laenge
+
+
+def _einlass_kennwert(drehzahl_upm, oeffnungswinkel_grad):
+    # (n / (1750 * φ_eff))², NaN wenn der effektive Winkel nicht positiv ist
+    drehzahl = np.asarray(drehzahl_upm, dtype=float)
+    effektiver_winkel = np.asarray(oeffnungswinkel_grad, dtype=float) - 25
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((drehzahl > 0) & (effektiver_winkel > 0), (drehzahl / (1750 * effektiver_winkel))**2, np.nan)
+
+
+def einlass_ansauglaenge(drehzahl_upm, oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor):
+    """
+    Berechnet die Länge des Ansaugwegs für die Zieldrehzahl.
+
+    Formel: l = F_m / V_k * (1750 * φ_eff / n)²
+
+    Returns:
+        float | np.ndarray: Die Ansauglänge in cm, NaN für ungültige Eingaben.
+    """
+    kurbelhausvolumen_cm3 = np.asarray(hubraum_ccm, dtype=float) * kurbel_faktor
+    querschnitt_cm2 = ansaug_faktor * (np.asarray(vergaser_d_mm, dtype=float) / 10 / 2)**2 * np.pi
+    with np.errstate(divide="ignore", invalid="ignore"):
+        laenge = np.where(
+            (kurbelhausvolumen_cm3 > 0) & (querschnitt_cm2 > 0),
+            querschnitt_cm2 / (kurbelhausvolumen_cm3 * _einlass_kennwert(drehzahl_upm, oeffnungswinkel_grad)),
+            np.nan,
+        )
+    return float(laenge) if laenge.ndim == 0 else laenge
+
+
+def einlass_vergaserdurchmesser(drehzahl_upm, oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, ansaug_faktor, ansaug_laenge):
+    """
+    Berechnet den Vergaserdurchmesser für die Zieldrehzahl.
+
+    Formel: F_m = V_k * l * (n / (1750 * φ_eff))², d = 2 * sqrt(F_m / (Faktor * π))
+
+    Returns:
+        float | np.ndarray: Der Vergaserdurchmesser in mm, NaN für ungültige Eingaben.
+    """
+    kurbelhausvolumen_cm3 = np.asarray(hubraum_ccm, dtype=float) * kurbel_faktor
+    laenge = np.asarray(ansaug_laenge, dtype=float)
+    querschnitt_cm2 = kurbelhausvolumen_cm3 * laenge * _einlass_kennwert(drehzahl_upm, oeffnungswinkel_grad)
+    with np.errstate(invalid="ignore"):
+        durchmesser = np.where(
+            (kurbelhausvolumen_cm3 > 0) & (laenge > 0) & (np.asarray(ansaug_faktor) > 0),
+            20 * np.sqrt(querschnitt_cm2 / (ansaug_faktor * np.pi)),
+            np.nan,
+        )
+    return float(durchmesser) if durchmesser.ndim == 0 else durchmesser
+
+
+def _rangliste(ziel, kandidaten, benoetigt, erreichbar, drehzahl, anzahl):
+    """Sortiert die Kandidaten je Zieldrehzahl: machbare zuerst, dann nach Abweichung."""
+    abweichung = drehzahl - ziel[:, np.newaxis]
+    machbar = np.isclose(benoetigt, erreichbar) & ~np.isnan(drehzahl)
+    # Auf 1e-6 U/min gerundet, damit Rundungsrauschen die Reihenfolge bei Gleichstand nicht bestimmt
+    schluessel = np.where(np.isnan(abweichung), np.inf, np.round(np.abs(abweichung), 6))
+    reihenfolge = np.lexsort((schluessel, ~machbar), axis=-1)[:, :anzahl]
+
+    def sortiert(werte):
+        return np.take_along_axis(np.broadcast_to(werte, abweichung.shape), reihenfolge, axis=-1)
+
+    ergebnis = {name: sortiert(werte) for name, werte in kandidaten.items()}
+    ergebnis["drehzahl_upm"] = sortiert(drehzahl)
+    ergebnis["abweichung_upm"] = sortiert(abweichung)
+    ergebnis["machbar"] = sortiert(machbar)
+    return ergebnis
+
+
+def auslass_auslegung(ziel_drehzahlen_upm, oeffnungswinkel_grad, schallgeschwindigkeit_ms=500.0,
+                      laenge_min_m=0.0, laenge_max_m=np.inf, anzahl=None):
+    """
+    Sucht für viele Zieldrehzahlen die passende Resonanzlänge aus mehreren Auslass-Steuerzeiten.
+
+    Je Zieldrehzahl und Öffnungswinkel wird die Resonanzlänge geschlossen berechnet. Liegt sie
+    außerhalb des erlaubten Bereichs, wird die nächste erlaubte Länge genommen (die Drehzahl ist
+    in der Länge monoton, das ist also die bestmögliche Lösung) und die erreichte Drehzahl angegeben.
+
+    Args:
+        ziel_drehzahlen_upm (array): Zieldrehzahlen in U/min, Form (T,).
+        oeffnungswinkel_grad (array): Mögliche Auslass-Öffnungswinkel in °KW, Form (K,).
+        schallgeschwindigkeit_ms (float): Schallgeschwindigkeit im Abgas in m/s.
+        laenge_min_m (float): Kürzeste erlaubte Resonanzlänge in m.
+        laenge_max_m (float): Längste erlaubte Resonanzlänge in m.
+        anzahl (int): Nur die besten anzahl Kandidaten je Zieldrehzahl zurückgeben.
+
+    Returns:
+        dict: Arrays der Form (T, anzahl), je Zeile nach Rang sortiert: "oeffnungswinkel_grad",
+            "laenge_m", "drehzahl_upm", "abweichung_upm" und "machbar" (Länge im Bereich).
+    """
+    ziel = np.atleast_1d(np.asarray(ziel_drehzahlen_upm, dtype=float))
+    winkel = np.atleast_1d(np.asarray(oeffnungswinkel_grad, dtype=float))[np.newaxis, :]
+    benoetigt = auslass_resonanzlaenge(ziel[:, np.newaxis], winkel, schallgeschwindigkeit_ms)
+    laenge = np.clip(benoetigt, laenge_min_m, laenge_max_m)
+    drehzahl = auslass_resonanzdrehzahl(laenge, winkel, schallgeschwindigkeit_ms)
+    return _rangliste(ziel, {"oeffnungswinkel_grad": winkel, "laenge_m": laenge}, benoetigt, laenge, drehzahl, anzahl)
+
+
+def einlass_auslegung(ziel_drehzahlen_upm, oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, ansaug_faktor,
+                      vergaser_katalog_mm, ansaug_laenge_min=0.0, ansaug_laenge_max=np.inf, anzahl=None):
+    """
+    Wählt für viele Zieldrehzahlen Vergaser aus einem Katalog und die passende Ansauglänge.
+
+    Je Zieldrehzahl und Katalog-Vergaser wird die Ansauglänge geschlossen berechnet und auf den
+    erlaubten Bereich begrenzt. Die Kandidaten werden nach Machbarkeit und Abweichung von der
+    Zieldrehzahl sortiert, bei gleicher Abweichung der größere Vergaser zuerst.
+
+    Args:
+        ziel_drehzahlen_upm (array): Zieldrehzahlen in U/min, Form (T,).
+        oeffnungswinkel_grad (float): Gemessener Einlass-Öffnungswinkel in °KW.
+        hubraum_ccm (float): Hubraum in cm³.
+        kurbel_faktor (float): Kurbelhausvolumen als Vielfaches des Hubraums.
+        ansaug_faktor (float): Faktor für die mittlere Ansaugfläche.
+        vergaser_katalog_mm (array): Lieferbare Vergaserdurchmesser in mm, Form (K,).
+        ansaug_laenge_min (float): Kürzester möglicher Ansaugweg in cm.
+        ansaug_laenge_max (float): Längster möglicher Ansaugweg in cm.
+        anzahl (int): Nur die besten anzahl Kandidaten je Zieldrehzahl zurückgeben.
+
+    Returns:
+        dict: Arrays der Form (T, anzahl), je Zeile nach Rang sortiert: "vergaser_d_mm",
+            "ansaug_laenge", "drehzahl_upm", "abweichung_upm" und "machbar" (Länge im Bereich).
+    """
+    ziel = np.atleast_1d(np.asarray(ziel_drehzahlen_upm, dtype=float))
+    # Absteigend sortiert, damit der stabile Sortierschritt bei Gleichstand den größeren Vergaser bevorzugt
+    vergaser = np.sort(np.atleast_1d(np.asarray(vergaser_katalog_mm, dtype=float)))[::-1][np.newaxis, :]
+    benoetigt = einlass_ansauglaenge(ziel[:, np.newaxis], oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser, ansaug_faktor)
+    laenge = np.clip(benoetigt, ansaug_laenge_min, ansaug_laenge_max)
+    drehzahl = einlass_resonanzdrehzahl(oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser, ansaug_faktor, laenge)
+    return _rangliste(ziel, {"vergaser_d_mm": vergaser, "ansaug_laenge": laenge}, benoetigt, laenge, drehzahl, anzahl)
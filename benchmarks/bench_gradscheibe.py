@@ -0,0 +1,105 @@
+"""
+Geschwindigkeitsvergleich der Gradscheiben-Darstellung.
+
+Vergleicht die bisherige Darstellung (360 ax.plot- und 36 ax.text-Aufrufe pro Anfrage,
+unverändert aus den Apps übernommen) mit dem Modul gradscheibe: einer neu aufgebauten Figur
+mit LineCollection und dem Blitting über den zwischengespeicherten Hintergrund.
+
+Aufruf aus dem Projektverzeichnis:
+    python benchmarks/bench_gradscheibe.py
+"""
+import os
+import sys
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import gradscheibe
+
+ZIEL_MS = 50.0
+
+
+# ==============================================================================
+# Bisherige Implementierung als Referenz
+# ==============================================================================
+def _plotte_gradscheibe_alt(zuendwinkel):
+    fig, ax = plt.subplots(figsize=(10, 10), subplot_kw={'projection': 'polar'})
+    ax.set_theta_zero_location('N')
+    ax.set_theta_direction(-1)
+    ax.set_yticklabels([])
+    ax.set_rgrids([])
+    ax.spines['polar'].set_visible(False)
+    ax.set_ylim(0, 1.2)
+    for grad in range(0, 360):
+        winkel_rad = np.deg2rad(grad)
+        if grad % 10 == 0:
+            ax.plot([winkel_rad, winkel_rad], [0.9, 1.0], color='black', linewidth=1.5)
+            ax.text(winkel_rad, 1.05, str(grad), ha='center', va='center', fontsize=12, weight='bold')
+        elif grad % 5 == 0:
+            ax.plot([winkel_rad, winkel_rad], [0.95, 1.0], color='black', linewidth=1)
+        else:
+            ax.plot([winkel_rad, winkel_rad], [0.98, 1.0], color='gray', linewidth=0.5)
+    if zuendwinkel is not None and 0 < zuendwinkel < 360:
+        zuendwinkel_rad = np.deg2rad(zuendwinkel)
+        ax.plot([zuendwinkel_rad, zuendwinkel_rad], [0.85, 1.0], color='red', linewidth=2.5, zorder=10)
+        ax.text(zuendwinkel_rad, 0.8, f'Zündung\n({zuendwinkel:.1f}°)', ha='center', va='center', fontsize=14, weight='bold', color='red', rotation=-zuendwinkel)
+    ax.text(0, 0, 'Gradscheibe\nOT bei 0°', ha='center', va='center', fontsize=16, weight='bold')
+    ax.annotate('Motordrehrichtung',
+                xy=np.deg2rad([300, 1]),
+                xytext=np.deg2rad([300, 0.6]),
+                arrowprops=dict(arrowstyle="<-", color="blue", linewidth=2, connectionstyle="arc3,rad=0.2"),
+                ha='center', va='center', fontsize=12, color='blue')
+    return fig
+
+
+def _als_bild(fig):
+    fig.canvas.draw()
+    bild = np.asarray(fig.canvas.buffer_rgba()).copy()
+    plt.close(fig)
+    return bild
+
+
+# ==============================================================================
+# Messung
+# ==============================================================================
+def _messe(funktion, wiederholungen):
+    zeiten = []
+    for i in range(wiederholungen):
+        start = time.perf_counter()
+        funktion(10.0 + i * 0.7)
+        zeiten.append(time.perf_counter() - start)
+    return 1000 * float(np.median(zeiten))
+
+
+def messe_darstellung(wiederholungen=10):
+    """
+    Misst die mittlere Zeit pro Darstellung in ms.
+
+    Returns:
+        dict: Variante -> Median der Darstellungszeit in ms.
+    """
+    ergebnisse = {
+        "alt (360x ax.plot)": _messe(lambda w: _als_bild(_plotte_gradscheibe_alt(w)), wiederholungen),
+        "neu, Figur mit LineCollection": _messe(lambda w: _als_bild(gradscheibe.plotte_gradscheibe(w)), wiederholungen),
+    }
+
+    gradscheibe._hintergrund.cache_clear()
+    start = time.perf_counter()
+    gradscheibe.rendere_gradscheibe(21.86)
+    ergebnisse["neu, Blitting kalt"] = 1000 * (time.perf_counter() - start)
+    ergebnisse["neu, Blitting warm"] = _messe(gradscheibe.rendere_gradscheibe, wiederholungen * 10)
+    return ergebnisse
+
+
+if __name__ == "__main__":
+    ergebnisse = messe_darstellung()
+    referenz = ergebnisse["alt (360x ax.plot)"]
+    for name, ms in ergebnisse.items():
+        print(f"  {name:32s} {ms:8.1f} ms  (Faktor {referenz / ms:6.1f}x)")
+    warm = ergebnisse["neu, Blitting warm"]
+    print(f"Ziel < {ZIEL_MS:.0f} ms für die erneute Darstellung: {'erreicht' if warm < ZIEL_MS else 'VERFEHLT'}")
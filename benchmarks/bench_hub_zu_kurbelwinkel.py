@@ -0,0 +1,147 @@
+"""
+Genauigkeits- und Geschwindigkeitsvergleich für hub_zu_kurbelwinkel.
+
+Vergleicht die geschlossene Lösung aus kinematik mit der bisherigen Intervallschachtelung
+(100 Schritte über 0-180°, unverändert aus den Apps übernommen).
+
+Aufruf aus dem Projektverzeichnis:
+    python benchmarks/bench_hub_zu_kurbelwinkel.py
+"""
+import math
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from kinematik import hub_zu_kurbelwinkel, hub_zu_kurbelwinkel_beide, kurbelwinkel_zu_hub_exakt
+
+
+# ==============================================================================
+# Bisherige Implementierung als Referenz
+# ==============================================================================
+def _kurbelwinkel_zu_hub_alt(kurbelwinkel_grad, pleuelstange_mm, hub_mm):
+    if hub_mm <= 0 or pleuelstange_mm <= 0:
+        return 0.0
+    radius_mm = hub_mm / 2.0
+    if pleuelstange_mm < radius_mm:
+        raise ValueError("Pleuellänge muss größer als der Kurbelradius sein.")
+    kurbelwinkel_rad = math.radians(kurbelwinkel_grad)
+    l_r_verhaeltnis = pleuelstange_mm / radius_mm
+    innerhalb_der_wurzel_wert = l_r_verhaeltnis**2 - math.sin(kurbelwinkel_rad)**2
+    if innerhalb_der_wurzel_wert < 0:
+        innerhalb_der_wurzel_wert = 0
+    return radius_mm * (
+        1 + l_r_verhaeltnis - math.cos(kurbelwinkel_rad) - math.sqrt(innerhalb_der_wurzel_wert)
+    )
+
+
+def _hub_zu_kurbelwinkel_alt(kolbenweg_mm, pleuelstange_mm, hub_mm, toleranz=0.0001):
+    if hub_mm <= 0 or pleuelstange_mm <= 0 or kolbenweg_mm < 0:
+        return 0.0
+    if kolbenweg_mm > hub_mm:
+        return 180.0
+    winkel_unten = 0.0
+    winkel_oben = 180.0
+    for _ in range(100):
+        test_winkel = (winkel_unten + winkel_oben) / 2
+        berechneter_hub = _kurbelwinkel_zu_hub_alt(test_winkel, pleuelstange_mm, hub_mm)
+        if abs(berechneter_hub - kolbenweg_mm) < toleranz:
+            return test_winkel
+        if berechneter_hub > kolbenweg_mm:
+            winkel_oben = test_winkel
+        else:
+            winkel_unten = test_winkel
+    return (winkel_unten + winkel_oben) / 2
+
+
+# ==============================================================================
+# Genauigkeit
+# ==============================================================================
+def pruefe_genauigkeit(anzahl=20000, seed=0):
+    """
+    Prüft die geschlossene Lösung gegen die Intervallschachtelung und gegen die Vorwärtsformel.
+
+    Raises:
+        AssertionError: Wenn eine der Abweichungen die Grenzen überschreitet.
+    """
+    rng = np.random.default_rng(seed)
+    hub = rng.uniform(30.0, 70.0, anzahl)
+    pleuel = rng.uniform(1.6, 3.0, anzahl) * hub
+    kolbenweg = rng.uniform(0.0, 1.0, anzahl) * hub
+
+    nach_ot, vor_ot = hub_zu_kurbelwinkel_beide(kolbenweg, pleuel, hub)
+    neu = hub_zu_kurbelwinkel(kolbenweg, pleuel, hub)
+    alt = np.array([_hub_zu_kurbelwinkel_alt(*werte) for werte in zip(kolbenweg, pleuel, hub)])
+
+    # Die geschlossene Lösung muss die Vorwärtsformel in beiden Lösungen exakt treffen
+    fehler_nach = np.max(np.abs(kurbelwinkel_zu_hub_exakt(nach_ot, pleuel, hub) - kolbenweg))
+    fehler_vor = np.max(np.abs(kurbelwinkel_zu_hub_exakt(vor_ot, pleuel, hub) - kolbenweg))
+    assert fehler_nach < 1e-9, fehler_nach
+    assert fehler_vor < 1e-9, fehler_vor
+    assert np.array_equal(neu, nach_ot)
+
+    # Die Intervallschachtelung hält nur 0.0001 mm Hubtoleranz ein. An den Totpunkten ist
+    # die Hubkurve flach, der erlaubte Winkelfehler ist dort entsprechend größer.
+    hub_fehler_alt = np.max(np.abs(kurbelwinkel_zu_hub_exakt(alt, pleuel, hub) - kolbenweg))
+    assert hub_fehler_alt < 1e-4, hub_fehler_alt
+    steigung = np.abs(kurbelwinkel_zu_hub_exakt(neu + 1e-3, pleuel, hub)
+                      - kurbelwinkel_zu_hub_exakt(neu - 1e-3, pleuel, hub)) / 2e-3
+    winkelabstand = np.abs(neu - alt)
+    erlaubt = 1e-4 / np.maximum(steigung, 1e-12) + 1e-6
+    auffaellig = ~np.isclose(alt, 0.0) & ~np.isclose(alt, 180.0) & (winkelabstand > erlaubt)
+    assert not np.any(auffaellig), winkelabstand[auffaellig]
+
+    # Randfälle wie bisher, an den Totpunkten jetzt exakt
+    for werte in [(-1.0, 85.0, 44.0), (2.0, 0.0, 44.0), (2.0, 85.0, 0.0), (50.0, 85.0, 44.0)]:
+        assert hub_zu_kurbelwinkel(*werte) == _hub_zu_kurbelwinkel_alt(*werte), werte
+    assert hub_zu_kurbelwinkel(0.0, 85.0, 44.0) == 0.0
+    assert hub_zu_kurbelwinkel(44.0, 85.0, 44.0) == 180.0
+
+    return {
+        "max_hubfehler_neu_mm": max(fehler_nach, fehler_vor),
+        "max_hubfehler_alt_mm": hub_fehler_alt,
+        "max_winkelabstand_grad": float(np.max(winkelabstand)),
+    }
+
+
+# ==============================================================================
+# Geschwindigkeit
+# ==============================================================================
+def messe_geschwindigkeit(anzahl=10000, wiederholungen=5):
+    """Misst die Zeit pro Abfrage für alt (skalar), neu (skalar) und neu (Array)."""
+    rng = np.random.default_rng(1)
+    kolbenweg = rng.uniform(0.0, 44.0, anzahl)
+    werte = kolbenweg.tolist()
+
+    def alt_skalar():
+        for s in werte[:1000]:
+            _hub_zu_kurbelwinkel_alt(s, 85.0, 44.0)
+
+    def neu_skalar():
+        for s in werte[:1000]:
+            hub_zu_kurbelwinkel(s, 85.0, 44.0)
+
+    def neu_array():
+        hub_zu_kurbelwinkel(kolbenweg, 85.0, 44.0)
+
+    zeiten = {
+        "alt_skalar": min(timeit.repeat(alt_skalar, number=1, repeat=wiederholungen)) / 1000,
+        "neu_skalar": min(timeit.repeat(neu_skalar, number=1, repeat=wiederholungen)) / 1000,
+        "neu_array": min(timeit.repeat(neu_array, number=1, repeat=wiederholungen)) / anzahl,
+    }
+    return zeiten
+
+
+if __name__ == "__main__":
+    genauigkeit = pruefe_genauigkeit()
+    print("Genauigkeit:")
+    for name, wert in genauigkeit.items():
+        print(f"  {name}: {wert:.3g}")
+
+    zeiten = messe_geschwindigkeit()
+    print("Zeit pro Abfrage:")
+    for name, wert in zeiten.items():
+        print(f"  {name}: {wert * 1e6:8.3f} µs  (Faktor {zeiten['alt_skalar'] / wert:7.1f}x)")
@@ -0,0 +1,126 @@
+"""
+Genauigkeit, Durchsatz und Speicherbedarf der Prüfstandsauswertung.
+
+Erzeugt synthetische 1-kHz-Protokolle (Drehzahlrampen zwischen 4000 und 13000 U/min) für eine
+Konfiguration, deren Drehmomentkurve Resonanzbuckel bei bekannter Schallgeschwindigkeit und
+Winkelkorrektur hat. Die Protokolle werden blockweise geschrieben, auch die Erzeugung braucht also
+keinen Speicher proportional zur Länge. Geprüft wird, dass die Anpassung die vorgegebenen Werte
+aus CSV und Binärdatei wiederfindet, und dass der Spitzenspeicher der Auswertung (eigener Prozess)
+für ein Protokoll und ein zehnmal längeres gleich ist.
+
+Aufruf aus dem Projektverzeichnis:
+    python benchmarks/bench_pruefstand.py --sekunden 20000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+PROJEKT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJEKT)
+
+import pruefstand
+
+KONFIGURATION = {
+    "hub_mm": 54.5, "pleuel_mm": 110.0, "ot_abstand_mm": 0.5, "auslass_mm": 25.5, "einlass_mm": 26.0,
+    "resonanzlaenge_m": 0.85, "schall_ms": 500.0,
+    "hubraum_ccm": 125.0, "kurbel_faktor": 2.2, "vergaser_d_mm": 34.0, "ansaug_faktor": 1.1, "ansaug_laenge_cm": 45.0,
+}
+# Werte, die in den synthetischen Protokollen "in Wirklichkeit" gelten
+SCHALL_WAHR_MS = 530.0
+KORREKTUR_WAHR_GRAD = 30.0
+
+
+def wahre_resonanzen():
+    vorhersage = pruefstand.vorhersagen(KONFIGURATION)
+    auslass, einlass = vorhersage["auslass"], vorhersage["einlass"]
+    n_auslass = SCHALL_WAHR_MS * auslass["oeffnungswinkel_grad"] / (12 * auslass["laenge_m"])
+    # Die Einlassformel ist linear in (φ - k): aus der Vorhersage mit 25° auf k umrechnen
+    steigung = einlass["drehzahl_upm"] / (einlass["oeffnungswinkel_grad"] - pruefstand.EINLASS_KORREKTUR_GRAD)
+    n_einlass = steigung * (einlass["oeffnungswinkel_grad"] - KORREKTUR_WAHR_GRAD)
+    return n_auslass, n_einlass
+
+
+def erzeuge_protokoll(pfad, sekunden, zufall, blocksekunden=100):
+    """Schreibt ein 1-kHz-Protokoll als CSV (.csv) oder rohe float32-Datensätze (drehzahl, egt, drehmoment)."""
+    n_auslass, n_einlass = wahre_resonanzen()
+    als_csv = pfad.endswith(".csv")
+    with open(pfad, "w" if als_csv else "wb") as datei:
+        if als_csv:
+            datei.write("zeit_s,drehzahl,egt_c,drehmoment_nm\n")
+        for start in range(0, sekunden, blocksekunden):
+            zeit = start + np.arange(min(blocksekunden, sekunden - start) * 1000) / 1000.0
+            # Dreieckige Rampen 4000 -> 13000 -> 4000 U/min mit 30 s Periode
+            phase = (zeit % 30.0) / 15.0
+            drehzahl = 4000 + 9000 * np.where(phase < 1, phase, 2 - phase) + zufall.normal(0, 20, zeit.size)
+            drehmoment = (10 + 2 * np.exp(-((drehzahl - 8500) / 6000)**2)
+                          + 2.0 * np.exp(-0.5 * ((drehzahl - n_auslass) / 400)**2)
+                          + 1.5 * np.exp(-0.5 * ((drehzahl - n_einlass) / 400)**2)
+                          + zufall.normal(0, 0.5, zeit.size))
+            egt = 450 + 0.035 * drehzahl + zufall.normal(0, 5, zeit.size)
+            if als_csv:
+                np.savetxt(datei, np.column_stack([zeit, drehzahl, egt, drehmoment]), fmt="%.3f", delimiter=",")
+            else:
+                np.column_stack([drehzahl, egt, drehmoment]).astype(np.float32).tofile(datei)
+
+
+def pruefe_genauigkeit(verzeichnis, zufall):
+    n_auslass, n_einlass = wahre_resonanzen()
+    ergebnisse = {}
+    for endung in ("csv", "bin"):
+        pfad = os.path.join(verzeichnis, f"genau.{endung}")
+        erzeuge_protokoll(pfad, 600, zufall)
+        auswertung = pruefstand.werte_aus([pfad], KONFIGURATION)
+        anpassung = auswertung["anpassung"]
+        c = anpassung["auslass"]["schallgeschwindigkeit_ms"]
+        k = anpassung["einlass"]["winkelkorrektur_grad"]
+        print(f"  {endung}: Maxima bei {auswertung['zuordnung']['auslass']['drehzahl_upm']:.0f} / "
+              f"{auswertung['zuordnung']['einlass']['drehzahl_upm']:.0f} U/min (wahr {n_auslass:.0f} / {n_einlass:.0f}), "
+              f"c = {c:.1f} m/s (wahr {SCHALL_WAHR_MS:g}), k = {k:.2f}° (wahr {KORREKTUR_WAHR_GRAD:g})")
+        assert abs(c - SCHALL_WAHR_MS) < 0.01 * SCHALL_WAHR_MS, c
+        assert abs(k - KORREKTUR_WAHR_GRAD) < 1.0, k
+        ergebnisse[endung] = (c, k)
+    return ergebnisse
+
+
+def messe_speicher(pfad, konfiguration):
+    """Laufzeit und Spitzenspeicher der Auswertung über die Kommandozeile in einem eigenen Prozess."""
+    skript = (
+        "import resource, subprocess, sys\n"
+        "subprocess.run(sys.argv[1:], check=True, stdout=subprocess.DEVNULL)\n"
+        "print(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)\n"
+    )
+    start = time.perf_counter()
+    ausgabe = subprocess.run([sys.executable, "-c", skript, sys.executable, os.path.join(PROJEKT, "pruefstand.py"),
+                              pfad, "--konfiguration", konfiguration], check=True, capture_output=True, text=True)
+    return time.perf_counter() - start, int(ausgabe.stdout.split()[-1]) / 1024
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genauigkeit und Speicherbedarf der Prüfstandsauswertung.")
+    parser.add_argument("--sekunden", type=int, default=20000, help="Länge des langen Binärprotokolls in s (1 kHz)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    zufall = np.random.default_rng(args.seed)
+
+    with tempfile.TemporaryDirectory() as verzeichnis:
+        print("Genauigkeit (10 min Protokoll):")
+        pruefe_genauigkeit(verzeichnis, zufall)
+
+        konfiguration = os.path.join(verzeichnis, "motor.json")
+        with open(konfiguration, "w", encoding="utf-8") as datei:
+            json.dump(KONFIGURATION, datei)
+        print("Speicher und Durchsatz (rohe float32-Datensätze):")
+        # Beide Protokolle länger als ein Block: der Spitzenspeicher darf nicht mit der Länge wachsen
+        for sekunden in (args.sekunden // 10, args.sekunden):
+            pfad = os.path.join(verzeichnis, f"lauf_{sekunden}.bin")
+            erzeuge_protokoll(pfad, sekunden, zufall)
+            groesse = os.path.getsize(pfad) / 1e6
+            dauer, speicher = messe_speicher(pfad, konfiguration)
+            print(f"  {groesse:8.1f} MB in {dauer:6.2f} s ({groesse / dauer:6.0f} MB/s), Spitzenspeicher {speicher:5.0f} MB")
+            os.remove(pfad)
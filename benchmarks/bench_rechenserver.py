@@ -0,0 +1,146 @@
+"""
+Lasttest für den Rechenserver: Anfragen pro Sekunde und Latenz-Perzentile.
+
+Startet rechenserver.py als eigenen Prozess auf einem freien Port (oder nutzt mit --port
+einen laufenden Server) und schickt über mehrere gleichzeitige Keep-Alive-Verbindungen
+Anfragen an die Endpunkte. Mit --verschiedene wird festgelegt, aus wie vielen
+verschiedenen Eingaben gezogen wird; weniger verschiedene Eingaben bedeuten mehr Cache-Treffer.
+
+Aufruf aus dem Projektverzeichnis:
+    python benchmarks/bench_rechenserver.py --anfragen 5000 --verbindungen 16 --punkte 100
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+PROJEKT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def _eingaben(verschiedene, punkte, zufall):
+    """Erzeugt verschiedene Anfragen (Pfad, Körper) mit je punkte Elementen pro Liste."""
+    anfragen = []
+    for i in range(verschiedene):
+        werte = [round(zufall.uniform(0.5, 1.5), 4) for _ in range(punkte)]
+        art = i % 3
+        if art == 0:
+            pfad, daten = "/resonanz/auslass", {"laenge_m": werte, "oeffnungswinkel_grad": 190, "schallgeschwindigkeit_ms": 500}
+        elif art == 1:
+            pfad, daten = "/kinematik/kurbelwinkel", {"kolbenweg_mm": [w * 20 for w in werte], "pleuelstange_mm": 110, "hub_mm": 54}
+        else:
+            pfad, daten = "/steuerzeiten", {"kanal_hoehen_mm": {"auslass": [w * 23 for w in werte], "ueberstroemer": 28.5},
+                                           "hub_mm": 54, "pleuelstange_mm": 110, "einlass_kolbenweg_mm": 10}
+        anfragen.append((pfad, json.dumps(daten).encode("utf-8")))
+    return anfragen
+
+
+async def _anfrage(leser, schreiber, methode, pfad, koerper=b""):
+    schreiber.write(
+        f"{methode} {pfad} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(koerper)}\r\n\r\n".encode("latin-1") + koerper
+    )
+    await schreiber.drain()
+    status = int((await leser.readline()).split()[1])
+    laenge = 0
+    while (zeile := await leser.readline()) not in (b"\r\n", b""):
+        name, _, wert = zeile.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            laenge = int(wert)
+    return status, await leser.readexactly(laenge)
+
+
+async def _client(port, auftraege, latenzen):
+    leser, schreiber = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        while auftraege:
+            pfad, koerper = auftraege.pop()
+            start = time.perf_counter()
+            status, _ = await _anfrage(leser, schreiber, "POST", pfad, koerper)
+            latenzen.append(time.perf_counter() - start)
+            if status != 200:
+                raise RuntimeError(f"{pfad} lieferte HTTP {status}")
+    finally:
+        schreiber.close()
+
+
+async def lasttest(port, anfragen, verbindungen, verschiedene, punkte, seed=1):
+    """
+    Schickt anfragen Anfragen über verbindungen gleichzeitige Verbindungen.
+
+    Returns:
+        dict: Anfragen pro Sekunde, Latenz-Perzentile in ms und die Cache-Statistik des Servers.
+    """
+    zufall = random.Random(seed)
+    # Mehr verschiedene Eingaben als Anfragen können ohnehin nicht vorkommen
+    vorrat = _eingaben(min(verschiedene, anfragen), punkte, zufall)
+    auftraege = [zufall.choice(vorrat) for _ in range(anfragen)]
+    latenzen = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(port, auftraege, latenzen) for _ in range(verbindungen)))
+    dauer = time.perf_counter() - start
+
+    leser, schreiber = await asyncio.open_connection("127.0.0.1", port)
+    _, cache = await _anfrage(leser, schreiber, "GET", "/cache")
+    schreiber.close()
+
+    latenzen_ms = np.array(latenzen) * 1000
+    return {
+        "anfragen_pro_s": len(latenzen) / dauer,
+        "p50_ms": float(np.percentile(latenzen_ms, 50)),
+        "p99_ms": float(np.percentile(latenzen_ms, 99)),
+        "max_ms": float(latenzen_ms.max()),
+        "cache": json.loads(cache),
+    }
+
+
+def _freier_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _starte_server(port, cache_groesse):
+    prozess = subprocess.Popen(
+        [sys.executable, os.path.join(PROJEKT, "rechenserver.py"), "--port", str(port), "--cache", str(cache_groesse)],
+        cwd=PROJEKT, stdout=subprocess.PIPE, text=True,
+    )
+    prozess.stdout.readline()  # wartet auf "Rechenserver läuft ..."
+    return prozess
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lasttest für rechenserver.py")
+    parser.add_argument("--port", type=int, default=None, help="Laufenden Server nutzen statt einen zu starten")
+    parser.add_argument("--anfragen", type=int, default=5000)
+    parser.add_argument("--verbindungen", type=int, default=16)
+    parser.add_argument("--verschiedene", type=int, default=500, help="Anzahl verschiedener Eingaben")
+    parser.add_argument("--punkte", type=int, default=100, help="Elemente pro Liste in jeder Anfrage")
+    parser.add_argument("--cache", dest="cache_groesse", type=int, default=4096)
+    args = parser.parse_args()
+
+    server = None
+    port = args.port
+    if port is None:
+        port = _freier_port()
+        server = _starte_server(port, args.cache_groesse)
+    try:
+        ergebnis = asyncio.run(lasttest(port, args.anfragen, args.verbindungen, args.verschiedene, args.punkte))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    cache = ergebnis["cache"]
+    print(f"{args.anfragen} Anfragen, {args.verbindungen} Verbindungen, {args.punkte} Punkte je Anfrage")
+    print(f"  Durchsatz:  {ergebnis['anfragen_pro_s']:8.0f} Anfragen/s")
+    print(f"  Latenz:     p50 {ergebnis['p50_ms']:.2f} ms, p99 {ergebnis['p99_ms']:.2f} ms, max {ergebnis['max_ms']:.2f} ms")
+    print(f"  Cache:      {cache['treffer']} Treffer, {cache['fehlschlaege']} Fehlschläge "
+          f"({cache['trefferquote']:.0%}), {cache['eintraege']}/{cache['max_eintraege']} Einträge")
@@ -0,0 +1,351 @@
+"""
+Benchmark- und Regressionssuite für alle Rechnungen, die Gradscheibe und die App-Callbacks.
+
+1. Referenzwerte: feste Eingaben laufen durch alle Formeln; die Ergebnisse werden mit
+   benchmarks/referenzwerte.json verglichen (Zahlen relativ auf 1e-12, Texte exakt). Damit lässt
+   sich zeigen, dass eine Beschleunigung kein Ergebnis verändert. Nach einer gewollten Änderung
+   mit --referenz-schreiben neu festhalten.
+2. Zeiten: skalare und Array-Aufrufe von kurbelwinkel_zu_hub_exakt, hub_zu_kurbelwinkel und
+   beiden Resonanzformeln, skalare Anzeigetexte und Messwerte der Kinematik, die Gradscheibe
+   kalt (neue Figur) und warm (Blitting), sowie die Callbacks der Apps. Streamlit läuft über den
+   kopflosen AppTest, von Gradio werden die Callback-Funktionen ohne Server aufgerufen; fehlt ein
+   Paket, wird der Teil übersprungen.
+3. Verlauf: jeder Lauf wird an eine JSON-Datei angehängt. Ist ein Fall langsamer als der Median
+   der letzten Läufe auf demselben Rechner plus Schwelle, wird er als Regression gemeldet.
+
+Der Exit-Code ist 1 bei abweichenden Referenzwerten oder Regressionen.
+
+Aufruf aus dem Projektverzeichnis:
+    python benchmarks/bench_suite.py
+    python benchmarks/bench_suite.py --nur resonanz --ohne-apps
+    python benchmarks/bench_suite.py --referenz-schreiben
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+PROJEKT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJEKT)
+
+import auslegung
+import formeln
+import gradscheibe
+import zeitquerschnitt
+from kinematik import (berechne_kolbenweg, berechne_kurbelwinkel, hub_zu_kurbelwinkel, hub_zu_kurbelwinkel_beide,
+                       kolbenweg_messwert, kurbelwinkel_messwert, kurbelwinkel_zu_hub, kurbelwinkel_zu_hub_exakt)
+from resonanz import (auslass_resonanzdrehzahl, berechne_auslass_resonanz, berechne_einlass_resonanz,
+                      einlass_resonanzdrehzahl)
+from steuerzeiten import berechne_steuerzeiten
+
+REFERENZWERTE = os.path.join(PROJEKT, "benchmarks", "referenzwerte.json")
+VERLAUF = os.path.join(PROJEKT, "benchmarks", "verlauf.json")
+
+# Erlaubte Verlangsamung gegenüber dem Median der letzten Läufe (0.25 = 25 %)
+SCHWELLE = 0.25
+# Fälle mit stärkerem Rauschen (Dateisystem, Zeichnen, ganze App-Läufe)
+SCHWELLEN = {"gradscheibe_kalt": 0.5, "rechner_kaltstart": 0.5, "streamlit_start": 0.5}
+
+GEOMETRIEN = ((85.0, 44.0), (95.0, 44.0), (110.0, 54.5), (80.0, 40.0))
+
+
+# ==============================================================================
+# Referenzwerte
+# ==============================================================================
+def _liste(werte):
+    """Array oder Skalar als JSON-taugliche Liste, NaN als None."""
+    return [None if isinstance(w, float) and np.isnan(w) else w for w in np.atleast_1d(np.asarray(werte, dtype=float)).tolist()]
+
+
+def referenz_faelle():
+    """Ergebnisse aller Formeln für feste Eingaben: Name -> Liste von Zahlen oder Texten."""
+    winkel = np.linspace(0.0, 360.0, 73)
+    faelle = {}
+    for pleuel, hub in GEOMETRIEN:
+        geometrie = f"{pleuel:g}_{hub:g}"
+        kolbenweg = np.concatenate([[-1.0], np.linspace(0.0, hub, 45), [hub + 1.0]])
+        faelle[f"kurbelwinkel_zu_hub_exakt_{geometrie}"] = _liste(kurbelwinkel_zu_hub_exakt(winkel, pleuel, hub))
+        faelle[f"kurbelwinkel_zu_hub_naeherung_{geometrie}"] = _liste(kurbelwinkel_zu_hub(winkel, pleuel, hub, exakte_formel=False))
+        faelle[f"kurbelwinkel_zu_hub_skalar_{geometrie}"] = [kurbelwinkel_zu_hub_exakt(float(w), pleuel, hub) for w in winkel]
+        faelle[f"hub_zu_kurbelwinkel_{geometrie}"] = _liste(hub_zu_kurbelwinkel(kolbenweg, pleuel, hub))
+        faelle[f"hub_zu_kurbelwinkel_skalar_{geometrie}"] = [hub_zu_kurbelwinkel(float(s), pleuel, hub) for s in kolbenweg]
+        faelle[f"hub_zu_kurbelwinkel_vor_ot_{geometrie}"] = _liste(hub_zu_kurbelwinkel_beide(kolbenweg, pleuel, hub)[1])
+
+    faelle["kurbelwinkel_text"] = [kurbelwinkel_messwert(s, p, h).formatiere(".2f")
+                                   for s in (-1.0, 0.0, 2.0, 21.5, 60.0) for p, h in ((85.0, 44.0), (10.0, 44.0))]
+    faelle["kolbenweg_text"] = [kolbenweg_messwert(w, p, h).formatiere(".3f")
+                                for w in (0, 45, 90, 180, 270) for p, h in ((95.0, 44.0), (10.0, 44.0), (95.0, 0.0))]
+
+    laengen, winkel_auslass, schall = np.meshgrid([0.5, 0.76, 0.85, 1.2, 1.5], [100, 140, 190, 200], [330, 500, 600])
+    faelle["auslass_resonanzdrehzahl"] = _liste(auslass_resonanzdrehzahl(laengen, winkel_auslass, schall).ravel())
+    faelle["auslass_resonanz_text"] = [berechne_auslass_resonanz(l, w, c) for l in (0.0, 0.5, 0.85, 1.5)
+                                       for w in (0, 140, 200) for c in (330, 500)]
+
+    einlass = [(w, v, k, d, f, l) for w in (20, 25, 100, 130, 180) for v in (50.0, 125.0) for k in (2.0, 3.0)
+               for d in (13.0, 34.0) for f in (1.0, 1.1) for l in (0.0, 16.0)]
+    faelle["einlass_resonanzdrehzahl"] = _liste(einlass_resonanzdrehzahl(*np.array(einlass).T))
+    faelle["einlass_resonanz_text"] = [berechne_einlass_resonanz(*werte) for werte in einlass]
+
+    # Der NumPy-freie Pfad der Kommandozeile muss dieselben Zahlen liefern
+    faelle["formeln_kolbenweg"] = _liste([formeln.kolbenweg(w, 95.0, 44.0)[0] for w in winkel])
+    faelle["formeln_kurbelwinkel"] = _liste([formeln.kurbelwinkel(s, 95.0, 44.0)[0] for s in np.linspace(-1.0, 45.0, 47)])
+    faelle["formeln_auslass_resonanz"] = _liste([formeln.auslass_resonanz(*werte)[0] for werte in
+                                                 zip(laengen.ravel(), winkel_auslass.ravel(), schall.ravel())])
+    faelle["formeln_einlass_resonanz"] = _liste([formeln.einlass_resonanz(*werte)[0] for werte in einlass])
+
+    zeiten = berechne_steuerzeiten({"auslass": 23.0, "ueberstroemer": 28.5, "boost": 27.0}, 44.0, 85.0, 10.0, 0.2)
+    faelle["steuerzeiten"] = [zeiten[kanal][wert] for kanal in sorted(zeiten) for wert in sorted(zeiten[kanal])]
+
+    drehzahlen = np.arange(4000, 12001, 500)
+    faelle["zeitquerschnitt"] = _liste(zeitquerschnitt.spezifischer_zeitquerschnitt(drehzahlen, 50, 44, 85, 23, 26, 18, 4, 1))
+    faelle["auslass_resonanzlaenge"] = _liste(auslegung.auslass_resonanzlaenge(drehzahlen, 190, 500))
+    faelle["einlass_ansauglaenge"] = _liste(auslegung.einlass_ansauglaenge(drehzahlen, 130, 50, 3, 13, 1.1))
+
+    # Pixelgenau, hängt aber von der Matplotlib-Version ab (siehe vergleiche_referenz)
+    bild = gradscheibe.rendere_gradscheibe(21.86)
+    faelle[f"gradscheibe_rgba_sha256_matplotlib_{matplotlib.__version__}"] = [hashlib.sha256(bild.tobytes()).hexdigest()]
+    return faelle
+
+
+def _gleich(erwartet, ist):
+    if len(erwartet) != len(ist):
+        return False
+    for a, b in zip(erwartet, ist):
+        if isinstance(a, str) or isinstance(b, str) or a is None or b is None:
+            if a != b:
+                return False
+        elif not np.isclose(a, b, rtol=1e-12, atol=1e-12):
+            return False
+    return True
+
+
+def vergleiche_referenz(faelle, referenz):
+    """
+    Vergleicht die Ergebnisse mit den gespeicherten Referenzwerten.
+
+    Returns:
+        tuple: (abweichende Fälle, übersprungene Fälle). Der Bild-Hash wird übersprungen, wenn
+            die Referenz mit einer anderen Matplotlib-Version erstellt wurde.
+    """
+    abweichend, uebersprungen = [], []
+    for name, ist in faelle.items():
+        if name not in referenz:
+            uebersprungen.append(name)
+        elif not _gleich(referenz[name], ist):
+            abweichend.append(name)
+    fehlend = [name for name in referenz if name not in faelle and not name.startswith("gradscheibe_rgba_sha256")]
+    return abweichend + fehlend, uebersprungen
+
+
+# ==============================================================================
+# Zeiten
+# ==============================================================================
+def _messe(funktion, wiederholungen):
+    """Zeit pro Aufruf in s: (Minimum, Median) über die Wiederholungen, Schleifenzahl automatisch."""
+    zeitgeber = timeit.Timer(funktion)
+    anzahl, _ = zeitgeber.autorange()
+    zeiten = np.array(zeitgeber.repeat(repeat=wiederholungen, number=anzahl)) / anzahl
+    return float(zeiten.min()), float(np.median(zeiten))
+
+
+def _gradscheibe_kalt():
+    gradscheibe._hintergrund.cache_clear()
+    gradscheibe.rendere_gradscheibe(21.86)
+
+
+def _gradscheibe_figur():
+    figur = gradscheibe.plotte_gradscheibe(21.86)
+    figur.canvas.draw()
+    plt.close(figur)
+
+
+def _rechner_kaltstart():
+    subprocess.run([sys.executable, os.path.join(PROJEKT, "rechner.py"), "auslass"], check=True, stdout=subprocess.DEVNULL,
+                   input='{"laenge_m": 0.85, "oeffnungswinkel_grad": 190, "schallgeschwindigkeit_ms": 500}', text=True)
+
+
+def rechen_faelle():
+    """Name -> (Funktion ohne Argumente, Anzahl Elemente pro Aufruf)."""
+    rng = np.random.default_rng(0)
+    n = 100_000
+    winkel = rng.uniform(0, 360, n)
+    kolbenweg = rng.uniform(0, 44, n)
+    laenge = rng.uniform(0.5, 1.5, n)
+    winkel_auslass = rng.uniform(100, 200, n)
+    winkel_einlass = rng.uniform(100, 180, n)
+    return {
+        "kurbelwinkel_zu_hub_exakt_skalar": (lambda: kurbelwinkel_zu_hub_exakt(47.3, 85.0, 44.0), 1),
+        "kurbelwinkel_zu_hub_exakt_array": (lambda: kurbelwinkel_zu_hub_exakt(winkel, 85.0, 44.0), n),
+        "hub_zu_kurbelwinkel_skalar": (lambda: hub_zu_kurbelwinkel(2.0, 85.0, 44.0), 1),
+        "hub_zu_kurbelwinkel_array": (lambda: hub_zu_kurbelwinkel(kolbenweg, 85.0, 44.0), n),
+        "resonanz_auslass_skalar": (lambda: berechne_auslass_resonanz(0.85, 190, 500), 1),
+        "resonanz_auslass_array": (lambda: auslass_resonanzdrehzahl(laenge, winkel_auslass, 500), n),
+        "resonanz_einlass_skalar": (lambda: berechne_einlass_resonanz(130, 50, 3.0, 13.0, 1.1, 16.0), 1),
+        "resonanz_einlass_array": (lambda: einlass_resonanzdrehzahl(winkel_einlass, 50, 3.0, 13.0, 1.1, 16.0), n),
+        # Einzelwerte aus den Oberflächen: müssen über formeln laufen, nicht über Messwert-Arrays
+        "kolbenweg_text_skalar": (lambda: berechne_kolbenweg(90, 95.0, 44.0), 1),
+        "kurbelwinkel_text_skalar": (lambda: berechne_kurbelwinkel(2.0, 95.0, 44.0), 1),
+        "kolbenweg_messwert_skalar": (lambda: kolbenweg_messwert(90, 95.0, 44.0).formatiere(".3f"), 1),
+        "kurbelwinkel_messwert_skalar": (lambda: kurbelwinkel_messwert(2.0, 95.0, 44.0).formatiere(".2f"), 1),
+        "rechner_kaltstart": (_rechner_kaltstart, 1),
+        "gradscheibe_kalt": (_gradscheibe_kalt, 1),
+        "gradscheibe_warm": (lambda: gradscheibe.rendere_gradscheibe(21.86), 1),
+        "gradscheibe_figur": (_gradscheibe_figur, 1),
+    }
+
+
+def gradio_faelle():
+    """Callbacks der Gradio-App ohne Server; leer, wenn gradio fehlt."""
+    try:
+        import tuning_app_gradio as app
+    except ImportError as fehler:
+        print(f"Gradio übersprungen: {fehler}")
+        return {}
+    return {
+        "gradio_auslass_resonanz": (lambda: app.berechne_auslass_resonanz(0.85, 190, 500), 1),
+        "gradio_kolbenweg": (lambda: app.kolbenweg_text(90, 95.0, 44.0), 1),
+        "gradio_steuerzeiten": (lambda: app.steuerzeiten_tabelle(44.0, 95.0, 23.0, 28.5, 0.0, 10.0), 1),
+        "gradio_gradscheibe": (lambda: app.rendere_gradscheibe(21.86), 1),
+    }
+
+
+def streamlit_faelle():
+    """Ganze Reruns der Streamlit-App im kopflosen AppTest; leer, wenn streamlit fehlt."""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError as fehler:
+        print(f"Streamlit übersprungen: {fehler}")
+        return {}
+    pfad = os.path.join(PROJEKT, "tuning_app_streamlit.py")
+
+    def start():
+        AppTest.from_file(pfad, default_timeout=60).run()
+
+    app = AppTest.from_file(pfad, default_timeout=60).run()
+    regler = next(element for element in app.slider if element.label == "Resonanzlänge (m)")
+    stellungen = iter(np.tile(np.round(np.arange(0.5, 1.51, 0.01), 2), 1000).tolist())
+
+    def auslass_regler():
+        regler.set_value(next(stellungen)).run()
+
+    return {"streamlit_start": (start, 1), "streamlit_auslass_regler": (auslass_regler, 1)}
+
+
+# ==============================================================================
+# Verlauf und Regressionen
+# ==============================================================================
+def _umgebung():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJEKT, capture_output=True,
+                                text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "rechner": platform.node(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "matplotlib": matplotlib.__version__,
+        "commit": commit,
+    }
+
+
+def finde_regressionen(ergebnisse, verlauf, umgebung, schwelle, vergleichslaeufe=5):
+    """
+    Fälle, deren Median langsamer ist als der Median der letzten Läufe auf demselben Rechner plus Schwelle.
+
+    Returns:
+        list: (Name, aktueller Median in s, Vergleichswert in s, erlaubter Faktor).
+    """
+    frueher = [lauf for lauf in verlauf if lauf["umgebung"]["rechner"] == umgebung["rechner"]
+               and lauf["umgebung"]["python"] == umgebung["python"]][-vergleichslaeufe:]
+    regressionen = []
+    for name, messung in ergebnisse.items():
+        werte = [lauf["ergebnisse"][name]["median_s"] for lauf in frueher if name in lauf["ergebnisse"]]
+        if not werte:
+            continue
+        vergleich = float(np.median(werte))
+        faktor = 1 + SCHWELLEN.get(name, schwelle)
+        if messung["median_s"] > vergleich * faktor:
+            regressionen.append((name, messung["median_s"], vergleich, faktor))
+    return regressionen
+
+
+def _zeit(sekunden):
+    return f"{sekunden * 1e6:10.2f} µs" if sekunden < 1e-3 else f"{sekunden * 1e3:10.2f} ms"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark- und Regressionssuite.")
+    parser.add_argument("--nur", default="", help="Nur Fälle, deren Name diesen Text enthält")
+    parser.add_argument("--ohne-apps", action="store_true", help="Gradio- und Streamlit-Fälle auslassen")
+    parser.add_argument("--wiederholungen", type=int, default=5)
+    parser.add_argument("--schwelle", type=float, default=SCHWELLE, help="Erlaubte Verlangsamung, 0.25 = 25 %%")
+    parser.add_argument("--verlauf", default=VERLAUF, help="JSON-Datei mit den bisherigen Läufen")
+    parser.add_argument("--kein-verlauf", action="store_true", help="Lauf nicht an den Verlauf anhängen")
+    parser.add_argument("--referenz-schreiben", action="store_true", help="Aktuelle Ergebnisse als Referenz speichern")
+    args = parser.parse_args()
+
+    faelle = referenz_faelle()
+    if args.referenz_schreiben:
+        with open(REFERENZWERTE, "w", encoding="utf-8") as datei:
+            json.dump(faelle, datei, ensure_ascii=False, indent=1)
+            datei.write("\n")
+        print(f"{len(faelle)} Referenzfälle nach {REFERENZWERTE} geschrieben.")
+        sys.exit(0)
+
+    with open(REFERENZWERTE, encoding="utf-8") as datei:
+        abweichend, uebersprungen = vergleiche_referenz(faelle, json.load(datei))
+    print(f"Referenzwerte: {len(faelle) - len(abweichend) - len(uebersprungen)} gleich, "
+          f"{len(abweichend)} abweichend, {len(uebersprungen)} ohne Referenz")
+    for name in abweichend:
+        print(f"  ABWEICHUNG {name}")
+    for name in uebersprungen:
+        print(f"  übersprungen {name}")
+
+    zeitfaelle = rechen_faelle()
+    if not args.ohne_apps:
+        zeitfaelle.update(gradio_faelle())
+        zeitfaelle.update(streamlit_faelle())
+    ergebnisse = {}
+    print("Zeiten pro Aufruf (Minimum, Median) und pro Element:")
+    for name, (funktion, elemente) in zeitfaelle.items():
+        if args.nur not in name:
+            continue
+        minimum, median = _messe(funktion, args.wiederholungen)
+        ergebnisse[name] = {"min_s": minimum, "median_s": median, "elemente": elemente}
+        pro_element = f"   {median / elemente * 1e9:8.2f} ns/Element" if elemente > 1 else ""
+        print(f"  {name:<36} {_zeit(minimum)} {_zeit(median)}{pro_element}")
+
+    verlauf = []
+    if os.path.exists(args.verlauf):
+        with open(args.verlauf, encoding="utf-8") as datei:
+            verlauf = json.load(datei)
+    umgebung = _umgebung()
+    regressionen = finde_regressionen(ergebnisse, verlauf, umgebung, args.schwelle)
+    for name, aktuell, vergleich, faktor in regressionen:
+        print(f"  REGRESSION {name}: {_zeit(aktuell).strip()} statt {_zeit(vergleich).strip()} (erlaubt x{faktor:.2f})")
+    if not regressionen:
+        print("Keine Regressionen gegenüber dem Verlauf.")
+
+    if not args.kein_verlauf:
+        verlauf.append({
+            "zeitpunkt": datetime.datetime.now().isoformat(timespec="seconds"),
+            "umgebung": umgebung,
+            "referenz_abweichungen": abweichend,
+            "ergebnisse": ergebnisse,
+        })
+        with open(args.verlauf, "w", encoding="utf-8") as datei:
+            json.dump(verlauf, datei, ensure_ascii=False, indent=1)
+            datei.write("\n")
+
+    sys.exit(1 if abweichend or regressionen else 0)
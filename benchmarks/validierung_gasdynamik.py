@@ -0,0 +1,148 @@
+"""
+Validierungsbericht für gasdynamik: Plausibilitätsprüfungen und Vergleich mit der Resonanzformel.
+
+1. Ruhezustand: ein ruhendes Rohr mit Konen und Querschnittssprüngen bleibt in Ruhe.
+2. Schallgeschwindigkeit: ein kleiner Druckpuls läuft mit c = sqrt(κ R T).
+3. Resonanzdrehzahl: Drehzahlschleife für drei Auspuffe im Vergleich mit n = c * φ / (12 * l)
+   aus resonanz, einmal mit c = 500 m/s und einmal mit c aus der mittleren Wandtemperatur.
+
+Der Bericht wird als Markdown ausgegeben.
+
+Aufruf aus dem Projektverzeichnis:
+    python benchmarks/validierung_gasdynamik.py -o validierung.md
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import gasdynamik
+from resonanz import auslass_resonanzdrehzahl
+
+
+def _auspuff(diffusor_m, mittelteil_m):
+    segmente = [dict(segment) for segment in gasdynamik.AUSPUFF_BEISPIEL]
+    segmente[1]["laenge_m"] = diffusor_m
+    segmente[2]["laenge_m"] = mittelteil_m
+    return segmente
+
+
+AUSPUFFE = {
+    "kurz": _auspuff(0.24, 0.08),
+    "beispiel": gasdynamik.AUSPUFF_BEISPIEL,
+    "lang": _auspuff(0.34, 0.18),
+}
+
+
+def _zeitschritte(rohr, dauer_s, zylinder=(1.0, 1e5)):
+    zeit = 0.0
+    while zeit < dauer_s:
+        dt = min(rohr.zeitschritt(0.8), dauer_s - zeit)
+        dq1, _ = rohr.ableitung(rohr.q, zylinder, 0.0)
+        q1 = rohr.q + dt * dq1
+        dq2, _ = rohr.ableitung(q1, zylinder, 0.0)
+        rohr.q = 0.5 * (rohr.q + q1 + dt * dq2)
+        zeit += dt
+
+
+def pruefe_ruhezustand():
+    """Maximale Druckabweichung in bar nach 5 ms im ruhenden Beispielauspuff."""
+    rohr = gasdynamik._Auspuffrohr(gasdynamik.rechengitter(gasdynamik.AUSPUFF_BEISPIEL), gasdynamik.GAS)
+    _, _, p_vorher = rohr.primitiv(rohr.q)
+    _zeitschritte(rohr, 0.005)
+    _, _, p_nachher = rohr.primitiv(rohr.q)
+    return float(np.max(np.abs(p_nachher - p_vorher))) / 1e5
+
+
+def pruefe_schallgeschwindigkeit(temperatur_k=650.0):
+    """Gemessene und erwartete Laufgeschwindigkeit eines kleinen Druckpulses in m/s."""
+    segmente = [{"art": "kruemmer", "laenge_m": 1.0, "d_ein_mm": 40.0, "d_aus_mm": 40.0, "temperatur_k": temperatur_k},
+                {"art": "gegenkonus", "laenge_m": 0.01, "d_ein_mm": 40.0, "d_aus_mm": 40.0, "temperatur_k": temperatur_k}]
+    gitter = gasdynamik.rechengitter(segmente, 0.002)
+    rohr = gasdynamik._Auspuffrohr(gitter, gasdynamik.GAS)
+    x = gitter["x_m"]
+    rho, _, p = rohr.primitiv(rohr.q)
+    # Isentroper Puls mit nach rechts laufender Geschwindigkeit: nur die rechtslaufende Welle
+    stoerung = 1e-3 * np.exp(-((x - 0.2) / 0.02) ** 2)
+    c = float(gasdynamik.schallgeschwindigkeit(temperatur_k))
+    kappa = gasdynamik.GAS["kappa"]
+    p_neu = p * (1 + stoerung)
+    rho_neu = rho * (1 + stoerung / kappa)
+    u_neu = c * stoerung / kappa
+    rohr.q = np.array([rho_neu, rho_neu * u_neu, p_neu / (kappa - 1) + 0.5 * rho_neu * u_neu**2])
+    dauer_s = 0.001
+    _zeitschritte(rohr, dauer_s)
+    _, _, p = rohr.primitiv(rohr.q)
+    return (x[np.argmax(p)] - 0.2) / dauer_s, c
+
+
+def vergleiche_resonanz(drehzahlen, prozesse):
+    """Simulierte und berechnete Resonanzdrehzahlen je Auspuff."""
+    auslass_grad, _ = gasdynamik._steuerwinkel(gasdynamik.MOTOR_STANDARD)
+    winkel = 360.0 - 2 * auslass_grad
+    zeilen = []
+    for name, segmente in AUSPUFFE.items():
+        laenge = gasdynamik.resonanzlaenge_m(segmente)
+        c_wand = float(gasdynamik.schallgeschwindigkeit(gasdynamik.mittlere_temperatur_k(segmente)))
+        sweep = gasdynamik.drehzahl_sweep(segmente, drehzahlen, prozesse=prozesse)
+        formel_500 = auslass_resonanzdrehzahl(laenge, winkel, 500.0)
+        formel_wand = auslass_resonanzdrehzahl(laenge, winkel, c_wand)
+        naechstes = sweep["maxima_upm"][np.argmin(np.abs(sweep["maxima_upm"] - formel_wand))]
+        zeilen.append({
+            "name": name, "laenge_m": laenge, "c_wand": c_wand, "formel_500": formel_500,
+            "formel_wand": formel_wand, "sim_max": sweep["resonanz_upm"], "sim_maxima": sweep["maxima_upm"],
+            "sim_naechstes": naechstes, "sweep": sweep,
+        })
+    return winkel, zeilen
+
+
+def bericht(drehzahlen, prozesse):
+    ruhe_bar = pruefe_ruhezustand()
+    gemessen, erwartet = pruefe_schallgeschwindigkeit()
+    winkel, zeilen = vergleiche_resonanz(drehzahlen, prozesse)
+
+    text = ["# Validierung gasdynamik", ""]
+    text += ["## Plausibilität", ""]
+    text += [f"- Ruhezustand (5 ms, Konen und Querschnittssprung): max. Druckabweichung {ruhe_bar:.2e} bar"]
+    text += [f"- Schallgeschwindigkeit bei 650 K: gemessen {gemessen:.1f} m/s, erwartet {erwartet:.1f} m/s "
+             f"({(gemessen / erwartet - 1) * 100:+.1f} %)", ""]
+    text += ["## Resonanzdrehzahl", ""]
+    text += [f"Motor: MOTOR_STANDARD, Auslass-Steuerdauer {winkel:.1f} °KW. Drehzahlschleife "
+             f"{drehzahlen[0]:.0f}–{drehzahlen[-1]:.0f} U/min in Schritten von {drehzahlen[1] - drehzahlen[0]:.0f}. "
+             "Simulierte Resonanz = höchster mittlerer Druck am Auslassschlitz zwischen Überströmer schließt "
+             "und Auslass schließt.", ""]
+    text += ["| Auspuff | l_r (m) | c_Wand (m/s) | Formel c=500 | Formel c_Wand | Sim. Maximum | "
+             "Sim. Maximum nahe Formel | Abweichung | alle Maxima |",
+             "|---|---|---|---|---|---|---|---|---|"]
+    for z in zeilen:
+        abweichung = (z["sim_naechstes"] / z["formel_wand"] - 1) * 100
+        text.append(
+            f"| {z['name']} | {z['laenge_m']:.2f} | {z['c_wand']:.0f} | {z['formel_500']:.0f} | {z['formel_wand']:.0f} | "
+            f"{z['sim_max']:.0f} | {z['sim_naechstes']:.0f} | {abweichung:+.1f} % | "
+            f"{', '.join(f'{n:.0f}' for n in z['sim_maxima'])} |"
+        )
+    text += ["", "Rückstau (bar) je Drehzahl:", "", "| U/min | " + " | ".join(z["name"] for z in zeilen) + " |",
+             "|---" * (len(zeilen) + 1) + "|"]
+    for i, n in enumerate(drehzahlen):
+        text.append(f"| {n:.0f} | " + " | ".join(f"{z['sweep']['rueckstau_bar'][i]:.3f}" for z in zeilen) + " |")
+    return "\n".join(text) + "\n"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validierungsbericht für gasdynamik.")
+    parser.add_argument("-o", "--ausgabe", default="-", help="Markdown-Datei (Standard: stdout)")
+    parser.add_argument("-j", "--prozesse", type=int, default=None, help="Anzahl Arbeitsprozesse")
+    parser.add_argument("--von", type=float, default=7000)
+    parser.add_argument("--bis", type=float, default=15000)
+    parser.add_argument("--schritt", type=float, default=500)
+    args = parser.parse_args()
+
+    inhalt = bericht(np.arange(args.von, args.bis + args.schritt / 2, args.schritt), args.prozesse)
+    if args.ausgabe == "-":
+        sys.stdout.write(inhalt)
+    else:
+        with open(args.ausgabe, "w", encoding="utf-8") as datei:
+            datei.write(inhalt)
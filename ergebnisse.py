@@ -0,0 +1,128 @@
+"""
+Strukturierte Rechenergebnisse: Zahlenwerte mit Einheit und Gültigkeits-/Fehlermaske.
+
+Die Rechenfunktionen liefern Messwert-Objekte statt formatierter Texte. Für Stapelrechnungen
+sind Wert und Fehlercode Arrays; formatiert wird erst in der Oberfläche (formatiere) bzw.
+für die Ausgabe als JSON (als_dict).
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from fehlercodes import (FEHLER_AUSSERHALB_HUB, FEHLER_NICHT_POSITIV, FEHLER_PLEUEL_ZU_KURZ, FEHLER_WINKEL_ZU_KLEIN,
+                         FEHLERMELDUNGEN, GUELTIG)
+
+# Vorab umgewandelte Fehlercodes für Einzelwerte, np.int8() kostet pro Aufruf mehr als das Nachschlagen
+_FEHLERCODES_INT8 = {code: np.int8(code) for code in FEHLERMELDUNGEN}
+
+
+@dataclass(frozen=True)
+class Messwert:
+    """
+    Zahlenwert mit Einheit und Fehlercode, als Skalar oder Array.
+
+    Attributes:
+        wert (np.ndarray): Die Zahlenwerte; 0-dimensional für Einzelwerte.
+        einheit (str): Die Einheit, z.B. "U/min".
+        fehlercode (np.ndarray): Fehlercode je Element (siehe FEHLERMELDUNGEN), 0 = gültig.
+    """
+    wert: np.ndarray
+    einheit: str
+    fehlercode: np.ndarray
+
+    def __post_init__(self):
+        if type(self.wert) is float and type(self.fehlercode) is int:
+            # Einzelwert aus formeln: ohne Array-Umwandlung, die kostet ein Vielfaches der Rechnung
+            object.__setattr__(self, "wert", np.float64(self.wert))
+            object.__setattr__(self, "fehlercode", _FEHLERCODES_INT8[self.fehlercode])
+            return
+        wert = np.asarray(self.wert, dtype=float)
+        object.__setattr__(self, "wert", wert)
+        object.__setattr__(self, "fehlercode", np.broadcast_to(np.asarray(self.fehlercode, dtype=np.int8), wert.shape))
+
+    @property
+    def gueltig(self):
+        """Boolesche Maske der gültigen Elemente."""
+        return self.fehlercode == GUELTIG
+
+    @property
+    def fehler(self):
+        """Fehlermeldung je Element ("" für gültige Elemente)."""
+        if self.wert.ndim == 0:
+            return FEHLERMELDUNGEN[int(self.fehlercode)]
+        return [FEHLERMELDUNGEN[int(code)] for code in self.fehlercode.ravel()]
+
+    def __float__(self):
+        return float(self.wert)
+
+    def __len__(self):
+        return len(self.wert)
+
+    def formatiere(self, format_spec=".0f"):
+        """
+        Formatiert die Werte für die Anzeige, z.B. "9722 U/min" oder die Fehlermeldung.
+
+        Returns:
+            str | list: Ein Text für Einzelwerte, sonst eine Liste von Texten.
+        """
+        if self.wert.ndim == 0:
+            return formatiere_wert(float(self.wert), self.einheit, int(self.fehlercode), format_spec)
+        return [
+            formatiere_wert(w, self.einheit, c, format_spec)
+            for w, c in zip(self.wert.ravel().tolist(), self.fehlercode.ravel().tolist())
+        ]
+
+    def als_dict(self):
+        """Wandelt den Messwert in JSON-taugliche Listen um; ungültige Werte werden None."""
+        werte = np.where(self.gueltig, self.wert, np.nan)
+        return {
+            "wert": _liste_ohne_nan(werte),
+            "einheit": self.einheit,
+            "gueltig": self.gueltig.tolist(),
+            "fehler": self.fehler,
+        }
+
+
+def formatiere_wert(wert, einheit, fehlercode=GUELTIG, format_spec=".0f"):
+    """
+    Formatiert einen Einzelwert wie Messwert.formatiere, ohne einen Messwert anzulegen.
+
+    Für den skalaren Pfad mit den (Wert, Fehlercode)-Paaren aus formeln.
+
+    Returns:
+        str: Z.B. "9722 U/min" oder die Fehlermeldung.
+    """
+    if fehlercode != GUELTIG:
+        return FEHLERMELDUNGEN[fehlercode]
+    # Kein Leerzeichen vor dem Gradzeichen
+    trenner = "" if einheit == "°" else " "
+    return f"{wert:{format_spec}}{trenner}{einheit}"
+
+
+def alle_skalar(*eingaben):
+    """True, wenn keine der Eingaben ein Array ist."""
+    for eingabe in eingaben:
+        # Python-Zahlen zuerst, np.ndim kostet für Einzelwerte mehr als die Rechnung
+        if type(eingabe) is not float and type(eingabe) is not int and np.ndim(eingabe) != 0:
+            return False
+    return True
+
+
+def positiv(*werte):
+    """
+    Boolesche Maske: alle Werte endlich und größer als 0.
+
+    NaN (z.B. eine leere CSV-Zelle) und unendliche Werte gelten damit als ungültig, anders als
+    bei einem Vergleich wie wert <= 0, der für NaN False liefert.
+    """
+    maske = True
+    for wert in werte:
+        wert = np.asarray(wert, dtype=float)
+        maske = maske & np.isfinite(wert) & (wert > 0)
+    return maske
+
+
+def _liste_ohne_nan(werte):
+    if werte.ndim == 0:
+        return None if np.isnan(werte) else float(werte)
+    return [None if np.isnan(w) else w for w in werte.tolist()]
@@ -0,0 +1,20 @@
+"""
+Fehlercodes je Element und ihre Meldungen, ohne NumPy.
+
+Liegen in einem eigenen Modul, damit die Kommandozeile (rechner) sie ohne NumPy laden kann;
+ergebnisse stellt sie wie bisher ebenfalls bereit.
+"""
+# Fehlercodes je Element, 0 bedeutet gültig
+GUELTIG = 0
+FEHLER_NICHT_POSITIV = 1
+FEHLER_WINKEL_ZU_KLEIN = 2
+FEHLER_PLEUEL_ZU_KURZ = 3
+FEHLER_AUSSERHALB_HUB = 4
+
+FEHLERMELDUNGEN = {
+    GUELTIG: "",
+    FEHLER_NICHT_POSITIV: "Eingabewerte müssen positiv sein.",
+    FEHLER_WINKEL_ZU_KLEIN: "Effektiver Winkel zu klein. Bitte größeren Öffnungswinkel angeben.",
+    FEHLER_PLEUEL_ZU_KURZ: "Pleuellänge muss größer als der Kurbelradius sein.",
+    FEHLER_AUSSERHALB_HUB: "Kolbenweg liegt außerhalb des Hubs.",
+}
@@ -0,0 +1,146 @@
+"""
+Skalare Formeln nur mit der Standardbibliothek, ohne NumPy und ohne UI-Abhängigkeiten.
+
+Der Import von NumPy allein dauert länger als eine ganze Rechnung über die Kommandozeile
+(rechner). Für einzelne Werte rechnen diese Funktionen mit math genau dasselbe wie kinematik,
+resonanz und steuerzeiten; kinematik verwendet sie als skalaren Pfad. Wie bei den *_messwert
+Funktionen liefern ungültige Eingaben NaN zusammen mit einem Fehlercode (siehe fehlercodes).
+"""
+import math
+
+from fehlercodes import FEHLER_AUSSERHALB_HUB, FEHLER_NICHT_POSITIV, FEHLER_PLEUEL_ZU_KURZ, FEHLER_WINKEL_ZU_KLEIN, GUELTIG
+
+# Kolbengesteuerte Kanäle, die um den UT herum offen sind (Spaltenname in der CSV: <kanal>_mm)
+KANAELE = ("auslass", "ueberstroemer", "boost")
+
+
+def kurbelwinkel_zu_hub(kurbelwinkel_grad, pleuelstange_mm, hub_mm):
+    """Wie kinematik.kurbelwinkel_zu_hub_exakt für einzelne Werte."""
+    if hub_mm <= 0 or pleuelstange_mm <= 0:
+        return 0.0
+    radius_mm = hub_mm / 2.0
+    if pleuelstange_mm < radius_mm:
+        raise ValueError("Pleuellänge muss größer als der Kurbelradius sein.")
+    kurbelwinkel_rad = math.radians(kurbelwinkel_grad)
+    l_r_verhaeltnis = pleuelstange_mm / radius_mm
+    innerhalb_der_wurzel_wert = max(l_r_verhaeltnis**2 - math.sin(kurbelwinkel_rad)**2, 0)
+    return radius_mm * (
+        1 + l_r_verhaeltnis - math.cos(kurbelwinkel_rad) - math.sqrt(innerhalb_der_wurzel_wert)
+    )
+
+
+def hub_zu_kurbelwinkel(kolbenweg_mm, pleuelstange_mm, hub_mm):
+    """Wie kinematik.hub_zu_kurbelwinkel für einzelne Werte (Winkel nach OT)."""
+    if hub_mm <= 0 or pleuelstange_mm <= 0 or kolbenweg_mm < 0:
+        return 0.0
+    if kolbenweg_mm >= hub_mm:
+        # UT; bei l == r wäre der Abstand unten 0
+        return 180.0
+    radius_mm = hub_mm / 2.0
+    if pleuelstange_mm < radius_mm:
+        raise ValueError("Pleuellänge muss größer als der Kurbelradius sein.")
+    abstand_mm = radius_mm + pleuelstange_mm - kolbenweg_mm
+    cos_phi = (abstand_mm**2 + radius_mm**2 - pleuelstange_mm**2) / (2 * radius_mm * abstand_mm)
+    return math.degrees(math.acos(min(max(cos_phi, -1.0), 1.0)))
+
+
+def _positiv(*werte):
+    """Wie ergebnisse.positiv: alle Werte endlich und größer als 0 (NaN ist ungültig)."""
+    return all(math.isfinite(wert) and wert > 0 for wert in werte)
+
+
+def _fehlercode_geometrie(pleuel, hub):
+    if not _positiv(hub, pleuel):
+        return FEHLER_NICHT_POSITIV
+    return FEHLER_PLEUEL_ZU_KURZ if pleuel < hub / 2.0 else GUELTIG
+
+
+def kolbenweg(kurbelwinkel_grad, pleuelstange_mm, hub_mm):
+    """
+    Kolbenweg vom OT wie kinematik.kolbenweg_messwert.
+
+    Returns:
+        tuple: (Kolbenweg in mm oder NaN, Fehlercode).
+    """
+    fehlercode = _fehlercode_geometrie(pleuelstange_mm, hub_mm) if math.isfinite(kurbelwinkel_grad) else FEHLER_NICHT_POSITIV
+    if fehlercode != GUELTIG:
+        return math.nan, fehlercode
+    return kurbelwinkel_zu_hub(kurbelwinkel_grad, pleuelstange_mm, hub_mm), GUELTIG
+
+
+def kurbelwinkel(kolbenweg_mm, pleuelstange_mm, hub_mm):
+    """
+    Kurbelwinkel vor OT für einen Kolbenweg wie kinematik.kurbelwinkel_messwert.
+
+    Returns:
+        tuple: (Kurbelwinkel in Grad oder NaN, Fehlercode).
+    """
+    fehlercode = _fehlercode_geometrie(pleuelstange_mm, hub_mm) if math.isfinite(kolbenweg_mm) else FEHLER_NICHT_POSITIV
+    if fehlercode == GUELTIG and (kolbenweg_mm < 0 or kolbenweg_mm > hub_mm):
+        fehlercode = FEHLER_AUSSERHALB_HUB
+    if fehlercode != GUELTIG:
+        return math.nan, fehlercode
+    return hub_zu_kurbelwinkel(kolbenweg_mm, pleuelstange_mm, hub_mm), GUELTIG
+
+
+def auslass_resonanz(laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms):
+    """
+    Auslass-Resonanzdrehzahl wie resonanz.auslass_resonanz_messwert.
+
+    Returns:
+        tuple: (Drehzahl in U/min oder NaN, Fehlercode).
+    """
+    if not _positiv(laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms):
+        return math.nan, FEHLER_NICHT_POSITIV
+    return (schallgeschwindigkeit_ms * oeffnungswinkel_grad) / (12 * laenge_m), GUELTIG
+
+
+def einlass_resonanz(oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge):
+    """
+    Einlass-Resonanzdrehzahl wie resonanz.einlass_resonanz_messwert.
+
+    Returns:
+        tuple: (Drehzahl in U/min oder NaN, Fehlercode).
+    """
+    kurbelhausvolumen_cm3 = hubraum_ccm * kurbel_faktor
+    querschnitt_cm2 = ansaug_faktor * (vergaser_d_mm / 10 / 2)**2 * math.pi
+    effektiver_winkel = oeffnungswinkel_grad - 25
+    if not _positiv(kurbelhausvolumen_cm3, ansaug_faktor * vergaser_d_mm**2, oeffnungswinkel_grad, ansaug_laenge):
+        return math.nan, FEHLER_NICHT_POSITIV
+    if not effektiver_winkel > 0:
+        return math.nan, FEHLER_WINKEL_ZU_KLEIN
+    verhaeltnis = kurbelhausvolumen_cm3 * ansaug_laenge / querschnitt_cm2
+    return (1750 * effektiver_winkel) / math.sqrt(verhaeltnis), GUELTIG
+
+
+def steuerzeiten(kanal_hoehen_mm, hub_mm, pleuelstange_mm, einlass_kolbenweg_mm=None, ot_abstand_mm=0.0):
+    """
+    Steuerzeiten eines Zylinders wie steuerzeiten.berechne_steuerzeiten.
+
+    Fehlende Kanäle dürfen NaN sein, sie werden beim Vorauslass übergangen.
+
+    Returns:
+        dict: Kanalname -> dict mit "oeffnet_grad", "schliesst_grad", "dauer_grad" und außer beim
+            Einlass "vorauslass_grad" (nur wenn ein Auslass angegeben ist).
+    """
+    ergebnis = {}
+    for name, hoehe in kanal_hoehen_mm.items():
+        oeffnet = hub_zu_kurbelwinkel(hoehe - ot_abstand_mm, pleuelstange_mm, hub_mm)
+        schliesst = 360.0 - oeffnet
+        ergebnis[name] = {"oeffnet_grad": oeffnet, "schliesst_grad": schliesst, "dauer_grad": schliesst - oeffnet}
+
+    if "auslass" in ergebnis:
+        auslass_oeffnet = ergebnis["auslass"]["oeffnet_grad"]
+        spuelkanaele = [name for name in ergebnis if name != "auslass"]
+        for name in spuelkanaele:
+            ergebnis[name]["vorauslass_grad"] = ergebnis[name]["oeffnet_grad"] - auslass_oeffnet
+        if spuelkanaele:
+            # Wie np.fmin: fehlende (NaN) Kanäle zählen nicht
+            oeffnen = [ergebnis[name]["oeffnet_grad"] for name in spuelkanaele]
+            erster_spuelkanal = min((w for w in oeffnen if not math.isnan(w)), default=math.nan)
+            ergebnis["auslass"]["vorauslass_grad"] = erster_spuelkanal - auslass_oeffnet
+
+    if einlass_kolbenweg_mm is not None:
+        nach_ot = hub_zu_kurbelwinkel(einlass_kolbenweg_mm, pleuelstange_mm, hub_mm)
+        ergebnis["einlass"] = {"oeffnet_grad": 360.0 - nach_ot, "schliesst_grad": nach_ot, "dauer_grad": 2 * nach_ot}
+    return ergebnis
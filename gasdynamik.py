@@ -0,0 +1,442 @@
+"""
+Eindimensionale instationäre Gasdynamik des Resonanzauspuffs ohne UI-Abhängigkeiten.
+
+Die Formel n = c * φ / (12 * l) aus resonanz kennt nur eine Länge und eine Schallgeschwindigkeit.
+Dieses Modul rechnet den Auspuff als Rohr mit veränderlichem Querschnitt (Krümmer, Diffusor,
+Mittelteil, Gegenkonus, Endrohr) mit den quasi-eindimensionalen Euler-Gleichungen:
+
+    ∂(ρA)/∂t + ∂(ρuA)/∂x = 0
+    ∂(ρuA)/∂t + ∂((ρu² + p)A)/∂x = p dA/dx
+    ∂(EA)/∂t + ∂(u(E + p)A)/∂x = 0
+
+Finite Volumen mit HLLC-Flüssen, MUSCL-Rekonstruktion (minmod) und Heun-Zeitschritt. Jeder
+Zeitschritt rechnet alle Zellen in einem NumPy-Durchgang, es gibt keine Python-Schleife über
+Zellen. Am Auslassschlitz hängt der Zylinder (Vorauslass aus dem Kurbeltrieb, Spülung über die
+Überströmer), am Endrohr die Atmosphäre. Die Wandreibung dämpft die Wellen, die Gastemperatur
+wird mit einer Zeitkonstante an das Temperaturprofil der Rohrwand angeglichen, so bleibt das
+Temperaturgefälle im Auspuff erhalten.
+
+Ein Auspuff ist eine Liste von Segmenten, z.B.:
+
+    {"art": "diffusor", "laenge_m": 0.25, "d_ein_mm": 38, "d_aus_mm": 100, "temperatur_k": 700}
+
+art ist eine von ARTEN; temperatur_k ist optional (Standard: GAS["temperatur_k"]).
+"""
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from kinematik import hub_zu_kurbelwinkel, kurbelwinkel_zu_hub_exakt
+from zeitquerschnitt import kanalflaechen_profil
+
+ARTEN = ("kruemmer", "diffusor", "mittelteil", "gegenkonus", "endrohr")
+
+GAS = {
+    "kappa": 1.35,            # Isentropenexponent des Abgases
+    "r_spezifisch": 287.0,    # spezifische Gaskonstante in J/(kg K)
+    "temperatur_k": 650.0,    # Standard-Wandtemperatur, ergibt etwa 500 m/s Schallgeschwindigkeit
+    "umgebungsdruck_bar": 1.013,
+    "umgebungstemperatur_k": 300.0,
+    "waerme_zeitkonstante_s": 0.005,  # Angleichung der Gastemperatur an die Wand
+    "rohrreibungszahl": 0.02,         # Darcy-Reibungszahl der Rohrwand
+}
+
+MOTOR_STANDARD = {
+    "bohrung_mm": 54.0,
+    "hub_mm": 54.5,
+    "pleuel_mm": 110.0,
+    "verdichtung": 12.0,
+    "auslass_mm": 25.0,           # Zylinderoberkante bis Auslass-Oberkante
+    "auslass_breite_mm": 40.0,
+    "auslass_eckradius_mm": 5.0,
+    "durchflusszahl": 0.75,
+    "ueberstroemer_mm": 31.5,     # Zylinderoberkante bis Überströmer-Oberkante
+    "ueberstroemer_breite_mm": 14.0,
+    "ueberstroemer_anzahl": 4,
+    "druck_ao_bar": 5.0,          # Zylinderdruck bei Auslass öffnet
+    "temperatur_ao_k": 1400.0,
+    "spueldruck_bar": 1.3,        # Kurbelhausdruck während der Spülung
+    "spueltemperatur_k": 400.0,
+}
+
+AUSPUFF_BEISPIEL = [
+    {"art": "kruemmer", "laenge_m": 0.12, "d_ein_mm": 38.0, "d_aus_mm": 40.0, "temperatur_k": 800.0},
+    {"art": "diffusor", "laenge_m": 0.30, "d_ein_mm": 40.0, "d_aus_mm": 100.0, "temperatur_k": 700.0},
+    {"art": "mittelteil", "laenge_m": 0.12, "d_ein_mm": 100.0, "d_aus_mm": 100.0, "temperatur_k": 620.0},
+    {"art": "gegenkonus", "laenge_m": 0.22, "d_ein_mm": 100.0, "d_aus_mm": 22.0, "temperatur_k": 580.0},
+    {"art": "endrohr", "laenge_m": 0.20, "d_ein_mm": 22.0, "d_aus_mm": 22.0, "temperatur_k": 550.0},
+]
+
+
+def schallgeschwindigkeit(temperatur_k, kappa=GAS["kappa"], r_spezifisch=GAS["r_spezifisch"]):
+    """
+    Schallgeschwindigkeit c = sqrt(κ R T) in m/s.
+
+    Args:
+        temperatur_k (float | np.ndarray): Gastemperatur in K.
+    """
+    return np.sqrt(kappa * r_spezifisch * np.asarray(temperatur_k, dtype=float))
+
+
+def resonanzlaenge_m(segmente):
+    """
+    Resonanzlänge vom Auslassschlitz bis zum Ende des (letzten) Gegenkonus in m.
+
+    Das ist die Länge l_r, die die Formel aus resonanz erwartet.
+    """
+    laenge = 0.0
+    bis_gegenkonus = None
+    for segment in segmente:
+        laenge += segment["laenge_m"]
+        if segment["art"] == "gegenkonus":
+            bis_gegenkonus = laenge
+    if bis_gegenkonus is None:
+        raise ValueError("Der Auspuff hat keinen Gegenkonus.")
+    return bis_gegenkonus
+
+
+def mittlere_temperatur_k(segmente, temperatur_k=GAS["temperatur_k"]):
+    """Längengewichtete Wandtemperatur bis zum Ende des Gegenkonus in K."""
+    ende = resonanzlaenge_m(segmente)
+    gewichtet, laenge = 0.0, 0.0
+    for segment in segmente:
+        anteil = min(segment["laenge_m"], ende - laenge)
+        if anteil <= 0:
+            break
+        gewichtet += anteil * segment.get("temperatur_k", temperatur_k)
+        laenge += anteil
+    return gewichtet / laenge
+
+
+def rechengitter(segmente, zellgroesse_m=0.005, temperatur_k=GAS["temperatur_k"]):
+    """
+    Teilt den Auspuff in Zellen; Segmentgrenzen liegen immer auf Zellgrenzen.
+
+    An einem Sprung im Durchmesser zwischen zwei Segmenten (z.B. Gegenkonus -> Endrohr)
+    gilt an der gemeinsamen Zellgrenze der kleinere Querschnitt.
+
+    Returns:
+        dict: "dx" (Zellbreite, N), "flaeche_zelle" (N), "flaeche_grenze" (N+1) in m²,
+            "temperatur_k" (N, Wandtemperatur) und "x_m" (N, Zellmitte ab Auslassschlitz).
+    """
+    if not segmente:
+        raise ValueError("Der Auspuff braucht mindestens ein Segment.")
+    dx, d_zelle, d_grenze, temperatur, x = [], [], [], [], []
+    start = 0.0
+    for j, segment in enumerate(segmente):
+        if segment["art"] not in ARTEN:
+            raise ValueError(f"Unbekannte Segmentart: {segment['art']}")
+        laenge, d_ein, d_aus = segment["laenge_m"], segment["d_ein_mm"], segment["d_aus_mm"]
+        if laenge <= 0 or d_ein <= 0 or d_aus <= 0:
+            raise ValueError("Länge und Durchmesser der Segmente müssen positiv sein.")
+        n = max(1, round(laenge / zellgroesse_m))
+        anteil = np.linspace(0.0, 1.0, n + 1)
+        d = d_ein + (d_aus - d_ein) * anteil
+        if j == 0:
+            d_grenze.append(d[0])
+        else:
+            d_grenze[-1] = min(d_grenze[-1], d[0])
+        d_grenze.extend(d[1:])
+        mitte = 0.5 * (anteil[1:] + anteil[:-1])
+        d_zelle.extend(d_ein + (d_aus - d_ein) * mitte)
+        dx.extend([laenge / n] * n)
+        x.extend(start + laenge * mitte)
+        temperatur.extend([segment.get("temperatur_k", temperatur_k)] * n)
+        start += laenge
+
+    def flaeche(d_mm):
+        return np.pi / 4 * (np.asarray(d_mm) / 1000) ** 2
+
+    return {
+        "dx": np.array(dx),
+        "flaeche_zelle": flaeche(d_zelle),
+        "flaeche_grenze": flaeche(d_grenze),
+        "temperatur_k": np.array(temperatur),
+        "x_m": np.array(x),
+    }
+
+
+def _hllc(links, rechts, kappa):
+    """HLLC-Fluss für alle Zellgrenzen auf einmal; links/rechts sind (ρ, u, p), je Form (M,)."""
+    rho_l, u_l, p_l = links
+    rho_r, u_r, p_r = rechts
+    c_l = np.sqrt(kappa * p_l / rho_l)
+    c_r = np.sqrt(kappa * p_r / rho_r)
+    e_l = p_l / (kappa - 1) + 0.5 * rho_l * u_l**2
+    e_r = p_r / (kappa - 1) + 0.5 * rho_r * u_r**2
+    s_l = np.minimum(u_l - c_l, u_r - c_r)
+    s_r = np.maximum(u_l + c_l, u_r + c_r)
+    m_l = rho_l * (s_l - u_l)
+    m_r = rho_r * (s_r - u_r)
+    s_m = (p_r - p_l + m_l * u_l - m_r * u_r) / (m_l - m_r)
+
+    def fluss(rho, u, p, e):
+        return np.array([rho * u, rho * u**2 + p, u * (e + p)])
+
+    def stern(rho, u, p, e, s, m):
+        # Fluss der Sternregion: F_K + S_K (U*_K - U_K)
+        faktor = m / (s - s_m)
+        stern_q = np.array([faktor, faktor * s_m, faktor * (e / rho + (s_m - u) * (s_m + p / m))])
+        return fluss(rho, u, p, e) + s * (stern_q - np.array([rho, rho * u, e]))
+
+    return np.where(
+        s_l >= 0, fluss(rho_l, u_l, p_l, e_l),
+        np.where(s_m >= 0, stern(rho_l, u_l, p_l, e_l, s_l, m_l),
+                 np.where(s_r > 0, stern(rho_r, u_r, p_r, e_r, s_r, m_r), fluss(rho_r, u_r, p_r, e_r)))
+    )
+
+
+def _minmod(a, b):
+    return np.where(a * b > 0, np.sign(a) * np.minimum(np.abs(a), np.abs(b)), 0.0)
+
+
+class _Auspuffrohr:
+    """Zustand und räumliche Ableitung des Rohrs; die Zeitschleife steckt in simuliere_auspuff."""
+
+    def __init__(self, gitter, gas):
+        self.kappa = gas["kappa"]
+        self.r = gas["r_spezifisch"]
+        self.dx = gitter["dx"]
+        self.a_zelle = gitter["flaeche_zelle"]
+        self.a_grenze = gitter["flaeche_grenze"]
+        self.t_wand = gitter["temperatur_k"]
+        # Wandreibung λ/(2D) je Zelle
+        self.reibung = gas["rohrreibungszahl"] / (2 * np.sqrt(4 * self.a_zelle / np.pi))
+        self.p_umgebung = gas["umgebungsdruck_bar"] * 1e5
+        self.rho_umgebung = self.p_umgebung / (self.r * gas["umgebungstemperatur_k"])
+        # Anfangszustand: ruhendes Gas mit Umgebungsdruck und Wandtemperatur
+        rho = self.p_umgebung / (self.r * self.t_wand)
+        self.q = np.array([rho, np.zeros_like(rho), self.p_umgebung / (self.kappa - 1) + np.zeros_like(rho)])
+
+    def primitiv(self, q):
+        rho = q[0]
+        u = q[1] / rho
+        p = (self.kappa - 1) * (q[2] - 0.5 * rho * u**2)
+        return rho, u, p
+
+    def ableitung(self, q, zylinder, oeffnung):
+        """
+        dq/dt für alle Zellen und der Massen- und Energiestrom in den Zylinder zurück.
+
+        Args:
+            zylinder (tuple): (ρ, p) im Zylinder.
+            oeffnung (float): Offener Anteil des Rohrquerschnitts am Auslass, 0..1.
+        """
+        rho, u, p = self.primitiv(q)
+        w = np.array([rho, u, p])
+        # MUSCL: begrenzte Steigungen im Inneren, erste und letzte Zelle konstant
+        steigung = np.zeros_like(w)
+        steigung[:, 1:-1] = _minmod(w[:, 1:-1] - w[:, :-2], w[:, 2:] - w[:, 1:-1])
+        links = w[:, :-1] + 0.5 * steigung[:, :-1]
+        rechts = w[:, 1:] - 0.5 * steigung[:, 1:]
+        fluss = np.empty((3, len(rho) + 1))
+        fluss[:, 1:-1] = _hllc(links, rechts, self.kappa)
+
+        # Auslassschlitz: offener Anteil strömt gegen den ruhenden Zylinder, der Rest gegen eine Wand
+        erste = w[:, :1]
+        wand = _hllc(np.array([erste[0], -erste[1], erste[2]]), erste, self.kappa)[:, 0]
+        if oeffnung > 0:
+            offen = _hllc(np.array([[zylinder[0]], [0.0], [zylinder[1]]]), erste, self.kappa)[:, 0]
+            fluss[:, 0] = oeffnung * offen + (1 - oeffnung) * wand
+        else:
+            fluss[:, 0] = wand
+
+        # Offenes Ende: Umgebungsdruck, beim Einströmen Umgebungsdichte
+        rho_n, u_n = rho[-1], u[-1]
+        aussen = np.array([[rho_n if u_n >= 0 else self.rho_umgebung], [u_n], [self.p_umgebung]])
+        fluss[:, -1] = _hllc(w[:, -1:], aussen, self.kappa)[:, 0]
+
+        fluss_a = fluss * self.a_grenze
+        dq = -(fluss_a[:, 1:] - fluss_a[:, :-1]) / self.dx
+        dq[1] += p * (self.a_grenze[1:] - self.a_grenze[:-1]) / self.dx
+        # Auf Fläche der Zelle bezogen: q enthält Werte pro Volumen
+        dq /= self.a_zelle
+        dq[1] -= self.reibung * rho * u * np.abs(u)
+        return dq, fluss_a[:, 0]
+
+    def zeitschritt(self, cfl):
+        rho, u, p = self.primitiv(self.q)
+        return cfl * float(np.min(self.dx / (np.abs(u) + np.sqrt(self.kappa * p / rho))))
+
+    def waerme(self, dt, zeitkonstante_s):
+        """Gleicht die Gastemperatur mit der Zeitkonstante an die Wandtemperatur an."""
+        if not zeitkonstante_s:
+            return
+        rho, u, p = self.primitiv(self.q)
+        p_neu = p + rho * self.r * (self.t_wand - p / (rho * self.r)) * min(dt / zeitkonstante_s, 1.0)
+        self.q[2] = p_neu / (self.kappa - 1) + 0.5 * rho * u**2
+
+
+def _blendenstrom(p_vor, t_vor, p_nach, flaeche_m2, kappa, r):
+    """Massenstrom in kg/s durch eine Blende (Saint-Venant/Wantzel, mit Sperrgrenze)."""
+    if flaeche_m2 <= 0 or p_nach >= p_vor:
+        return 0.0
+    verhaeltnis = max(p_nach / p_vor, (2 / (kappa + 1)) ** (kappa / (kappa - 1)))
+    psi = math.sqrt(2 * kappa / (kappa - 1) * (verhaeltnis ** (2 / kappa) - verhaeltnis ** ((kappa + 1) / kappa)))
+    return flaeche_m2 * p_vor / math.sqrt(r * t_vor) * psi
+
+
+def _steuerwinkel(motor):
+    """Öffnungswinkel nach OT von Auslass und Überströmern."""
+    auslass = hub_zu_kurbelwinkel(motor["auslass_mm"], motor["pleuel_mm"], motor["hub_mm"])
+    ueberstroemer = hub_zu_kurbelwinkel(motor["ueberstroemer_mm"], motor["pleuel_mm"], motor["hub_mm"])
+    return auslass, ueberstroemer
+
+
+def simuliere_auspuff(segmente, drehzahl_upm, motor=None, gas=None, zellgroesse_m=0.005, zyklen=4, cfl=0.8):
+    """
+    Simuliert den Auspuff über mehrere Kurbelumdrehungen und liefert den Druck am Auslassschlitz.
+
+    Der Zylinder wird bei Auslass öffnet auf druck_ao_bar/temperatur_ao_k gesetzt und entspannt
+    sich mit der Kolbenbewegung und dem Ausströmen in den Auspuff. Über die offenen Überströmer
+    strömt Frischgas aus dem Kurbelhaus (spueldruck_bar/spueltemperatur_k) nach bzw. Abgas
+    zurück, wenn der Zylinderdruck höher ist. Ausgewertet wird die letzte Umdrehung, die ersten
+    dienen zum Einschwingen.
+
+    Args:
+        segmente (list): Auspuffsegmente, siehe Modulbeschreibung.
+        drehzahl_upm (float): Drehzahl in U/min.
+        motor (dict): Motordaten, fehlende Werte aus MOTOR_STANDARD.
+        gas (dict): Gasdaten, fehlende Werte aus GAS.
+        zellgroesse_m (float): Angestrebte Zellbreite in m.
+        zyklen (int): Anzahl gerechneter Kurbelumdrehungen.
+        cfl (float): CFL-Zahl des Zeitschritts.
+
+    Returns:
+        dict: "winkel_grad" (0..359 °KW nach OT), "druck_bar" (Druck am Auslassschlitz über die
+            letzte Umdrehung), "rueckstau_bar" (mittlerer Druck zwischen Überströmer schließt und
+            Auslass schließt), "auslass_oeffnet_grad", "ueberstroemer_oeffnet_grad", "drehzahl_upm".
+    """
+    if drehzahl_upm <= 0:
+        raise ValueError("Die Drehzahl muss positiv sein.")
+    motor = {**MOTOR_STANDARD, **(motor or {})}
+    gas = {**GAS, **(gas or {})}
+    rohr = _Auspuffrohr(rechengitter(segmente, zellgroesse_m, gas["temperatur_k"]), gas)
+    kappa, r = rohr.kappa, rohr.r
+
+    # Kurbeltrieb: Zylindervolumen und offener Anteil des Auslasses über die Umdrehung
+    auslass_grad, ueberstroemer_grad = _steuerwinkel(motor)
+    kolbenflaeche_m2 = np.pi / 4 * (motor["bohrung_mm"] / 1000) ** 2
+    hubraum_m3 = kolbenflaeche_m2 * motor["hub_mm"] / 1000
+    brennraum_m3 = hubraum_m3 / (motor["verdichtung"] - 1)
+    profil_winkel, profil_flaeche = kanalflaechen_profil(
+        motor["hub_mm"], motor["pleuel_mm"], motor["auslass_mm"], motor["auslass_breite_mm"],
+        motor["hub_mm"] - motor["auslass_mm"], motor["auslass_eckradius_mm"]
+    )
+    anteil_profil = np.minimum(motor["durchflusszahl"] * profil_flaeche * 1e-6 / rohr.a_grenze[0], 1.0)
+    _, ueberstroemer_profil = kanalflaechen_profil(
+        motor["hub_mm"], motor["pleuel_mm"], motor["ueberstroemer_mm"], motor["ueberstroemer_breite_mm"],
+        motor["hub_mm"] - motor["ueberstroemer_mm"], 0.0, motor["ueberstroemer_anzahl"]
+    )
+    ueberstroemer_profil = motor["durchflusszahl"] * ueberstroemer_profil * 1e-6
+    cp = kappa * r / (kappa - 1)
+    p_kurbelhaus = motor["spueldruck_bar"] * 1e5
+    t_kurbelhaus = motor["spueltemperatur_k"]
+
+    def volumen(winkel):
+        return brennraum_m3 + kolbenflaeche_m2 * kurbelwinkel_zu_hub_exakt(winkel, motor["pleuel_mm"], motor["hub_mm"]) / 1000
+
+    grad_pro_s = 6.0 * drehzahl_upm
+    ende_s = zyklen * 360.0 / grad_pro_s
+    zeit, winkel_alt = 0.0, 0.0
+    masse, energie = 0.0, 0.0   # Zylinderinhalt, wird bei Auslass öffnet gesetzt
+    aufzeichnung_winkel, aufzeichnung_druck = [], []
+    letzte_umdrehung = (zyklen - 1) * 360.0
+
+    while zeit < ende_s:
+        dt = min(rohr.zeitschritt(cfl), ende_s - zeit)
+        winkel_gesamt = zeit * grad_pro_s
+        winkel = winkel_gesamt % 360.0
+        v = volumen(winkel)
+
+        # Verbrennung: bei Auslass öffnet beginnt jede Umdrehung mit dem gleichen Zylinderzustand
+        if winkel_alt < auslass_grad <= winkel:
+            masse = motor["druck_ao_bar"] * 1e5 * v / (r * motor["temperatur_ao_k"])
+            energie = motor["druck_ao_bar"] * 1e5 * v / (kappa - 1)
+        oeffnung = float(np.interp(winkel, profil_winkel, anteil_profil))
+        zylinder = (masse / v, (kappa - 1) * energie / v) if masse > 0 else (rohr.rho_umgebung, rohr.p_umgebung)
+
+        # Heun-Verfahren; der Zylinder bekommt den Mittelwert der beiden Randflüsse
+        dq1, rand1 = rohr.ableitung(rohr.q, zylinder, oeffnung)
+        q1 = rohr.q + dt * dq1
+        dq2, rand2 = rohr.ableitung(q1, zylinder, oeffnung)
+        rohr.q = 0.5 * (rohr.q + q1 + dt * dq2)
+        rohr.waerme(dt, gas["waerme_zeitkonstante_s"])
+
+        zeit += dt
+        v_neu = volumen((zeit * grad_pro_s) % 360.0)
+        if masse > 0:
+            # Zylinder: Auslass (Randfluss des Rohrs), Überströmer (Blende zum Kurbelhaus), Kolbenarbeit
+            rand = 0.5 * (rand1 + rand2) if oeffnung > 0 else np.zeros(3)
+            p_zyl = zylinder[1]
+            t_zyl = p_zyl / (zylinder[0] * r)
+            flaeche = float(np.interp(winkel, profil_winkel, ueberstroemer_profil))
+            zustrom = _blendenstrom(p_kurbelhaus, t_kurbelhaus, p_zyl, flaeche, kappa, r)
+            rueckstrom = _blendenstrom(p_zyl, t_zyl, p_kurbelhaus, flaeche, kappa, r)
+            masse = max(masse + dt * (zustrom - rueckstrom - rand[0]), 1e-12)
+            energie += dt * (cp * (zustrom * t_kurbelhaus - rueckstrom * t_zyl) - rand[2]) - p_zyl * (v_neu - v)
+            energie = max(energie, 1e-9)
+        winkel_alt = winkel
+
+        if winkel_gesamt >= letzte_umdrehung:
+            aufzeichnung_winkel.append(winkel_gesamt - letzte_umdrehung)
+            aufzeichnung_druck.append(rohr.primitiv(rohr.q[:, :1])[2][0])
+
+    winkel_grad = np.arange(360.0)
+    druck_bar = np.interp(winkel_grad, aufzeichnung_winkel, aufzeichnung_druck) / 1e5
+    fenster = (winkel_grad >= 360.0 - ueberstroemer_grad) & (winkel_grad <= 360.0 - auslass_grad)
+    return {
+        "winkel_grad": winkel_grad,
+        "druck_bar": druck_bar,
+        "rueckstau_bar": float(druck_bar[fenster].mean()) if fenster.any() else math.nan,
+        "auslass_oeffnet_grad": auslass_grad,
+        "ueberstroemer_oeffnet_grad": ueberstroemer_grad,
+        "drehzahl_upm": float(drehzahl_upm),
+    }
+
+
+def _simuliere(argumente):
+    # Läuft im Arbeitsprozess
+    segmente, drehzahl, optionen = argumente
+    return simuliere_auspuff(segmente, drehzahl, **optionen)
+
+
+def drehzahl_sweep(segmente, drehzahlen_upm, prozesse=None, **optionen):
+    """
+    Simuliert den Auspuff für viele Drehzahlen, verteilt auf einen Prozesspool.
+
+    Args:
+        segmente (list): Auspuffsegmente, siehe Modulbeschreibung.
+        drehzahlen_upm (array): Drehzahlen in U/min.
+        prozesse (int): Anzahl der Arbeitsprozesse, None für alle Kerne, 1 für keinen Pool.
+        **optionen: Weitere Argumente für simuliere_auspuff (motor, gas, zellgroesse_m, ...).
+
+    Returns:
+        dict: "drehzahl_upm" (R,), "rueckstau_bar" (R,), "druck_bar" (R, 360), "winkel_grad" (360,),
+            "resonanz_upm" (Drehzahl mit dem höchsten Rückstau vor Auslass schließt) und
+            "maxima_upm" (alle lokalen Maxima des Rückstaus, das höchste zuerst).
+    """
+    drehzahlen = np.atleast_1d(np.asarray(drehzahlen_upm, dtype=float))
+    auftraege = [(segmente, float(n), optionen) for n in drehzahlen]
+    prozesse = prozesse or os.cpu_count() or 1
+    if prozesse == 1 or len(auftraege) == 1:
+        ergebnisse = [_simuliere(auftrag) for auftrag in auftraege]
+    else:
+        with ProcessPoolExecutor(max_workers=prozesse) as pool:
+            ergebnisse = list(pool.map(_simuliere, auftraege))
+
+    rueckstau = np.array([e["rueckstau_bar"] for e in ergebnisse])
+    # Lokale Maxima; neben der Hauptresonanz entstehen Nebenresonanzen durch Mehrfachreflexionen
+    gepolstert = np.concatenate(([-np.inf], np.nan_to_num(rueckstau, nan=-np.inf), [-np.inf]))
+    maxima = np.flatnonzero((gepolstert[1:-1] > gepolstert[:-2]) & (gepolstert[1:-1] >= gepolstert[2:]))
+    maxima = maxima[np.argsort(-rueckstau[maxima])]
+    return {
+        "drehzahl_upm": drehzahlen,
+        "rueckstau_bar": rueckstau,
+        "druck_bar": np.array([e["druck_bar"] for e in ergebnisse]),
+        "winkel_grad": ergebnisse[0]["winkel_grad"],
+        "resonanz_upm": float(drehzahlen[np.nanargmax(rueckstau)]),
+        "maxima_upm": drehzahlen[maxima],
+    }
@@ -0,0 +1,172 @@
+"""
+Druckbare Gradscheibe ohne UI-Abhängigkeiten.
+
+Alle 360 Gradstriche liegen in einer einzigen LineCollection. Für die interaktive Anzeige
+wird die statische Scheibe einmal gerendert und als Hintergrund zwischengespeichert;
+pro Anfrage wird nur noch die rote Zündmarkierung darüber gezeichnet (Blitting).
+"""
+import io
+import threading
+from functools import lru_cache
+
+import numpy as np
+from matplotlib import image
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+FIGUR_GROESSE = 10  # Größe der Figur in Zoll (ca. 25 cm)
+
+
+def _gradstriche():
+    """Liefert Segmente, Farben und Linienstärken aller 360 Gradstriche."""
+    grad = np.arange(360)
+    winkel_rad = np.deg2rad(grad)
+    zehner = grad % 10 == 0
+    fuenfer = ~zehner & (grad % 5 == 0)
+    innen = np.where(zehner, 0.9, np.where(fuenfer, 0.95, 0.98))
+    segmente = np.stack([np.column_stack([winkel_rad, innen]), np.column_stack([winkel_rad, np.ones(360)])], axis=1)
+    farben = np.where((zehner | fuenfer)[:, np.newaxis], [0.0, 0.0, 0.0, 1.0], [0.5, 0.5, 0.5, 1.0])
+    linienstaerken = np.where(zehner, 1.5, np.where(fuenfer, 1.0, 0.5))
+    return segmente, farben, linienstaerken
+
+
+def zeichne_scheibe(ax, skalierung=1.0):
+    """
+    Zeichnet die statischen Teile der Gradscheibe (Striche, Beschriftung, Drehrichtung).
+
+    Args:
+        ax: Eine Matplotlib-Achse mit polarer Projektion.
+        skalierung (float): Faktor für Schriftgrößen und Linienstärken, 1.0 für die Bildschirmgröße.
+    """
+    ax.set_theta_zero_location('N')
+    ax.set_theta_direction(-1)
+    ax.set_yticklabels([])
+    ax.set_rgrids([])
+    ax.spines['polar'].set_visible(False)
+    ax.set_ylim(0, 1.2)
+
+    segmente, farben, linienstaerken = _gradstriche()
+    ax.add_collection(LineCollection(segmente, colors=farben, linewidths=linienstaerken * skalierung))
+    for grad in range(0, 360, 10):
+        ax.text(np.deg2rad(grad), 1.05, str(grad), ha='center', va='center', fontsize=12 * skalierung, weight='bold')
+
+    ax.text(0, 0, 'Gradscheibe\nOT bei 0°', ha='center', va='center', fontsize=16 * skalierung, weight='bold')
+    ax.annotate('Motordrehrichtung',
+                xy=np.deg2rad([300, 1]),
+                xytext=np.deg2rad([300, 0.6]),
+                arrowprops=dict(arrowstyle="<-", color="blue", linewidth=2 * skalierung, connectionstyle="arc3,rad=0.2"),
+                ha='center', va='center', fontsize=12 * skalierung, color='blue')
+
+
+def zeichne_markierung(ax, winkel, beschriftung='Zündung', farbe='red', skalierung=1.0):
+    """
+    Zeichnet eine Markierung (Zündung, Steuerzeit, OT-Versatz ...) auf die Gradscheibe.
+
+    Args:
+        ax: Eine Matplotlib-Achse, auf der zeichne_scheibe bereits gezeichnet hat.
+        winkel (float): Winkel der Markierung in Grad.
+        beschriftung (str): Text der Markierung.
+        farbe (str): Matplotlib-Farbe der Markierung.
+        skalierung (float): Faktor für Schriftgröße und Linienstärke.
+
+    Returns:
+        list: Die erzeugten Artists, damit sie wieder entfernt werden können.
+    """
+    winkel_rad = np.deg2rad(winkel)
+    linie, = ax.plot([winkel_rad, winkel_rad], [0.85, 1.0], color=farbe, linewidth=2.5 * skalierung, zorder=10)
+    text = ax.text(winkel_rad, 0.8, f'{beschriftung}\n({winkel:.1f}°)', ha='center', va='center',
+                   fontsize=14 * skalierung, weight='bold', color=farbe, rotation=-winkel)
+    return [linie, text]
+
+
+def _zuendmarkierung(ax, animated=False):
+    linie, = ax.plot([], [], color='red', linewidth=2.5, zorder=10, animated=animated)
+    text = ax.text(0, 0.8, '', ha='center', va='center', fontsize=14, weight='bold', color='red',
+                   animated=animated)
+    return linie, text
+
+
+def _setze_zuendmarkierung(linie, text, zuendwinkel):
+    """Setzt die Markierung und gibt zurück, ob sie sichtbar ist."""
+    if zuendwinkel is None or not 0 < zuendwinkel < 360:
+        return False
+    zuendwinkel_rad = np.deg2rad(zuendwinkel)
+    linie.set_data([zuendwinkel_rad, zuendwinkel_rad], [0.85, 1.0])
+    text.set_position((zuendwinkel_rad, 0.8))
+    text.set_text(f'Zündung\n({zuendwinkel:.1f}°)')
+    text.set_rotation(-zuendwinkel)
+    return True
+
+
+def plotte_gradscheibe(zuendwinkel):
+    """
+    Erstellt eine Gradscheibe als eigenständige Matplotlib-Figur (z.B. zum Speichern als PDF/SVG).
+
+    Args:
+        zuendwinkel (float): Hervorzuhebender Zündwinkel in Grad, None für keine Markierung.
+
+    Returns:
+        matplotlib.figure.Figure: Die Figur mit der Gradscheibe.
+    """
+    fig = Figure(figsize=(FIGUR_GROESSE, FIGUR_GROESSE))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(projection='polar')
+    zeichne_scheibe(ax)
+    linie, text = _zuendmarkierung(ax)
+    if not _setze_zuendmarkierung(linie, text, zuendwinkel):
+        linie.remove()
+        text.remove()
+    return fig
+
+
+_render_sperre = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _hintergrund():
+    # Statische Scheibe einmal rendern und den Pixelpuffer für das Blitting merken
+    fig = Figure(figsize=(FIGUR_GROESSE, FIGUR_GROESSE))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(projection='polar')
+    zeichne_scheibe(ax)
+    linie, text = _zuendmarkierung(ax, animated=True)
+    canvas.draw()
+    return canvas, ax, linie, text, canvas.copy_from_bbox(fig.bbox)
+
+
+def rendere_gradscheibe(zuendwinkel):
+    """
+    Rendert die Gradscheibe als Bild; nur die Zündmarkierung wird neu gezeichnet.
+
+    Args:
+        zuendwinkel (float): Hervorzuhebender Zündwinkel in Grad, None für keine Markierung.
+
+    Returns:
+        np.ndarray: RGBA-Bild (Höhe x Breite x 4, uint8).
+    """
+    with _render_sperre:
+        canvas, ax, linie, text, hintergrund = _hintergrund()
+        canvas.restore_region(hintergrund)
+        if _setze_zuendmarkierung(linie, text, zuendwinkel):
+            ax.draw_artist(linie)
+            ax.draw_artist(text)
+        return np.asarray(canvas.buffer_rgba()).copy()
+
+
+def gradscheibe_png(zuendwinkel):
+    """
+    Rendert die Gradscheibe als PNG-Datei im Speicher.
+
+    Die Bytes sind rund 40-mal kleiner als das RGBA-Bild und lassen sich direkt anzeigen oder
+    zwischenspeichern. Das Kodieren kostet mehr als das Rendern, deshalb mit schwacher Kompression.
+
+    Args:
+        zuendwinkel (float): Hervorzuhebender Zündwinkel in Grad, None für keine Markierung.
+
+    Returns:
+        bytes: Die PNG-Datei.
+    """
+    puffer = io.BytesIO()
+    image.imsave(puffer, rendere_gradscheibe(zuendwinkel), format="png", pil_kwargs={"compress_level": 1})
+    return puffer.getvalue()
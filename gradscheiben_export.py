@@ -0,0 +1,191 @@
+"""
+Stapelexport druckbarer Gradscheiben im Originalmaßstab.
+
+Jede Scheibe wird durch ein dict beschrieben, z.B.:
+
+    {"name": "Kunde 17", "durchmesser_mm": 200,
+     "markierungen": [{"winkel": 21.86, "text": "Zündung"},
+                      {"winkel": 85.1, "text": "AÖ", "farbe": "blue"}]}
+
+Der Durchmesser bezieht sich auf den Außenrand der Gradstriche und wird im PDF/SVG
+maßstabsgetreu wiedergegeben (Ausdruck mit 100 %). Die Seiten werden in einem Prozesspool
+gerendert. Jeder Prozess hält pro Durchmesser eine fertige Vorlage mit allen Strichen und
+Beschriftungen und zeichnet pro Seite nur noch die eigenen Markierungen.
+
+Aufruf:
+    python gradscheiben_export.py scheiben.json -o gradscheiben.pdf
+    python gradscheiben_export.py scheiben.json -o svg_ordner --format svg
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+
+from gradscheibe import zeichne_markierung, zeichne_scheibe
+
+MM_PRO_ZOLL = 25.4
+A4_MM = (210.0, 297.0)
+RAND_MM = 10.0
+# Durchmesser der Strichkante in der Bildschirmdarstellung, auf den sich die Schriftgrößen beziehen
+REFERENZ_DURCHMESSER_MM = 163.0
+
+# Die Vorlagen werden von allen Threads geteilt (z.B. gleichzeitige Anfragen der Gradio-App ohne pypdf):
+# Zeichnen, Speichern und Aufräumen einer Seite darf sich nicht mit einer anderen überschneiden
+_vorlagen_sperre = threading.Lock()
+
+
+@lru_cache(maxsize=8)
+def _vorlage(durchmesser_mm):
+    # Seite mindestens A4 hochkant, bei großen Scheiben entsprechend größer
+    achse_mm = durchmesser_mm * 1.2  # ylim(0, 1.2): die Strichkante liegt bei Radius 1.0
+    breite_mm = max(A4_MM[0], achse_mm + 2 * RAND_MM)
+    hoehe_mm = max(A4_MM[1], achse_mm + 2 * RAND_MM)
+    fig = Figure(figsize=(breite_mm / MM_PRO_ZOLL, hoehe_mm / MM_PRO_ZOLL))
+    ax = fig.add_axes(
+        [(breite_mm - achse_mm) / 2 / breite_mm, (hoehe_mm - achse_mm) / 2 / hoehe_mm,
+         achse_mm / breite_mm, achse_mm / hoehe_mm],
+        projection='polar',
+    )
+    zeichne_scheibe(ax, skalierung=durchmesser_mm / REFERENZ_DURCHMESSER_MM)
+    return fig, ax
+
+
+def _zeichne_seite(spezifikation, speichern):
+    """Zeichnet die Markierungen einer Scheibe in die Vorlage, speichert und räumt wieder auf."""
+    durchmesser_mm = float(spezifikation.get("durchmesser_mm", REFERENZ_DURCHMESSER_MM))
+    with _vorlagen_sperre:
+        _zeichne_in_vorlage(spezifikation, durchmesser_mm, speichern)
+
+
+def _zeichne_in_vorlage(spezifikation, durchmesser_mm, speichern):
+    fig, ax = _vorlage(durchmesser_mm)
+    skalierung = durchmesser_mm / REFERENZ_DURCHMESSER_MM
+
+    artists = []
+    for markierung in spezifikation.get("markierungen", []):
+        artists += zeichne_markierung(
+            ax, float(markierung["winkel"]), markierung.get("text", "Zündung"),
+            markierung.get("farbe", "red"), skalierung
+        )
+    name = spezifikation.get("name")
+    if name:
+        artists.append(fig.text(0.5, 1 - RAND_MM / 2 / (fig.get_figheight() * MM_PRO_ZOLL), name,
+                                ha='center', va='center', fontsize=12))
+    try:
+        speichern(fig)
+    finally:
+        for artist in artists:
+            artist.remove()
+
+
+def _rendere_dateien(auftraege):
+    # Läuft im Arbeitsprozess: jede Scheibe als eigene Datei
+    for spezifikation, pfad, dateiformat in auftraege:
+        _zeichne_seite(spezifikation, lambda fig: fig.savefig(pfad, format=dateiformat))
+    return len(auftraege)
+
+
+def _rendere_pdf(spezifikationen, pfad):
+    # Läuft im Arbeitsprozess oder direkt: mehrere Scheiben als Seiten einer PDF
+    with PdfPages(pfad) as pdf:
+        for spezifikation in spezifikationen:
+            _zeichne_seite(spezifikation, pdf.savefig)
+    return len(spezifikationen)
+
+
+def _pakete(elemente, anzahl):
+    """Teilt eine Liste in höchstens anzahl zusammenhängende, etwa gleich große Pakete."""
+    groesse = max(1, -(-len(elemente) // anzahl))
+    return [elemente[i:i + groesse] for i in range(0, len(elemente), groesse)]
+
+
+def _dateiname(index, spezifikation, dateiformat):
+    name = re.sub(r"[^\w.-]+", "_", str(spezifikation.get("name", ""))).strip("_")
+    return f"{index + 1:04d}_{name}.{dateiformat}" if name else f"{index + 1:04d}.{dateiformat}"
+
+
+def exportiere_gradscheiben(spezifikationen, ziel, dateiformat="pdf", prozesse=None):
+    """
+    Exportiert viele Gradscheiben maßstabsgetreu als mehrseitige PDF oder als Ordner voller Dateien.
+
+    Die Seiten werden parallel in einem Prozesspool gerendert. Für eine einzelne mehrseitige PDF
+    werden die Teil-PDFs der Prozesse mit pypdf zusammengefügt; ist pypdf nicht installiert,
+    wird die PDF im aktuellen Prozess erzeugt.
+
+    Args:
+        spezifikationen (list): Liste von dicts mit name, durchmesser_mm und markierungen.
+        ziel (str): Pfad der PDF-Datei (dateiformat "pdf") bzw. des Ordners ("svg" oder "pdf-einzeln").
+        dateiformat (str): "pdf" für eine mehrseitige PDF, "svg" oder "pdf-einzeln" für einen Ordner.
+        prozesse (int): Anzahl der Arbeitsprozesse, None für alle Kerne, 1 für keinen Pool.
+
+    Returns:
+        int: Anzahl der exportierten Scheiben.
+    """
+    spezifikationen = list(spezifikationen)
+    prozesse = prozesse or os.cpu_count() or 1
+    # Gleiche Durchmesser beieinander lassen, damit jeder Prozess seine Vorlagen wiederverwendet
+    reihenfolge = sorted(range(len(spezifikationen)), key=lambda i: float(spezifikationen[i].get("durchmesser_mm", 0)))
+
+    if dateiformat in ("svg", "pdf-einzeln"):
+        endung = "svg" if dateiformat == "svg" else "pdf"
+        os.makedirs(ziel, exist_ok=True)
+        auftraege = [
+            (spezifikationen[i], os.path.join(ziel, _dateiname(i, spezifikationen[i], endung)), endung)
+            for i in reihenfolge
+        ]
+        if prozesse == 1:
+            return _rendere_dateien(auftraege)
+        with ProcessPoolExecutor(max_workers=prozesse) as pool:
+            return sum(pool.map(_rendere_dateien, _pakete(auftraege, prozesse * 4)))
+
+    if dateiformat != "pdf":
+        raise ValueError(f"Unbekanntes Dateiformat: {dateiformat}")
+
+    try:
+        from pypdf import PdfWriter
+    except ImportError:
+        PdfWriter = None
+    if PdfWriter is None and prozesse > 1 and len(spezifikationen) > 1:
+        warnings.warn("pypdf ist nicht installiert, die PDF wird ohne Prozesspool in einem Prozess erzeugt.",
+                      RuntimeWarning, stacklevel=2)
+    if prozesse == 1 or PdfWriter is None or len(spezifikationen) < 2:
+        return _rendere_pdf(spezifikationen, ziel)
+
+    # Zusammenhängende Pakete in Originalreihenfolge, damit die Seitenfolge erhalten bleibt
+    pakete = _pakete(spezifikationen, prozesse)
+    with tempfile.TemporaryDirectory() as ordner:
+        teile = [os.path.join(ordner, f"teil_{i:04d}.pdf") for i in range(len(pakete))]
+        with ProcessPoolExecutor(max_workers=prozesse) as pool:
+            anzahl = sum(pool.map(_rendere_pdf, pakete, teile))
+        schreiber = PdfWriter()
+        for teil in teile:
+            schreiber.append(teil)
+        with open(ziel, "wb") as datei:
+            schreiber.write(datei)
+    return anzahl
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gradscheiben maßstabsgetreu als PDF/SVG exportieren.")
+    parser.add_argument("eingabe", help="JSON-Datei mit einer Liste von Scheiben (- für stdin)")
+    parser.add_argument("-o", "--ausgabe", required=True, help="PDF-Datei bzw. Ordner")
+    parser.add_argument("--format", dest="dateiformat", default="pdf", choices=["pdf", "svg", "pdf-einzeln"])
+    parser.add_argument("-j", "--prozesse", type=int, default=None, help="Anzahl Arbeitsprozesse")
+    args = parser.parse_args()
+
+    if args.eingabe == "-":
+        scheiben = json.load(sys.stdin)
+    else:
+        with open(args.eingabe, encoding="utf-8") as datei:
+            scheiben = json.load(datei)
+    anzahl = exportiere_gradscheiben(scheiben, args.ausgabe, args.dateiformat, args.prozesse)
+    print(f"{anzahl} Gradscheiben exportiert nach {args.ausgabe}", file=sys.stderr)
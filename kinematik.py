@@ -0,0 +1,248 @@
+"""
+Kinematik des Kurbeltriebs ohne UI-Abhängigkeiten.
+
+Die Formeln stammen aus dem Buch "Zweitakt-Motoren Tuning" von Christian Rieck, Seite 112.
+Alle Funktionen akzeptieren Python-Zahlen oder NumPy-Arrays und broadcasten über
+Kurbelwinkel, Pleuellänge und Hub gleichzeitig. Bei rein skalaren Eingaben wird wie
+bisher ein float zurückgegeben. Die *_messwert Funktionen liefern stattdessen einen
+Messwert mit Einheit und Fehlercode je Element (siehe ergebnisse), berechne_* den Anzeigetext.
+"""
+import numpy as np
+
+import formeln
+from ergebnisse import (FEHLER_AUSSERHALB_HUB, FEHLER_NICHT_POSITIV, FEHLER_PLEUEL_ZU_KURZ, GUELTIG, Messwert,
+                        alle_skalar as _alle_skalar, formatiere_wert, positiv)
+# Skalarer Pfad über math, NumPy lohnt sich für einzelne Werte nicht
+from formeln import hub_zu_kurbelwinkel as _hub_zu_kurbelwinkel_skalar, kurbelwinkel_zu_hub as _kurbelwinkel_zu_hub_skalar
+
+
+def _als_ergebnis(wert, *eingaben):
+    """Gibt bei rein skalaren Eingaben ein float zurück, sonst das Array."""
+    if _alle_skalar(*eingaben):
+        return float(wert)
+    return wert
+
+
+def kurbelwinkel_zu_hub_exakt(kurbelwinkel_grad, pleuelstange_mm, hub_mm):
+    """
+    Berechnet den Kolbenweg vom oberen Totpunkt (OT) mit der exakten geometrischen Formel.
+
+    Formel (27): s = r * (1 + l/r - cos(phi) - sqrt((l/r)**2 - sin(phi)**2))
+
+    Elemente mit Hub <= 0 oder Pleuellänge <= 0 liefern 0.0, Elemente mit einer Pleuellänge
+    kleiner als der Kurbelradius NaN; die übrigen Elemente eines Arrays werden normal berechnet.
+    Nur bei rein skalaren Eingaben wird dafür wie bisher ein ValueError ausgelöst.
+
+    Args:
+        kurbelwinkel_grad (float | np.ndarray): Der Kurbelwinkel in Grad nach dem OT.
+        pleuelstange_mm (float | np.ndarray): Die Länge der Pleuelstange in mm.
+        hub_mm (float | np.ndarray): Der Gesamthub des Motors in mm.
+
+    Returns:
+        float | np.ndarray: Der Weg des Kolbens vom OT in mm.
+    """
+    if _alle_skalar(kurbelwinkel_grad, pleuelstange_mm, hub_mm):
+        return _kurbelwinkel_zu_hub_skalar(float(kurbelwinkel_grad), float(pleuelstange_mm), float(hub_mm))
+
+    winkel = np.asarray(kurbelwinkel_grad, dtype=float)
+    pleuel = np.asarray(pleuelstange_mm, dtype=float)
+    hub = np.asarray(hub_mm, dtype=float)
+
+    ungueltig = (hub <= 0) | (pleuel <= 0)
+    radius_mm = hub / 2.0
+    zu_kurz = ~ungueltig & (pleuel < radius_mm)
+
+    kurbelwinkel_rad = np.radians(winkel)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        l_r_verhaeltnis = pleuel / radius_mm
+        # Rundungsfehler bei 90/270 Grad abfangen
+        innerhalb_der_wurzel_wert = np.maximum(l_r_verhaeltnis**2 - np.sin(kurbelwinkel_rad)**2, 0)
+        kolbenweg_s = radius_mm * (
+            1 + l_r_verhaeltnis - np.cos(kurbelwinkel_rad) - np.sqrt(innerhalb_der_wurzel_wert)
+        )
+    kolbenweg_s = np.where(ungueltig, 0.0, np.where(zu_kurz, np.nan, kolbenweg_s))
+    return _als_ergebnis(kolbenweg_s, kurbelwinkel_grad, pleuelstange_mm, hub_mm)
+
+
+def kurbelwinkel_zu_hub(kurbelwinkel_grad, pleuelstange_mm, hub_mm, exakte_formel=True):
+    """
+    Berechnet den Kolbenweg vom OT wahlweise exakt oder mit der Näherung aus dem Buch.
+
+    Näherung (Taylor): s = r * (1 + r/(4*l) - cos(phi) - r/(4*l)*cos(2*phi))
+
+    Args:
+        kurbelwinkel_grad (float | np.ndarray): Der Kurbelwinkel in Grad nach dem OT.
+        pleuelstange_mm (float | np.ndarray): Die Länge der Pleuelstange in mm.
+        hub_mm (float | np.ndarray): Der Gesamthub des Motors in mm.
+        exakte_formel (bool): False verwendet die Näherung über Taylor.
+
+    Returns:
+        float | np.ndarray: Der Weg des Kolbens vom OT in mm.
+    """
+    if exakte_formel:
+        return kurbelwinkel_zu_hub_exakt(kurbelwinkel_grad, pleuelstange_mm, hub_mm)
+
+    radius_mm = np.asarray(hub_mm, dtype=float) / 2.0
+    kurbelwinkel_rad = np.radians(np.asarray(kurbelwinkel_grad, dtype=float))
+    r4l = radius_mm / (4 * np.asarray(pleuelstange_mm, dtype=float))
+    kolbenweg_s = radius_mm * (1 + r4l - np.cos(kurbelwinkel_rad) - r4l * np.cos(2 * kurbelwinkel_rad))
+    return _als_ergebnis(kolbenweg_s, kurbelwinkel_grad, pleuelstange_mm, hub_mm)
+
+
+def hub_zu_kurbelwinkel_beide(kolbenweg_mm, pleuelstange_mm, hub_mm):
+    """
+    Berechnet beide Kurbelwinkel, bei denen der Kolben den gegebenen Weg vom OT hat.
+
+    Die Kurbeltrieb-Gleichung wird geschlossen umgekehrt. Mit dem Abstand y = r + l - s
+    zwischen Kurbelwellenmitte und Kolbenbolzen gilt (Kosinussatz im Dreieck r, l, y):
+    cos(phi) = (y**2 + r**2 - l**2) / (2 * r * y)
+
+    Elemente mit Hub <= 0, Pleuellänge <= 0 oder negativem Kolbenweg liefern 0.0 bzw. 360.0,
+    Kolbenwege ab dem Hub liefern 180.0, Pleuellängen kleiner als der Kurbelradius NaN (bei rein
+    skalaren Eingaben ein ValueError).
+
+    Args:
+        kolbenweg_mm (float | np.ndarray): Der Kolbenweg vom OT in mm.
+        pleuelstange_mm (float | np.ndarray): Die Länge der Pleuelstange in mm.
+        hub_mm (float | np.ndarray): Der Gesamthub des Motors in mm.
+
+    Returns:
+        tuple: (Winkel nach OT, Winkel vor OT) in Grad Kurbelwinkel ab OT in Drehrichtung.
+            Der zweite Wert ist 360 minus der erste.
+    """
+    if _alle_skalar(kolbenweg_mm, pleuelstange_mm, hub_mm):
+        nach_ot = _hub_zu_kurbelwinkel_skalar(float(kolbenweg_mm), float(pleuelstange_mm), float(hub_mm))
+        return nach_ot, 360.0 - nach_ot
+
+    kolbenweg = np.asarray(kolbenweg_mm, dtype=float)
+    pleuel = np.asarray(pleuelstange_mm, dtype=float)
+    hub = np.asarray(hub_mm, dtype=float)
+
+    ungueltig = (hub <= 0) | (pleuel <= 0) | (kolbenweg < 0)
+    radius_mm = hub / 2.0
+    # Auch kolbenweg == hub: bei l == r wäre der Abstand y dort 0
+    ueber_hub = ~ungueltig & (kolbenweg >= hub)
+    zu_kurz = ~ungueltig & ~ueber_hub & (pleuel < radius_mm)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        abstand_mm = radius_mm + pleuel - kolbenweg
+        cos_phi = (abstand_mm**2 + radius_mm**2 - pleuel**2) / (2 * radius_mm * abstand_mm)
+        nach_ot = np.degrees(np.arccos(np.clip(cos_phi, -1.0, 1.0)))
+    nach_ot = np.where(ueber_hub, 180.0, np.where(ungueltig, 0.0, np.where(zu_kurz, np.nan, nach_ot)))
+    vor_ot = 360.0 - nach_ot
+    return (
+        _als_ergebnis(nach_ot, kolbenweg_mm, pleuelstange_mm, hub_mm),
+        _als_ergebnis(vor_ot, kolbenweg_mm, pleuelstange_mm, hub_mm),
+    )
+
+
+def hub_zu_kurbelwinkel(kolbenweg_mm, pleuelstange_mm, hub_mm, toleranz=0.0001):
+    """
+    Berechnet den Kurbelwinkel (in Grad vor OT) für einen gegebenen Kolbenweg.
+    Geschlossene Lösung über hub_zu_kurbelwinkel_beide, O(1) je Element.
+
+    Elemente mit Hub <= 0, Pleuellänge <= 0 oder negativem Kolbenweg liefern 0.0,
+    Kolbenwege ab dem Hub liefern 180.0, Pleuellängen kleiner als der Kurbelradius NaN (bei rein
+    skalaren Eingaben ein ValueError).
+
+    Args:
+        kolbenweg_mm (float | np.ndarray): Der gewünschte Kolbenweg in mm vor OT.
+        pleuelstange_mm (float | np.ndarray): Die Länge der Pleuelstange in mm.
+        hub_mm (float | np.ndarray): Der Gesamthub des Motors in mm.
+        toleranz (float): Nur noch aus Kompatibilitätsgründen vorhanden; die Lösung ist exakt.
+
+    Returns:
+        float | np.ndarray: Der berechnete Kurbelwinkel in Grad.
+    """
+    winkel, _ = hub_zu_kurbelwinkel_beide(kolbenweg_mm, pleuelstange_mm, hub_mm)
+    return winkel
+
+
+def _fehlercode_geometrie(pleuel, hub):
+    """Fehlercode je Element für Pleuellänge und Hub; NaN und unendliche Werte gelten als nicht positiv."""
+    return np.where(
+        ~positiv(hub, pleuel), FEHLER_NICHT_POSITIV, np.where(pleuel < hub / 2.0, FEHLER_PLEUEL_ZU_KURZ, GUELTIG)
+    )
+
+
+def berechne_kolbenweg(kurbelwinkel_grad, pleuelstange_mm, hub_mm, format_spec=".3f"):
+    """
+    Kolbenweg vom OT als Anzeigetext wie kolbenweg_messwert(...).formatiere(format_spec).
+
+    Einzelwerte laufen über formeln, ohne einen Messwert anzulegen.
+
+    Returns:
+        str | list: Z.B. "24.582 mm" oder die Fehlermeldung, für Arrays eine Liste von Texten.
+    """
+    if _alle_skalar(kurbelwinkel_grad, pleuelstange_mm, hub_mm):
+        wert, fehlercode = formeln.kolbenweg(float(kurbelwinkel_grad), float(pleuelstange_mm), float(hub_mm))
+        return formatiere_wert(wert, "mm", fehlercode, format_spec)
+    return kolbenweg_messwert(kurbelwinkel_grad, pleuelstange_mm, hub_mm).formatiere(format_spec)
+
+
+def berechne_kurbelwinkel(kolbenweg_mm, pleuelstange_mm, hub_mm, format_spec=".2f"):
+    """
+    Kurbelwinkel vor OT als Anzeigetext wie kurbelwinkel_messwert(...).formatiere(format_spec).
+
+    Einzelwerte laufen über formeln, ohne einen Messwert anzulegen.
+
+    Returns:
+        str | list: Z.B. "22.23°" oder die Fehlermeldung, für Arrays eine Liste von Texten.
+    """
+    if _alle_skalar(kolbenweg_mm, pleuelstange_mm, hub_mm):
+        wert, fehlercode = formeln.kurbelwinkel(float(kolbenweg_mm), float(pleuelstange_mm), float(hub_mm))
+        return formatiere_wert(wert, "°", fehlercode, format_spec)
+    return kurbelwinkel_messwert(kolbenweg_mm, pleuelstange_mm, hub_mm).formatiere(format_spec)
+
+
+def kolbenweg_messwert(kurbelwinkel_grad, pleuelstange_mm, hub_mm):
+    """
+    Kolbenweg vom OT als Messwert in mm, für Skalare oder NumPy-Arrays.
+
+    Anders als kurbelwinkel_zu_hub_exakt wird bei ungültiger Geometrie kein ValueError
+    ausgelöst; die betroffenen Elemente sind NaN und tragen einen Fehlercode.
+
+    Returns:
+        Messwert: Kolbenweg je Element, Fehlercode FEHLER_NICHT_POSITIV (auch für NaN oder einen
+            nicht endlichen Kurbelwinkel) oder FEHLER_PLEUEL_ZU_KURZ.
+    """
+    if _alle_skalar(kurbelwinkel_grad, pleuelstange_mm, hub_mm):
+        wert, fehlercode = formeln.kolbenweg(float(kurbelwinkel_grad), float(pleuelstange_mm), float(hub_mm))
+        return Messwert(float(wert), "mm", fehlercode)
+    winkel = np.asarray(kurbelwinkel_grad, dtype=float)
+    pleuel = np.asarray(pleuelstange_mm, dtype=float)
+    hub = np.asarray(hub_mm, dtype=float)
+    fehlercode = np.where(np.isfinite(winkel), _fehlercode_geometrie(pleuel, hub), FEHLER_NICHT_POSITIV)
+    gueltig = fehlercode == GUELTIG
+    # Ungültige Elemente mit einer gültigen Ersatzgeometrie rechnen und danach maskieren
+    kolbenweg = kurbelwinkel_zu_hub_exakt(winkel, np.where(gueltig, pleuel, 1.0), np.where(gueltig, hub, 1.0))
+    return Messwert(np.where(gueltig, kolbenweg, np.nan), "mm", fehlercode)
+
+
+def kurbelwinkel_messwert(kolbenweg_mm, pleuelstange_mm, hub_mm):
+    """
+    Kurbelwinkel vor OT für einen Kolbenweg als Messwert in Grad, für Skalare oder NumPy-Arrays.
+
+    Statt der Ersatzwerte 0.0 bzw. 180.0 von hub_zu_kurbelwinkel sind ungültige Elemente NaN
+    und tragen einen Fehlercode; bei ungültiger Geometrie wird kein ValueError ausgelöst.
+
+    Returns:
+        Messwert: Kurbelwinkel je Element, Fehlercode FEHLER_NICHT_POSITIV (auch für NaN oder
+            einen nicht endlichen Kolbenweg), FEHLER_PLEUEL_ZU_KURZ oder FEHLER_AUSSERHALB_HUB
+            (Kolbenweg negativ oder größer als der Hub).
+    """
+    if _alle_skalar(kolbenweg_mm, pleuelstange_mm, hub_mm):
+        wert, fehlercode = formeln.kurbelwinkel(float(kolbenweg_mm), float(pleuelstange_mm), float(hub_mm))
+        return Messwert(float(wert), "°", fehlercode)
+    kolbenweg = np.asarray(kolbenweg_mm, dtype=float)
+    pleuel = np.asarray(pleuelstange_mm, dtype=float)
+    hub = np.asarray(hub_mm, dtype=float)
+    fehlercode = np.where(np.isfinite(kolbenweg), _fehlercode_geometrie(pleuel, hub), FEHLER_NICHT_POSITIV)
+    fehlercode = np.where(
+        (fehlercode == GUELTIG) & ((kolbenweg < 0) | (kolbenweg > hub)), FEHLER_AUSSERHALB_HUB, fehlercode
+    )
+    gueltig = fehlercode == GUELTIG
+    winkel = hub_zu_kurbelwinkel(
+        np.where(gueltig, kolbenweg, 0.0), np.where(gueltig, pleuel, 1.0), np.where(gueltig, hub, 1.0)
+    )
+    return Messwert(np.where(gueltig, winkel, np.nan), "°", fehlercode)
@@ -0,0 +1,435 @@
+"""
+Dauerhafte Ablage von Motor-Konfigurationen in einer SQLite-Datei.
+
+Jeder Motor hat einen eindeutigen Namen, ein Modell und die gemessenen Eingaben (siehe FELDER,
+gleiche Spaltennamen wie die Zylinder-CSV von steuerzeiten). Gesucht wird über einen Index auf
+Modell, Hub und Pleuellänge.
+
+Abgeleitete Ergebnisse (Steuerzeiten, Resonanzdrehzahlen, Gradscheiben-Markierungen) liegen
+gruppenweise daneben, jeweils mit einem Hash der Eingaben, aus denen die Gruppe berechnet wird
+(siehe ABLEITUNGEN). Beim Speichern wird nur neu gerechnet, wessen Eingaben sich geändert haben,
+beim Laden gar nicht. Massenimporte rechnen jede Gruppe in einem vektorisierten Durchgang für
+alle geänderten Motoren und schreiben alles in einer Transaktion.
+
+Aufruf:
+    python motorspeicher.py import zylinder.csv
+    python motorspeicher.py liste --modell KX125
+    python motorspeicher.py export -o motoren.json
+"""
+import argparse
+import csv
+import hashlib
+import json
+import math
+import sqlite3
+import sys
+import threading
+
+import numpy as np
+
+from kinematik import hub_zu_kurbelwinkel
+from resonanz import auslass_resonanz_messwert, einlass_resonanz_messwert
+from steuerzeiten import KANAELE, berechne_steuerzeiten
+
+STANDARD_DATENBANK = "motoren.sqlite"
+
+# Gemessene Eingaben eines Motors (Spalten der Tabelle und der CSV)
+FELDER = (
+    "hub_mm", "pleuel_mm", "ot_abstand_mm", "auslass_mm", "ueberstroemer_mm", "boost_mm", "einlass_mm",
+    "zuendung_mm", "resonanzlaenge_m", "schall_ms",
+    "hubraum_ccm", "kurbel_faktor", "vergaser_d_mm", "ansaug_faktor", "ansaug_laenge_cm",
+)
+
+# Farben und Kürzel der Steuerzeiten auf der Gradscheibe
+_MARKIERUNGEN = {
+    "auslass": ("AÖ", "AS", "blue"),
+    "ueberstroemer": ("ÜÖ", "ÜS", "green"),
+    "boost": ("BÖ", "BS", "purple"),
+    "einlass": ("EÖ", "ES", "orange"),
+}
+
+
+def _geometrie(spalten):
+    # Pleuellänge unter dem Kurbelradius: NaN, damit alle abgeleiteten Werte des Motors leer bleiben
+    hub = spalten["hub_mm"]
+    pleuel = np.where(spalten["pleuel_mm"] >= hub / 2, spalten["pleuel_mm"], np.nan)
+    return hub, pleuel
+
+
+def _steuerzeiten_spalten(spalten, kanaele):
+    hub, pleuel = _geometrie(spalten)
+    hoehen = {kanal: spalten[f"{kanal}_mm"] for kanal in kanaele}
+    # Boost-Kanal 0 mm bzw. Einlass-Kolbenweg 0 mm bedeuten "nicht vorhanden", wie in den Oberflächen
+    if "boost" in hoehen:
+        hoehen["boost"] = np.where(hoehen["boost"] > 0, hoehen["boost"], np.nan)
+    einlass = spalten.get("einlass_mm")
+    if einlass is not None:
+        einlass = np.where(einlass > 0, einlass, np.nan)
+    return berechne_steuerzeiten(hoehen, hub, pleuel, einlass, np.nan_to_num(spalten["ot_abstand_mm"]))
+
+
+def _zeile(werte, i):
+    """Einzelwerte einer Zeile als dict; None, wenn ein Wert fehlt (NaN)."""
+    zeile = {name: float(wert[i]) for name, wert in werte.items()}
+    return None if any(math.isnan(wert) for wert in zeile.values()) else zeile
+
+
+def _steuerzeiten(spalten, anzahl):
+    zeiten = _steuerzeiten_spalten(spalten, KANAELE)
+    ergebnis = []
+    for i in range(anzahl):
+        zeilen = {kanal: _zeile(werte, i) for kanal, werte in zeiten.items()}
+        # Beim Vorauslass darf der Vergleichskanal fehlen
+        for kanal, werte in zeiten.items():
+            if zeilen[kanal] is None and "vorauslass_grad" in werte:
+                ohne = {name: wert for name, wert in werte.items() if name != "vorauslass_grad"}
+                zeilen[kanal] = _zeile(ohne, i)
+        ergebnis.append({kanal: werte for kanal, werte in zeilen.items() if werte is not None})
+    return ergebnis
+
+
+def _resonanz(messwert, eingaben, anzahl):
+    vollstaendig = ~np.isnan(np.broadcast_arrays(*eingaben)).any(axis=0)
+    werte = np.broadcast_to(messwert.wert, (anzahl,))
+    gueltig = np.broadcast_to(messwert.gueltig, (anzahl,))
+    texte = np.broadcast_to(np.asarray(messwert.formatiere(), dtype=object), (anzahl,))
+    return [
+        {"drehzahl_upm": float(werte[i]) if gueltig[i] else None, "text": texte[i]} if vollstaendig[i] else None
+        for i in range(anzahl)
+    ]
+
+
+def _auslass_resonanz(spalten, anzahl):
+    dauer = _steuerzeiten_spalten(spalten, ("auslass",))["auslass"]["dauer_grad"]
+    eingaben = [spalten["resonanzlaenge_m"], dauer, spalten["schall_ms"]]
+    return _resonanz(auslass_resonanz_messwert(*eingaben), eingaben, anzahl)
+
+
+def _einlass_resonanz(spalten, anzahl):
+    dauer = _steuerzeiten_spalten(spalten, ())["einlass"]["dauer_grad"]
+    eingaben = [dauer] + [spalten[feld] for feld in
+                          ("hubraum_ccm", "kurbel_faktor", "vergaser_d_mm", "ansaug_faktor", "ansaug_laenge_cm")]
+    return _resonanz(einlass_resonanz_messwert(*eingaben), eingaben, anzahl)
+
+
+def _gradscheibe(spalten, anzahl):
+    hub, pleuel = _geometrie(spalten)
+    zuendung = spalten["zuendung_mm"]
+    zuendwinkel = hub_zu_kurbelwinkel(np.where(zuendung > 0, zuendung, np.nan), pleuel, hub)
+    steuerzeiten = _steuerzeiten(spalten, anzahl)
+    ergebnis = []
+    for i in range(anzahl):
+        markierungen = []
+        if not math.isnan(zuendwinkel[i]):
+            markierungen.append({"winkel": float(zuendwinkel[i]), "text": "Zündung"})
+        for kanal, werte in steuerzeiten[i].items():
+            oeffnet, schliesst, farbe = _MARKIERUNGEN[kanal]
+            markierungen.append({"winkel": werte["oeffnet_grad"], "text": oeffnet, "farbe": farbe})
+            markierungen.append({"winkel": werte["schliesst_grad"], "text": schliesst, "farbe": farbe})
+        ergebnis.append({"markierungen": markierungen})
+    return ergebnis
+
+
+# Ergebnisgruppe -> (Eingabefelder, Funktion(spalten, anzahl) -> ein Ergebnis je Zeile)
+ABLEITUNGEN = {
+    "steuerzeiten": (("hub_mm", "pleuel_mm", "ot_abstand_mm", "auslass_mm", "ueberstroemer_mm", "boost_mm",
+                      "einlass_mm"), _steuerzeiten),
+    "auslass_resonanz": (("hub_mm", "pleuel_mm", "ot_abstand_mm", "auslass_mm", "resonanzlaenge_m", "schall_ms"),
+                         _auslass_resonanz),
+    "einlass_resonanz": (("hub_mm", "pleuel_mm", "ot_abstand_mm", "einlass_mm", "hubraum_ccm", "kurbel_faktor",
+                          "vergaser_d_mm", "ansaug_faktor", "ansaug_laenge_cm"), _einlass_resonanz),
+    "gradscheibe": (("hub_mm", "pleuel_mm", "ot_abstand_mm", "auslass_mm", "ueberstroemer_mm", "boost_mm",
+                     "einlass_mm", "zuendung_mm"), _gradscheibe),
+}
+
+
+def eingabe_hash(gruppe, eingaben):
+    """Hash der Eingaben, aus denen eine Ergebnisgruppe berechnet wird."""
+    felder, _ = ABLEITUNGEN[gruppe]
+    return hashlib.sha1(json.dumps([gruppe] + [eingaben.get(feld) for feld in felder]).encode()).hexdigest()
+
+
+def _zahl(wert):
+    """Zahl oder None; leere CSV-Zellen und NaN werden zu None, Dezimalkomma ist erlaubt."""
+    if wert is None or (isinstance(wert, str) and wert.strip() == ""):
+        return None
+    zahl = float(wert.replace(",", ".")) if isinstance(wert, str) else float(wert)
+    return None if math.isnan(zahl) else zahl
+
+
+def _normalisiere(motor):
+    """Bringt ein dict (flach wie eine CSV-Zeile oder mit "eingaben") in die Form (name, modell, eingaben)."""
+    quelle = motor.get("eingaben", motor)
+    name = str(motor.get("name") or "").strip()
+    if not name:
+        raise ValueError("Jeder Motor braucht einen Namen.")
+    return name, str(motor.get("modell") or ""), {feld: _zahl(quelle.get(feld)) for feld in FELDER}
+
+
+class Motorspeicher:
+    """
+    SQLite-Ablage für Motoren und ihre abgeleiteten Ergebnisse.
+
+    Eine Instanz darf von mehreren Threads benutzt werden (z.B. von den Sitzungen einer Oberfläche).
+
+    Args:
+        pfad (str): Pfad der Datenbankdatei, ":memory:" für eine flüchtige Ablage.
+    """
+
+    def __init__(self, pfad=STANDARD_DATENBANK):
+        self.verbindung = sqlite3.connect(pfad, check_same_thread=False)
+        # Reentrant, damit speichere Laden und Schreiben unter einer Sperre zusammenfassen kann
+        self.sperre = threading.RLock()
+        spalten = ", ".join(f"{feld} REAL" for feld in FELDER)
+        with self.verbindung:
+            self.verbindung.executescript(f"""
+                CREATE TABLE IF NOT EXISTS motoren (name TEXT PRIMARY KEY, modell TEXT NOT NULL DEFAULT '', {spalten});
+                CREATE INDEX IF NOT EXISTS motoren_modell_hub_pleuel ON motoren (modell, hub_mm, pleuel_mm);
+                CREATE INDEX IF NOT EXISTS motoren_hub_pleuel ON motoren (hub_mm, pleuel_mm);
+                CREATE TABLE IF NOT EXISTS ergebnisse (
+                    name TEXT NOT NULL, gruppe TEXT NOT NULL, eingabe_hash TEXT NOT NULL, werte TEXT,
+                    PRIMARY KEY (name, gruppe)
+                );
+            """)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *fehler):
+        self.schliesse()
+
+    def schliesse(self):
+        self.verbindung.close()
+
+    def speichere(self, name, eingaben, modell=None):
+        """
+        Speichert einen Motor und rechnet nur die Ergebnisgruppen neu, deren Eingaben sich geändert haben.
+
+        Nur die übergebenen Felder werden geändert: eine Oberfläche, die nicht alle FELDER kennt,
+        löscht beim Speichern also keine Werte, die eine andere eingetragen hat.
+
+        Args:
+            name (str): Eindeutiger Name; ein vorhandener Motor gleichen Namens wird aktualisiert.
+            eingaben (dict): Feldname -> Zahl oder None (löscht den Wert), siehe FELDER. Fehlende
+                Felder behalten ihren gespeicherten Wert, bei einem neuen Motor werden sie None.
+            modell (str): Motormodell, z.B. "KX125". None oder "" behält das gespeicherte Modell.
+
+        Returns:
+            dict: Der gespeicherte Motor wie bei lade.
+        """
+        with self.sperre:
+            vorhanden = self.lade(name)
+            if vorhanden is not None:
+                eingaben = {**vorhanden["eingaben"], **eingaben}
+                modell = modell or vorhanden["modell"]
+            self.speichere_viele([{"name": name, "modell": modell, "eingaben": eingaben}])
+            return self.lade(name)
+
+    def speichere_viele(self, motoren):
+        """
+        Speichert viele Motoren in einer Transaktion.
+
+        Jede Ergebnisgruppe wird in einem vektorisierten Durchgang für alle Motoren gerechnet,
+        deren Eingaben für diese Gruppe neu oder geändert sind.
+
+        Args:
+            motoren (iterable): dicts mit "name", "modell" und den Feldern, entweder flach (wie eine
+                CSV-Zeile) oder unter "eingaben". Bei doppelten Namen gilt der letzte Eintrag.
+
+        Returns:
+            dict: "motoren" (Anzahl gespeichert) und "neu_berechnet" (Ergebnisgruppe -> Anzahl Motoren).
+        """
+        eintraege = {}
+        for motor in motoren:
+            name, modell, eingaben = _normalisiere(motor)
+            eintraege[name] = (modell, eingaben)
+        namen = list(eintraege)
+
+        with self.sperre:
+            vorhanden = self._hashes(namen)
+            neue_ergebnisse = []
+            neu_berechnet = {}
+            for gruppe, (felder, funktion) in ABLEITUNGEN.items():
+                hashes = [eingabe_hash(gruppe, eintraege[name][1]) for name in namen]
+                geaendert = [i for i, (name, h) in enumerate(zip(namen, hashes)) if vorhanden.get((name, gruppe)) != h]
+                neu_berechnet[gruppe] = len(geaendert)
+                if not geaendert:
+                    continue
+                spalten = {
+                    feld: np.array([eintraege[namen[i]][1][feld] for i in geaendert], dtype=float)
+                    for feld in felder
+                }
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    werte = funktion(spalten, len(geaendert))
+                neue_ergebnisse += [
+                    (namen[i], gruppe, hashes[i], json.dumps(wert, ensure_ascii=False)) for i, wert in zip(geaendert, werte)
+                ]
+
+            platzhalter = ", ".join("?" for _ in FELDER)
+            aktualisierung = ", ".join(f"{feld} = excluded.{feld}" for feld in ("modell",) + FELDER)
+            with self.verbindung:
+                self.verbindung.executemany(
+                    f"INSERT INTO motoren (name, modell, {', '.join(FELDER)}) VALUES (?, ?, {platzhalter}) "
+                    f"ON CONFLICT(name) DO UPDATE SET {aktualisierung}",
+                    ((name, modell, *(eingaben[feld] for feld in FELDER)) for name, (modell, eingaben) in eintraege.items()),
+                )
+                self.verbindung.executemany("INSERT OR REPLACE INTO ergebnisse VALUES (?, ?, ?, ?)", neue_ergebnisse)
+        return {"motoren": len(namen), "neu_berechnet": neu_berechnet}
+
+    def _hashes(self, namen, paketgroesse=500):
+        """(Name, Gruppe) -> gespeicherter Eingabe-Hash; paketweise wegen der Parametergrenze von SQLite."""
+        hashes = {}
+        for start in range(0, len(namen), paketgroesse):
+            paket = namen[start:start + paketgroesse]
+            zeilen = self.verbindung.execute(
+                f"SELECT name, gruppe, eingabe_hash FROM ergebnisse WHERE name IN ({', '.join('?' for _ in paket)})", paket
+            )
+            hashes.update(((name, gruppe), h) for name, gruppe, h in zeilen)
+        return hashes
+
+    def lade(self, name):
+        """
+        Lädt einen Motor mit seinen gespeicherten Ergebnissen, ohne etwas zu berechnen.
+
+        Returns:
+            dict: "name", "modell", "eingaben" (Feld -> Zahl oder None) und "ergebnisse"
+                (Gruppe -> Ergebnis, siehe ABLEITUNGEN), oder None, wenn es den Motor nicht gibt.
+        """
+        with self.sperre:
+            zeile = self.verbindung.execute(
+                f"SELECT name, modell, {', '.join(FELDER)} FROM motoren WHERE name = ?", (name,)
+            ).fetchone()
+            if zeile is None:
+                return None
+            ergebnisse = self.verbindung.execute("SELECT gruppe, werte FROM ergebnisse WHERE name = ?", (name,)).fetchall()
+        return {
+            "name": zeile[0],
+            "modell": zeile[1],
+            "eingaben": dict(zip(FELDER, zeile[2:])),
+            "ergebnisse": {gruppe: json.loads(werte) for gruppe, werte in ergebnisse},
+        }
+
+    def suche(self, modell=None, hub_mm=None, pleuel_mm=None, toleranz_mm=0.05):
+        """
+        Sucht Motoren nach Modell, Hub und Pleuellänge (jeweils optional).
+
+        Args:
+            toleranz_mm (float): Erlaubte Abweichung bei Hub und Pleuellänge.
+
+        Returns:
+            list: dicts mit "name", "modell", "hub_mm" und "pleuel_mm", nach Modell und Name sortiert.
+        """
+        bedingungen, parameter = [], []
+        if modell:
+            bedingungen.append("modell = ?")
+            parameter.append(modell)
+        for feld, wert in (("hub_mm", hub_mm), ("pleuel_mm", pleuel_mm)):
+            if wert is not None:
+                bedingungen.append(f"{feld} BETWEEN ? AND ?")
+                parameter += [wert - toleranz_mm, wert + toleranz_mm]
+        wo = f"WHERE {' AND '.join(bedingungen)}" if bedingungen else ""
+        with self.sperre:
+            zeilen = self.verbindung.execute(
+                f"SELECT name, modell, hub_mm, pleuel_mm FROM motoren {wo} ORDER BY modell, name", parameter
+            ).fetchall()
+        return [dict(zip(("name", "modell", "hub_mm", "pleuel_mm"), zeile)) for zeile in zeilen]
+
+    def modelle(self):
+        """Alle vorhandenen Modelle, sortiert."""
+        with self.sperre:
+            return [modell for modell, in self.verbindung.execute("SELECT DISTINCT modell FROM motoren ORDER BY modell")]
+
+    def loesche(self, name):
+        """Löscht einen Motor samt Ergebnissen; liefert True, wenn es ihn gab."""
+        with self.sperre, self.verbindung:
+            self.verbindung.execute("DELETE FROM ergebnisse WHERE name = ?", (name,))
+            return self.verbindung.execute("DELETE FROM motoren WHERE name = ?", (name,)).rowcount > 0
+
+    def importiere(self, datei, dateiformat="csv"):
+        """
+        Importiert Motoren aus einer CSV-Datei (Spalten name, modell und FELDER) oder einer JSON-Liste.
+
+        Args:
+            datei: Textdatei-Objekt.
+            dateiformat (str): "csv" oder "json".
+
+        Returns:
+            dict: Wie speichere_viele.
+        """
+        motoren = csv.DictReader(datei) if dateiformat == "csv" else json.load(datei)
+        return self.speichere_viele(motoren)
+
+    def exportiere(self, datei, dateiformat="csv"):
+        """
+        Schreibt alle Motoren zeilenweise in eine Datei, ohne die ganze Ablage in den Speicher zu laden.
+
+        CSV enthält die Eingaben (wieder importierbar), JSON zusätzlich die gespeicherten Ergebnisse.
+
+        Returns:
+            int: Anzahl der exportierten Motoren.
+        """
+        anzahl = 0
+        with self.sperre:
+            zeilen = self.verbindung.execute(f"SELECT name, modell, {', '.join(FELDER)} FROM motoren ORDER BY name")
+            if dateiformat == "csv":
+                schreiber = csv.writer(datei)
+                schreiber.writerow(("name", "modell") + FELDER)
+                for zeile in zeilen:
+                    schreiber.writerow("" if wert is None else wert for wert in zeile)
+                    anzahl += 1
+                return anzahl
+
+            lesen = self.verbindung.cursor()
+            datei.write("[")
+            for zeile in zeilen:
+                ergebnisse = lesen.execute("SELECT gruppe, werte FROM ergebnisse WHERE name = ?", (zeile[0],))
+                motor = {"name": zeile[0], "modell": zeile[1], "eingaben": dict(zip(FELDER, zeile[2:])),
+                         "ergebnisse": {gruppe: json.loads(werte) for gruppe, werte in ergebnisse}}
+                datei.write(("\n" if anzahl == 0 else ",\n") + json.dumps(motor, ensure_ascii=False))
+                anzahl += 1
+            datei.write("\n]\n")
+        return anzahl
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Motor-Konfigurationen in einer SQLite-Datei verwalten.")
+    parser.add_argument("--datenbank", default=STANDARD_DATENBANK, help="SQLite-Datei")
+    befehle = parser.add_subparsers(dest="befehl", required=True)
+    importieren = befehle.add_parser("import", help="Motoren aus CSV oder JSON importieren")
+    importieren.add_argument("eingabe", help="Eingabedatei (- für stdin)")
+    exportieren = befehle.add_parser("export", help="Alle Motoren als CSV oder JSON exportieren")
+    exportieren.add_argument("-o", "--ausgabe", default="-", help="Ausgabedatei (Standard: stdout)")
+    for unterbefehl in (importieren, exportieren):
+        unterbefehl.add_argument("--format", dest="dateiformat", choices=("csv", "json"), default=None,
+                                 help="Standard: aus der Dateiendung, sonst csv")
+    liste = befehle.add_parser("liste", help="Motoren suchen")
+    liste.add_argument("--modell")
+    liste.add_argument("--hub", type=float)
+    liste.add_argument("--pleuel", type=float)
+    zeige = befehle.add_parser("zeige", help="Einen Motor mit seinen Ergebnissen als JSON ausgeben")
+    zeige.add_argument("name")
+    args = parser.parse_args()
+
+    with Motorspeicher(args.datenbank) as speicher:
+        if args.befehl in ("import", "export"):
+            pfad = args.eingabe if args.befehl == "import" else args.ausgabe
+            dateiformat = args.dateiformat or ("json" if pfad.endswith(".json") else "csv")
+            if args.befehl == "import":
+                datei = sys.stdin if pfad == "-" else open(pfad, newline="", encoding="utf-8")
+                with datei:
+                    statistik = speicher.importiere(datei, dateiformat)
+                print(f"{statistik['motoren']} Motoren gespeichert, neu berechnet: "
+                      + ", ".join(f"{gruppe} {anzahl}" for gruppe, anzahl in statistik["neu_berechnet"].items()))
+            else:
+                datei = sys.stdout if pfad == "-" else open(pfad, "w", newline="", encoding="utf-8")
+                with datei:
+                    speicher.exportiere(datei, dateiformat)
+        elif args.befehl == "liste":
+            for motor in speicher.suche(args.modell, args.hub, args.pleuel):
+                print(f"{motor['name']}\t{motor['modell']}\t{motor['hub_mm']}\t{motor['pleuel_mm']}")
+        else:
+            motor = speicher.lade(args.name)
+            if motor is None:
+                sys.exit(f"Motor nicht gefunden: {args.name}")
+            json.dump(motor, sys.stdout, ensure_ascii=False, indent=1)
+            sys.stdout.write("\n")
@@ -0,0 +1,174 @@
+"""
+Parameterstudien über die Resonanzformeln auf dem vollständigen kartesischen Raster.
+
+Das Raster wird nie vollständig im Speicher gehalten: die laufende Nummer jedes Rasterpunkts
+wird paketweise mit np.unravel_index in die Parameterwerte zurückgerechnet, jedes Paket
+vektorisiert ausgewertet, gefiltert und sofort als CSV oder Parquet weggeschrieben.
+Große Raster werden paketweise auf einen Prozesspool verteilt.
+
+Aufruf:
+    python parameterstudie.py auslass -r laenge_m=0.5:1.5:0.001 -r oeffnungswinkel_grad=150:200:0.5 \\
+        -r schallgeschwindigkeit_ms=450:550:1 --min 9000 --max 10500 -o treffer.csv
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from resonanz import auslass_resonanzdrehzahl, einlass_resonanzdrehzahl
+
+# Formelname -> (Funktion, Parameter in Aufrufreihenfolge)
+FORMELN = {
+    "auslass": (auslass_resonanzdrehzahl, ("laenge_m", "oeffnungswinkel_grad", "schallgeschwindigkeit_ms")),
+    "einlass": (einlass_resonanzdrehzahl, ("oeffnungswinkel_grad", "hubraum_ccm", "kurbel_faktor",
+                                           "vergaser_d_mm", "ansaug_faktor", "ansaug_laenge")),
+}
+
+
+def _raster_werte(formel, raster):
+    if formel not in FORMELN:
+        raise ValueError(f"Unbekannte Formel: {formel}")
+    _, parameter = FORMELN[formel]
+    fehlend = [name for name in parameter if name not in raster]
+    if fehlend:
+        raise ValueError(f"Für '{formel}' fehlen Werte für: {', '.join(fehlend)}")
+    return parameter, [np.atleast_1d(np.asarray(raster[name], dtype=float)) for name in parameter]
+
+
+def _pruefe_paketgroesse(paketgroesse):
+    if paketgroesse <= 0:
+        raise ValueError(f"paketgroesse muss größer als 0 sein, nicht {paketgroesse}.")
+
+
+def _berechne_paket(formel, werte, start, stop, drehzahl_min, drehzahl_max):
+    # Läuft im Arbeitsprozess: Rasterpunkte start..stop auswerten und filtern
+    funktion, parameter = FORMELN[formel]
+    indizes = np.unravel_index(np.arange(start, stop), tuple(len(w) for w in werte))
+    spalten = [w[i] for w, i in zip(werte, indizes)]
+    drehzahl = funktion(*spalten)
+
+    behalten = ~np.isnan(drehzahl)
+    if drehzahl_min is not None:
+        behalten &= drehzahl >= drehzahl_min
+    if drehzahl_max is not None:
+        behalten &= drehzahl <= drehzahl_max
+    paket = {name: spalte[behalten] for name, spalte in zip(parameter, spalten)}
+    paket["drehzahl_upm"] = drehzahl[behalten]
+    return paket
+
+
+def parameterstudie_pakete(formel, raster, drehzahl_min=None, drehzahl_max=None, paketgroesse=1_000_000, prozesse=None):
+    """
+    Wertet eine Resonanzformel auf dem kartesischen Produkt aller Parameterwerte aus.
+
+    Die Pakete werden in Rasterreihenfolge geliefert. Es sind höchstens zwei Pakete pro
+    Arbeitsprozess gleichzeitig unterwegs, der Speicherbedarf hängt also nur von der
+    Paketgröße ab und nicht von der Rastergröße.
+
+    Args:
+        formel (str): "auslass" oder "einlass".
+        raster (dict): Parametername -> Werte (Liste oder 1D-Array), siehe FORMELN.
+        drehzahl_min (float): Nur Rasterpunkte mit mindestens dieser Resonanzdrehzahl behalten.
+        drehzahl_max (float): Nur Rasterpunkte mit höchstens dieser Resonanzdrehzahl behalten.
+        paketgroesse (int): Rasterpunkte pro Paket.
+        prozesse (int): Anzahl der Arbeitsprozesse, None für alle Kerne, 1 für keinen Pool.
+
+    Yields:
+        dict: Parametername -> Array der behaltenen Werte, dazu "drehzahl_upm".
+    """
+    _pruefe_paketgroesse(paketgroesse)
+    _, werte = _raster_werte(formel, raster)
+    anzahl = int(np.prod([len(w) for w in werte]))
+    grenzen = [(start, min(start + paketgroesse, anzahl)) for start in range(0, anzahl, paketgroesse)]
+    prozesse = prozesse or os.cpu_count() or 1
+
+    if prozesse == 1 or len(grenzen) == 1:
+        for start, stop in grenzen:
+            yield _berechne_paket(formel, werte, start, stop, drehzahl_min, drehzahl_max)
+        return
+
+    with ProcessPoolExecutor(max_workers=prozesse) as pool:
+        unterwegs = []
+        for start, stop in grenzen:
+            unterwegs.append(pool.submit(_berechne_paket, formel, werte, start, stop, drehzahl_min, drehzahl_max))
+            if len(unterwegs) >= 2 * prozesse:
+                yield unterwegs.pop(0).result()
+        for auftrag in unterwegs:
+            yield auftrag.result()
+
+
+def parameterstudie(formel, raster, ziel, drehzahl_min=None, drehzahl_max=None, paketgroesse=1_000_000, prozesse=None):
+    """
+    Führt eine Parameterstudie durch und schreibt die Treffer fortlaufend in eine Datei.
+
+    Das Dateiformat ergibt sich aus der Endung: .parquet (benötigt pyarrow) oder CSV.
+
+    Args:
+        ziel (str): Pfad der Ausgabedatei oder ein geöffnetes Textdatei-Objekt (CSV).
+        Übrige Args: wie parameterstudie_pakete.
+
+    Returns:
+        dict: "punkte" (Größe des Rasters) und "treffer" (Anzahl geschriebener Zeilen).
+    """
+    # Vor dem Öffnen der Ausgabe prüfen; parameterstudie_pakete prüft erst beim ersten Paket
+    _pruefe_paketgroesse(paketgroesse)
+    parameter, werte = _raster_werte(formel, raster)
+    spalten = list(parameter) + ["drehzahl_upm"]
+    pakete = parameterstudie_pakete(formel, raster, drehzahl_min, drehzahl_max, paketgroesse, prozesse)
+    treffer = 0
+
+    if isinstance(ziel, str) and ziel.endswith(".parquet"):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as fehler:
+            raise ImportError("Für Parquet-Ausgabe wird pyarrow benötigt (pip install pyarrow).") from fehler
+        schema = pa.schema([(name, pa.float64()) for name in spalten])
+        with pq.ParquetWriter(ziel, schema) as schreiber:
+            for paket in pakete:
+                schreiber.write_table(pa.table({name: paket[name] for name in spalten}, schema=schema))
+                treffer += len(paket["drehzahl_upm"])
+    else:
+        datei = open(ziel, "w", encoding="utf-8") if isinstance(ziel, str) else ziel
+        try:
+            datei.write(",".join(spalten) + "\n")
+            for paket in pakete:
+                if len(paket["drehzahl_upm"]):
+                    np.savetxt(datei, np.column_stack([paket[name] for name in spalten]), delimiter=",", fmt="%.6g")
+                treffer += len(paket["drehzahl_upm"])
+        finally:
+            if isinstance(ziel, str):
+                datei.close()
+
+    return {"punkte": int(np.prod([len(w) for w in werte])), "treffer": treffer}
+
+
+def _lies_bereich(text):
+    """Liest "name=start:stop:schritt" (Stop inklusive) oder "name=a,b,c"."""
+    name, _, werte = text.partition("=")
+    if ":" in werte:
+        start, stop, schritt = (float(teil) for teil in werte.split(":"))
+        return name, np.arange(start, stop + schritt / 2, schritt)
+    return name, np.array([float(teil) for teil in werte.split(",")])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parameterstudie über die Resonanzformeln.")
+    parser.add_argument("formel", choices=sorted(FORMELN))
+    parser.add_argument("-r", "--raster", action="append", default=[], type=_lies_bereich,
+                        help="Parameterwerte als name=start:stop:schritt oder name=a,b,c")
+    parser.add_argument("--min", dest="drehzahl_min", type=float, default=None, help="Mindest-Resonanzdrehzahl")
+    parser.add_argument("--max", dest="drehzahl_max", type=float, default=None, help="Höchst-Resonanzdrehzahl")
+    parser.add_argument("-o", "--ausgabe", default="-", help="CSV- oder .parquet-Datei (Standard: stdout)")
+    parser.add_argument("-j", "--prozesse", type=int, default=None, help="Anzahl Arbeitsprozesse")
+    parser.add_argument("--paketgroesse", type=int, default=1_000_000)
+    args = parser.parse_args()
+    if args.paketgroesse <= 0:
+        parser.error("--paketgroesse muss größer als 0 sein")
+
+    ziel = sys.stdout if args.ausgabe == "-" else args.ausgabe
+    zusammenfassung = parameterstudie(args.formel, dict(args.raster), ziel, args.drehzahl_min, args.drehzahl_max,
+                                      args.paketgroesse, args.prozesse)
+    print(f"{zusammenfassung['treffer']} von {zusammenfassung['punkte']} Rasterpunkten geschrieben", file=sys.stderr)
@@ -0,0 +1,550 @@
+"""
+Auswertung von Prüfstandsprotokollen gegen die vorhergesagten Resonanzdrehzahlen.
+
+Auf dem Prüfstand werden Drehzahl, Abgastemperatur (EGT) und Drehmoment mit 1 kHz protokolliert,
+eine Sitzung ergibt mehrere GB. Das Protokoll wird nie ganz geladen: CSV-Dateien werden
+blockweise geparst, Binärdateien (.npy oder rohe Datensätze) blockweise per np.memmap
+eingeblendet. Jeder Block wird sofort in Drehzahlklassen aufsummiert (Anzahl, Summen von
+Drehmoment, Drehmoment² und EGT); der Speicherbedarf hängt nur von Blockgröße und Klassenzahl
+ab, nicht von der Länge des Protokolls.
+
+Auf der geglätteten Drehmomentkurve werden die Maxima gesucht und den Vorhersagen aus resonanz
+für die protokollierte Motor-Konfiguration (Felder wie motorspeicher.FELDER) zugeordnet. Aus den
+zugeordneten Maxima werden die Modellgrößen zurückgerechnet:
+    Auslass: n = c φ / (12 l)                 -> effektive Schallgeschwindigkeit c
+    Einlass: n = 1750 (φ - k) / √(V_k l / F)  -> Winkelkorrektur k (im Modell fest 25°)
+Mit mehreren Zuordnungen (mehrere Konfigurationen) sind c und k die Lösung der kleinsten Quadrate.
+
+Aufruf:
+    python pruefstand.py sitzung.csv --motor KX125-2024
+    python pruefstand.py lauf.bin --spalten drehzahl,egt,drehmoment --dtype float32 \\
+        --konfiguration motor.json --bild vergleich.png
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import warnings
+
+import numpy as np
+
+from gasdynamik import schallgeschwindigkeit
+from resonanz import auslass_resonanz_messwert, einlass_resonanz_messwert
+from steuerzeiten import berechne_steuerzeiten
+
+# Spaltennamen in CSV-Protokollen (erster Treffer gilt); die EGT ist optional
+SPALTEN = {
+    "drehzahl": ("drehzahl", "drehzahl_upm", "rpm"),
+    "drehmoment": ("drehmoment", "drehmoment_nm", "torque", "torque_nm"),
+    "egt": ("egt", "egt_c", "abgastemperatur_c"),
+}
+# Feldreihenfolge roher Binärdatensätze, wenn nichts anderes angegeben ist
+BINAER_SPALTEN = ("drehzahl", "egt", "drehmoment")
+BLOCKGROESSE = 1_000_000
+
+# Im Modell fest eingebaute Einlass-Winkelkorrektur in Grad
+EINLASS_KORREKTUR_GRAD = 25.0
+# Felder, ohne die vorhersagen den Eintrag nicht bilden kann; ot_abstand_mm ist optional
+VORHERSAGE_FELDER = {
+    "auslass": ("hub_mm", "pleuel_mm", "auslass_mm", "resonanzlaenge_m", "schall_ms"),
+    "einlass": ("hub_mm", "pleuel_mm", "einlass_mm", "hubraum_ccm", "kurbel_faktor", "vergaser_d_mm", "ansaug_faktor",
+                "ansaug_laenge_cm"),
+}
+
+
+# ==============================================================================
+# Protokolle blockweise lesen
+# ==============================================================================
+def _csv_bloecke(pfad, blockgroesse, trennzeichen):
+    with open(pfad, encoding="utf-8") as datei:
+        kopf = [name.strip().lower() for name in datei.readline().split(trennzeichen)]
+        spalten = {}
+        for name, namen in SPALTEN.items():
+            treffer = next((kopf.index(n) for n in namen if n in kopf), None)
+            if treffer is not None:
+                spalten[name] = treffer
+        fehlend = [name for name in ("drehzahl", "drehmoment") if name not in spalten]
+        if fehlend:
+            raise ValueError(f"{pfad}: Spalten fehlen: {', '.join(fehlend)}")
+        namen = list(spalten)
+        while True:
+            zeilen = list(itertools.islice(datei, blockgroesse))
+            if not zeilen:
+                return
+            werte = _parse_csv_block(zeilen, trennzeichen, [spalten[name] for name in namen])
+            yield {name: werte[:, i] for i, name in enumerate(namen)}
+
+
+def _parse_csv_block(zeilen, trennzeichen, spalten):
+    """
+    Parst einen Block CSV-Zeilen; leere oder ungültige Zellen werden NaN.
+
+    Ausgefallene Sensorwerte sind in Prüfstandsprotokollen normal. Der schnelle Weg ist loadtxt;
+    nur Blöcke mit Lücken gehen über genfromtxt. Zeilen mit falscher Spaltenzahl werden dort
+    übergangen und als NaN-Zeilen angehängt, damit Drehzahlklassen sie als verworfen zählt.
+    """
+    try:
+        return np.loadtxt(zeilen, delimiter=trennzeichen, usecols=spalten, ndmin=2)
+    except ValueError:
+        pass
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        werte = np.genfromtxt(zeilen, delimiter=trennzeichen, usecols=spalten, filling_values=np.nan,
+                              invalid_raise=False, ndmin=2)
+    fehlend = sum(1 for zeile in zeilen if zeile.strip() and not zeile.lstrip().startswith("#")) - len(werte)
+    if fehlend > 0:
+        werte = np.vstack([werte.reshape(-1, len(spalten)), np.full((fehlend, len(spalten)), np.nan)])
+    return werte
+
+
+def _binaer_bloecke(pfad, spalten, dtype, blockgroesse):
+    if pfad.endswith(".npy"):
+        # Nur um Form, Typ und Datenbeginn aus dem Header zu lesen; eingeblendet wird unten blockweise
+        kopf = np.load(pfad, mmap_mode="r")
+        form, fortran, gespeichert, versatz = kopf.shape, np.isfortran(kopf), kopf.dtype, kopf.offset
+        del kopf
+        if gespeichert.names:
+            satz = gespeichert
+        elif len(form) == 2 and not fortran and form[1] == len(spalten):
+            satz = np.dtype([(name, gespeichert) for name in spalten])
+        else:
+            raise ValueError(f"{pfad}: erwartet ein strukturiertes Array oder (N, {len(spalten)}) in C-Reihenfolge.")
+        anzahl = form[0]
+    else:
+        satz = np.dtype([(name, dtype) for name in spalten])
+        versatz = 0
+        anzahl = os.path.getsize(pfad) // satz.itemsize
+
+    for start in range(0, anzahl, blockgroesse):
+        # Pro Block eine eigene Einblendung, damit die gelesenen Seiten danach wieder freigegeben werden
+        block = np.memmap(pfad, dtype=satz, mode="r", offset=versatz + start * satz.itemsize,
+                          shape=(min(blockgroesse, anzahl - start),))
+        yield {name: np.array(block[name], dtype=float) for name in satz.names if name in SPALTEN}
+        del block
+
+
+def lies_bloecke(pfad, spalten=BINAER_SPALTEN, dtype="float32", blockgroesse=BLOCKGROESSE, trennzeichen=","):
+    """
+    Liest ein Protokoll blockweise.
+
+    Args:
+        pfad (str): .csv/.txt mit Kopfzeile (Spaltennamen siehe SPALTEN), .npy (strukturiert mit
+            Feldnamen oder (N, Spalten)) oder eine rohe Binärdatei aus gleich langen Datensätzen.
+        spalten (tuple): Feldnamen der Binärdatensätze in Dateireihenfolge; Felder, die nicht in
+            SPALTEN stehen (z.B. "zeit"), werden übergangen.
+        dtype (str): Zahlentyp jedes Feldes roher Binärdateien.
+        blockgroesse (int): Datensätze pro Block.
+        trennzeichen (str): Spaltentrenner von CSV-Dateien.
+
+    Returns:
+        generator: Je Block ein dict "drehzahl", "drehmoment" und gegebenenfalls "egt" -> float-Array.
+    """
+    if pfad.lower().endswith((".csv", ".txt")):
+        return _csv_bloecke(pfad, blockgroesse, trennzeichen)
+    return _binaer_bloecke(pfad, tuple(spalten), dtype, blockgroesse)
+
+
+# ==============================================================================
+# Drehzahlklassen
+# ==============================================================================
+class Drehzahlklassen:
+    """
+    Additive Kennzahlen je Drehzahlklasse; Blöcke und ganze Protokolle lassen sich zusammenfassen.
+
+    Args:
+        klassenbreite_upm (float): Breite einer Klasse in U/min.
+        max_drehzahl_upm (float): Proben darüber (und unter 0) werden verworfen.
+    """
+
+    def __init__(self, klassenbreite_upm=50.0, max_drehzahl_upm=25000.0):
+        self.klassenbreite = float(klassenbreite_upm)
+        klassen = int(math.ceil(max_drehzahl_upm / self.klassenbreite))
+        self.anzahl = np.zeros(klassen, dtype=np.int64)
+        self.drehmoment = np.zeros(klassen)
+        self.drehmoment_quadrat = np.zeros(klassen)
+        self.egt = np.zeros(klassen)
+        self.egt_anzahl = np.zeros(klassen, dtype=np.int64)
+        self.proben = 0
+        self.verworfen = 0
+
+    def hinzufuegen(self, drehzahl_upm, drehmoment_nm, egt_c=None):
+        """Summiert einen Block auf; Proben mit NaN oder außerhalb des Bereichs werden verworfen."""
+        drehzahl = np.asarray(drehzahl_upm, dtype=float)
+        drehmoment = np.asarray(drehmoment_nm, dtype=float)
+        with np.errstate(invalid="ignore"):
+            klasse = np.floor(drehzahl / self.klassenbreite)
+        gueltig = (klasse >= 0) & (klasse < len(self.anzahl)) & np.isfinite(drehmoment)
+        self.proben += drehzahl.size
+        self.verworfen += int(drehzahl.size - np.count_nonzero(gueltig))
+        klasse = klasse[gueltig].astype(np.intp)
+        drehmoment = drehmoment[gueltig]
+        laenge = len(self.anzahl)
+        self.anzahl += np.bincount(klasse, minlength=laenge)
+        self.drehmoment += np.bincount(klasse, drehmoment, minlength=laenge)
+        self.drehmoment_quadrat += np.bincount(klasse, drehmoment * drehmoment, minlength=laenge)
+        if egt_c is not None:
+            egt = np.asarray(egt_c, dtype=float)[gueltig]
+            mit_egt = np.isfinite(egt)
+            self.egt += np.bincount(klasse[mit_egt], egt[mit_egt], minlength=laenge)
+            self.egt_anzahl += np.bincount(klasse[mit_egt], minlength=laenge)
+
+    def vereinige(self, andere):
+        """Addiert die Kennzahlen einer anderen Instanz mit gleichen Klassen."""
+        if andere.klassenbreite != self.klassenbreite or len(andere.anzahl) != len(self.anzahl):
+            raise ValueError("Die Drehzahlklassen passen nicht zusammen.")
+        for name in ("anzahl", "drehmoment", "drehmoment_quadrat", "egt", "egt_anzahl"):
+            getattr(self, name)[:] += getattr(andere, name)
+        self.proben += andere.proben
+        self.verworfen += andere.verworfen
+
+    def kurve(self, glaettung=1, min_anzahl=10):
+        """
+        Drehmomentkurve über die Klassenmitten.
+
+        Args:
+            glaettung (int): Breite des gleitenden Mittels in Klassen, gewichtet mit der Probenzahl.
+            min_anzahl (int): Klassen mit weniger Proben (nach der Glättung) werden NaN.
+
+        Returns:
+            dict: "drehzahl_upm", "anzahl", "drehmoment_nm", "streuung_nm" und "egt_c" als Arrays.
+        """
+        fenster = np.ones(max(int(glaettung), 1))
+
+        def geglaettet(werte):
+            return np.convolve(werte, fenster, mode="same")
+
+        anzahl = geglaettet(self.anzahl)
+        egt_anzahl = geglaettet(self.egt_anzahl)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mittel = np.where(anzahl >= min_anzahl, geglaettet(self.drehmoment) / anzahl, np.nan)
+            quadrat = geglaettet(self.drehmoment_quadrat) / anzahl
+            streuung = np.sqrt(np.maximum(quadrat - mittel**2, 0.0))
+            egt = np.where(egt_anzahl >= min_anzahl, geglaettet(self.egt) / egt_anzahl, np.nan)
+        return {
+            "drehzahl_upm": (np.arange(len(self.anzahl)) + 0.5) * self.klassenbreite,
+            "anzahl": self.anzahl.copy(),
+            "drehmoment_nm": mittel,
+            "streuung_nm": streuung,
+            "egt_c": egt,
+        }
+
+
+def drehmomentspitzen(kurve, min_prominenz=0.02):
+    """
+    Lokale Maxima der Drehmomentkurve mit ihrer Prominenz.
+
+    Die Prominenz ist die Höhe über dem höheren der beiden tiefsten Punkte bis zur nächsten
+    höheren Stelle links bzw. rechts (oder bis zum Rand der Kurve). Die Drehzahl wird über eine
+    Parabel durch die drei Klassen um das Maximum verfeinert.
+
+    Args:
+        kurve (dict): Ergebnis von Drehzahlklassen.kurve.
+        min_prominenz (float): Mindestprominenz als Anteil des höchsten Drehmoments.
+
+    Returns:
+        list: dicts "drehzahl_upm", "drehmoment_nm", "prominenz_nm" und "egt_c", nach Drehzahl sortiert.
+    """
+    drehzahl = kurve["drehzahl_upm"]
+    moment = kurve["drehmoment_nm"]
+    gueltig = np.isfinite(moment)
+    if not gueltig.any():
+        return []
+    schwelle = min_prominenz * np.nanmax(moment)
+    spitzen = []
+    for i in np.flatnonzero(gueltig[1:-1] & gueltig[:-2] & gueltig[2:]) + 1:
+        if not (moment[i] > moment[i - 1] and moment[i] >= moment[i + 1]):
+            continue
+        seiten = []
+        for schritt in (-1, 1):
+            tiefster = moment[i]
+            j = i + schritt
+            while 0 <= j < len(moment) and gueltig[j] and moment[j] <= moment[i]:
+                tiefster = min(tiefster, moment[j])
+                j += schritt
+            seiten.append(tiefster)
+        prominenz = moment[i] - max(seiten)
+        if prominenz < schwelle:
+            continue
+        nenner = moment[i - 1] - 2 * moment[i] + moment[i + 1]
+        verschiebung = 0.5 * (moment[i - 1] - moment[i + 1]) / nenner if nenner != 0 else 0.0
+        spitzen.append({
+            "drehzahl_upm": float(drehzahl[i] + verschiebung * (drehzahl[1] - drehzahl[0])),
+            "drehmoment_nm": float(moment[i]),
+            "prominenz_nm": float(prominenz),
+            "egt_c": float(kurve["egt_c"][i]),
+        })
+    return spitzen
+
+
+# ==============================================================================
+# Vorhersagen und Anpassung
+# ==============================================================================
+def _feld(eingaben, name):
+    wert = eingaben.get(name)
+    return math.nan if wert is None else float(wert)
+
+
+def vorhersagen(eingaben):
+    """
+    Vorhergesagte Resonanzdrehzahlen einer Motor-Konfiguration.
+
+    Args:
+        eingaben (dict): Feld -> Zahl oder None, siehe motorspeicher.FELDER.
+
+    Returns:
+        dict: "auslass" und/oder "einlass" -> dict mit "drehzahl_upm", dem Öffnungswinkel und den
+            übrigen Eingaben der Formel. Fehlt eine Eingabe oder ist sie ungültig, fehlt der Eintrag.
+    """
+    hub, pleuel = _feld(eingaben, "hub_mm"), _feld(eingaben, "pleuel_mm")
+    hoehen = {"auslass": _feld(eingaben, "auslass_mm")}
+    einlass_mm = _feld(eingaben, "einlass_mm")
+    zeiten = berechne_steuerzeiten(hoehen, hub, pleuel, einlass_mm if einlass_mm > 0 else math.nan,
+                                   np.nan_to_num(_feld(eingaben, "ot_abstand_mm")))
+    ergebnis = {}
+
+    auslass = {"laenge_m": _feld(eingaben, "resonanzlaenge_m"), "oeffnungswinkel_grad": float(zeiten["auslass"]["dauer_grad"]),
+               "schallgeschwindigkeit_ms": _feld(eingaben, "schall_ms")}
+    messwert = auslass_resonanz_messwert(**auslass)
+    if not math.isnan(messwert.wert) and bool(messwert.gueltig):
+        ergebnis["auslass"] = {"drehzahl_upm": float(messwert.wert), **auslass}
+
+    einlass = {"oeffnungswinkel_grad": float(zeiten["einlass"]["dauer_grad"]), "hubraum_ccm": _feld(eingaben, "hubraum_ccm"),
+               "kurbel_faktor": _feld(eingaben, "kurbel_faktor"), "vergaser_d_mm": _feld(eingaben, "vergaser_d_mm"),
+               "ansaug_faktor": _feld(eingaben, "ansaug_faktor"), "ansaug_laenge": _feld(eingaben, "ansaug_laenge_cm")}
+    messwert = einlass_resonanz_messwert(**einlass)
+    if not math.isnan(messwert.wert) and bool(messwert.gueltig):
+        ergebnis["einlass"] = {"drehzahl_upm": float(messwert.wert), **einlass}
+    return ergebnis
+
+
+def _keine_vorhersage(eingaben):
+    """Fehlermeldung, wenn vorhersagen weder Auslass noch Einlass liefert: fehlende Felder je Vorhersage."""
+    gruende = []
+    for name, felder in VORHERSAGE_FELDER.items():
+        fehlend = [feld for feld in felder if math.isnan(_feld(eingaben, feld))]
+        gruende.append(f"{name}: " + (f"es fehlen {', '.join(fehlend)}" if fehlend else "Eingaben ungültig"))
+    return f"Keine Vorhersage möglich ({'; '.join(gruende)})."
+
+
+def ordne_zu(spitzen, vorhersage, max_abweichung=0.2):
+    """
+    Ordnet jeder Vorhersage das nächstgelegene Drehmomentmaximum zu.
+
+    Args:
+        spitzen (list): Ergebnis von drehmomentspitzen.
+        vorhersage (dict): Ergebnis von vorhersagen.
+        max_abweichung (float): Größte relative Abweichung zwischen Vorhersage und Messung.
+
+    Returns:
+        dict: "auslass"/"einlass" -> Maximum (wie in spitzen) plus "abweichung_upm" und
+            "abweichung_relativ" (Messung minus Vorhersage); ohne Treffer fehlt der Eintrag.
+    """
+    zuordnung = {}
+    for name, erwartet in vorhersage.items():
+        if not spitzen:
+            break
+        naechste = min(spitzen, key=lambda spitze: abs(spitze["drehzahl_upm"] - erwartet["drehzahl_upm"]))
+        abweichung = naechste["drehzahl_upm"] - erwartet["drehzahl_upm"]
+        if abs(abweichung) <= max_abweichung * erwartet["drehzahl_upm"]:
+            zuordnung[name] = {**naechste, "abweichung_upm": abweichung,
+                               "abweichung_relativ": abweichung / erwartet["drehzahl_upm"]}
+    return zuordnung
+
+
+def passe_schallgeschwindigkeit_an(drehzahl_upm, laenge_m, oeffnungswinkel_grad):
+    """
+    Effektive Schallgeschwindigkeit, mit der n = c φ / (12 l) die gemessenen Drehzahlen trifft.
+
+    Args:
+        drehzahl_upm, laenge_m, oeffnungswinkel_grad (float | array): Gemessene Resonanzdrehzahl
+            und Konfiguration, je Zuordnung ein Element.
+
+    Returns:
+        tuple: (c in m/s nach kleinsten Quadraten, mittlere quadratische Abweichung der Drehzahl in U/min).
+    """
+    drehzahl, laenge, winkel = np.broadcast_arrays(*(np.atleast_1d(np.asarray(w, dtype=float))
+                                                     for w in (drehzahl_upm, laenge_m, oeffnungswinkel_grad)))
+    steigung = winkel / (12 * laenge)
+    c = float(np.sum(steigung * drehzahl) / np.sum(steigung**2))
+    return c, float(np.sqrt(np.mean((c * steigung - drehzahl)**2)))
+
+
+def passe_winkelkorrektur_an(drehzahl_upm, oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm,
+                             ansaug_faktor, ansaug_laenge):
+    """
+    Winkelkorrektur k, mit der n = 1750 (φ - k) / √(V_k l / F) die gemessenen Drehzahlen trifft.
+
+    Args:
+        drehzahl_upm (float | array): Gemessene Resonanzdrehzahlen, je Zuordnung ein Element.
+        Übrige Args: wie resonanz.einlass_resonanz_messwert.
+
+    Returns:
+        tuple: (k in Grad nach kleinsten Quadraten, mittlere quadratische Abweichung der Drehzahl in U/min).
+    """
+    drehzahl = np.atleast_1d(np.asarray(drehzahl_upm, dtype=float))
+    kurbelhausvolumen_cm3 = np.asarray(hubraum_ccm, dtype=float) * kurbel_faktor
+    querschnitt_cm2 = ansaug_faktor * (np.asarray(vergaser_d_mm, dtype=float) / 10 / 2)**2 * np.pi
+    steigung = 1750 / np.sqrt(kurbelhausvolumen_cm3 * np.asarray(ansaug_laenge, dtype=float) / querschnitt_cm2)
+    drehzahl, steigung, winkel = np.broadcast_arrays(drehzahl, steigung, np.asarray(oeffnungswinkel_grad, dtype=float))
+    k = float(np.sum(steigung * (steigung * winkel - drehzahl)) / np.sum(steigung**2))
+    return k, float(np.sqrt(np.mean((steigung * (winkel - k) - drehzahl)**2)))
+
+
+def werte_aus(pfade, eingaben, klassenbreite_upm=50.0, glaettung=5, min_anzahl=10, min_prominenz=0.02,
+              max_abweichung=0.2, **lesen):
+    """
+    Wertet ein oder mehrere Protokolle desselben Motors aus.
+
+    Args:
+        pfade (list): Protokolldateien, siehe lies_bloecke.
+        eingaben (dict): Motor-Konfiguration, siehe vorhersagen.
+        klassenbreite_upm, glaettung, min_anzahl: siehe Drehzahlklassen.
+        min_prominenz: siehe drehmomentspitzen.
+        max_abweichung: siehe ordne_zu.
+        **lesen: Weitere Argumente für lies_bloecke (spalten, dtype, blockgroesse, trennzeichen).
+
+    Returns:
+        dict: "proben", "verworfen", "kurve", "spitzen", "vorhersagen", "zuordnung" und "anpassung"
+            ("auslass": c, EGT-Vergleich; "einlass": k), jeweils nur für zugeordnete Maxima.
+
+    Raises:
+        ValueError: Wenn sich weder eine Auslass- noch eine Einlass-Vorhersage bilden lässt; die
+            Meldung nennt die fehlenden Felder.
+    """
+    # Vorhersagen zuerst: eine ungültige Konfiguration soll auffallen, bevor GB an Protokoll gelesen sind
+    vorhersage = vorhersagen(eingaben)
+    if not vorhersage:
+        raise ValueError(_keine_vorhersage(eingaben))
+    klassen = Drehzahlklassen(klassenbreite_upm)
+    for pfad in pfade:
+        for block in lies_bloecke(pfad, **lesen):
+            klassen.hinzufuegen(block["drehzahl"], block["drehmoment"], block.get("egt"))
+    kurve = klassen.kurve(glaettung, min_anzahl)
+    spitzen = drehmomentspitzen(kurve, min_prominenz)
+    zuordnung = ordne_zu(spitzen, vorhersage, max_abweichung)
+
+    anpassung = {}
+    if "auslass" in zuordnung:
+        auslass = vorhersage["auslass"]
+        c, _ = passe_schallgeschwindigkeit_an(zuordnung["auslass"]["drehzahl_upm"], auslass["laenge_m"],
+                                              auslass["oeffnungswinkel_grad"])
+        egt = zuordnung["auslass"]["egt_c"]
+        anpassung["auslass"] = {
+            "schallgeschwindigkeit_ms": c,
+            "vorgabe_ms": auslass["schallgeschwindigkeit_ms"],
+            # Zum Vergleich: Schallgeschwindigkeit bei der am Maximum gemessenen EGT
+            "aus_egt_ms": float(schallgeschwindigkeit(egt + 273.15)) if not math.isnan(egt) else None,
+        }
+    if "einlass" in zuordnung:
+        einlass = dict(vorhersage["einlass"])
+        einlass.pop("drehzahl_upm")
+        k, _ = passe_winkelkorrektur_an(zuordnung["einlass"]["drehzahl_upm"], **einlass)
+        anpassung["einlass"] = {"winkelkorrektur_grad": k, "vorgabe_grad": EINLASS_KORREKTUR_GRAD}
+
+    return {
+        "proben": klassen.proben,
+        "verworfen": klassen.verworfen,
+        "kurve": kurve,
+        "spitzen": spitzen,
+        "vorhersagen": vorhersage,
+        "zuordnung": zuordnung,
+        "anpassung": anpassung,
+    }
+
+
+def zeichne_vergleich(auswertung, pfad):
+    """Speichert die Drehmomentkurve mit gemessenen Maxima und vorhergesagten Resonanzen als Bild."""
+    # Matplotlib nur hier laden, die Auswertung selbst braucht es nicht
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    kurve = auswertung["kurve"]
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.plot(kurve["drehzahl_upm"], kurve["drehmoment_nm"], color="black", label="Drehmoment (gemessen)")
+    for spitze in auswertung["spitzen"]:
+        ax.plot(spitze["drehzahl_upm"], spitze["drehmoment_nm"], "o", color="black")
+    for name, farbe in (("auslass", "blue"), ("einlass", "orange")):
+        if name in auswertung["vorhersagen"]:
+            ax.axvline(auswertung["vorhersagen"][name]["drehzahl_upm"], color=farbe, linestyle="--",
+                       label=f"{name.capitalize()}-Resonanz (vorhergesagt)")
+        if name in auswertung["zuordnung"]:
+            ax.axvline(auswertung["zuordnung"][name]["drehzahl_upm"], color=farbe, linestyle=":",
+                       label=f"{name.capitalize()}-Resonanz (gemessen)")
+    gueltig = np.isfinite(kurve["drehmoment_nm"])
+    if gueltig.any():
+        ax.set_xlim(kurve["drehzahl_upm"][gueltig][[0, -1]])
+    ax.set_xlabel("Drehzahl (U/min)")
+    ax.set_ylabel("Drehmoment (Nm)")
+    ax.grid(True)
+    ax.legend()
+    fig.savefig(pfad, bbox_inches="tight")
+    plt.close(fig)
+
+
+def _json_wert(wert):
+    """Arrays und NaN JSON-tauglich machen (NaN wird None)."""
+    if isinstance(wert, dict):
+        return {name: _json_wert(w) for name, w in wert.items()}
+    if isinstance(wert, list):
+        return [_json_wert(w) for w in wert]
+    if isinstance(wert, np.ndarray):
+        return [None if isinstance(w, float) and math.isnan(w) else w for w in wert.tolist()]
+    if isinstance(wert, float) and math.isnan(wert):
+        return None
+    return wert
+
+
+def _lies_feld(text):
+    name, _, wert = text.partition("=")
+    if not wert:
+        raise argparse.ArgumentTypeError(f"Erwartet feld=wert, nicht {text!r}")
+    return name.strip(), float(wert.replace(",", "."))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prüfstandsprotokolle gegen die Resonanzvorhersagen auswerten.")
+    parser.add_argument("protokolle", nargs="+", help="CSV-, .npy- oder rohe Binärdateien desselben Motors")
+    parser.add_argument("--motor", help="Name des Motors in der Motor-Datenbank")
+    parser.add_argument("--datenbank", default="motoren.sqlite", help="SQLite-Datei (siehe motorspeicher)")
+    parser.add_argument("--konfiguration", help="JSON-Datei mit den Feldern des Motors (flach oder unter \"eingaben\")")
+    parser.add_argument("-f", "--feld", action="append", default=[], type=_lies_feld,
+                        help="Einzelnes Feld setzen oder überschreiben, z.B. -f schall_ms=520")
+    parser.add_argument("--spalten", default=",".join(BINAER_SPALTEN), help="Felder roher Binärdatensätze in Dateireihenfolge")
+    parser.add_argument("--dtype", default="float32", help="Zahlentyp roher Binärdateien")
+    parser.add_argument("--trennzeichen", default=",", help="Spaltentrenner von CSV-Protokollen")
+    parser.add_argument("--blockgroesse", type=int, default=BLOCKGROESSE, help="Datensätze pro Block")
+    parser.add_argument("--klassenbreite", type=float, default=50.0, help="Breite der Drehzahlklassen in U/min")
+    parser.add_argument("--glaettung", type=int, default=5, help="Gleitendes Mittel über so viele Klassen")
+    parser.add_argument("--prominenz", type=float, default=0.02, help="Mindestprominenz als Anteil des Maximums")
+    parser.add_argument("--bild", help="Vergleichsbild speichern (PNG, PDF, SVG)")
+    parser.add_argument("--kurve", action="store_true", help="Die ganze Drehmomentkurve mit ausgeben")
+    args = parser.parse_args()
+
+    eingaben = {}
+    if args.motor:
+        import motorspeicher
+        with motorspeicher.Motorspeicher(args.datenbank) as speicher:
+            motor = speicher.lade(args.motor)
+        if motor is None:
+            parser.error(f"Motor {args.motor!r} nicht gefunden.")
+        eingaben.update(motor["eingaben"])
+    if args.konfiguration:
+        with open(args.konfiguration, encoding="utf-8") as datei:
+            konfiguration = json.load(datei)
+        eingaben.update(konfiguration.get("eingaben", konfiguration))
+    eingaben.update(args.feld)
+
+    try:
+        auswertung = werte_aus(
+            args.protokolle, eingaben, args.klassenbreite, args.glaettung, min_prominenz=args.prominenz,
+            spalten=args.spalten.split(","), dtype=args.dtype, blockgroesse=args.blockgroesse, trennzeichen=args.trennzeichen,
+        )
+    except ValueError as fehler:
+        parser.error(str(fehler))
+    if args.bild:
+        zeichne_vergleich(auswertung, args.bild)
+    if not args.kurve:
+        del auswertung["kurve"]
+    print(json.dumps(_json_wert(auswertung), ensure_ascii=False, indent=2))
@@ -0,0 +1,327 @@
+"""
+Lokaler HTTP/JSON-Dienst für Kinematik, Resonanzdrehzahlen und Steuerzeiten.
+
+Läuft vollständig offline, nur mit der Standardbibliothek (asyncio) und NumPy. Jeder
+Parameter darf eine Zahl oder eine Liste sein; Listen werden wie in den Modulen
+broadcastet, ein Aufruf kann also tausende Punkte auf einmal berechnen.
+
+    POST /kinematik/kolbenweg     {"kurbelwinkel_grad": [0, 90, 180], "pleuelstange_mm": 110, "hub_mm": 54}
+    POST /kinematik/kurbelwinkel  {"kolbenweg_mm": [1, 2], "pleuelstange_mm": 110, "hub_mm": 54}
+    POST /resonanz/auslass        {"laenge_m": 0.9, "oeffnungswinkel_grad": 190, "schallgeschwindigkeit_ms": 500}
+    POST /resonanz/einlass        {"oeffnungswinkel_grad": 140, "hubraum_ccm": 125, ...}
+    POST /steuerzeiten            {"kanal_hoehen_mm": {"auslass": 23, "ueberstroemer": 28.5}, "hub_mm": 54, ...}
+    GET  /cache                   Treffer, Fehlschläge und Füllstand des Ergebnis-Caches
+
+Die fertigen JSON-Antworten liegen in einem LRU-Cache, dessen Schlüssel die normalisierten
+Eingaben sind (Zahlen als float, Schlüssel sortiert). Begrenzt sind Anzahl und Gesamtgröße der
+Antworten; einzelne sehr große Antworten (bis zu MAX_ELEMENTE Werte) werden nicht gecacht.
+
+Aufruf:
+    python rechenserver.py --port 8000 --cache 4096 --cache-mb 256
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+import threading
+import traceback
+from collections import OrderedDict
+
+import numpy as np
+
+from ergebnisse import Messwert
+from kinematik import kolbenweg_messwert, kurbelwinkel_messwert
+from resonanz import auslass_resonanz_messwert, einlass_resonanz_messwert
+from steuerzeiten import berechne_steuerzeiten
+
+# Pfad -> (Funktion, Pflichtparameter, optionale Parameter)
+ENDPUNKTE = {
+    "/kinematik/kolbenweg": (kolbenweg_messwert, ("kurbelwinkel_grad", "pleuelstange_mm", "hub_mm"), ()),
+    "/kinematik/kurbelwinkel": (kurbelwinkel_messwert, ("kolbenweg_mm", "pleuelstange_mm", "hub_mm"), ()),
+    "/resonanz/auslass": (auslass_resonanz_messwert, ("laenge_m", "oeffnungswinkel_grad", "schallgeschwindigkeit_ms"), ()),
+    "/resonanz/einlass": (einlass_resonanz_messwert, ("oeffnungswinkel_grad", "hubraum_ccm", "kurbel_faktor",
+                                                      "vergaser_d_mm", "ansaug_faktor", "ansaug_laenge"), ()),
+    "/steuerzeiten": (berechne_steuerzeiten, ("kanal_hoehen_mm", "hub_mm", "pleuelstange_mm"),
+                      ("einlass_kolbenweg_mm", "ot_abstand_mm")),
+}
+
+# Parameter, die ein JSON-Objekt (Name -> Wert) sein müssen; alle anderen sind Zahlen oder Listen
+OBJEKT_PARAMETER = {"kanal_hoehen_mm"}
+
+MAX_ELEMENTE = 1_000_000
+MAX_ANFRAGE_BYTES = 64 * 1024 * 1024
+# Größere Anfragen werden in einem Thread gerechnet, damit kleine Anfragen nicht warten müssen
+THREAD_AB_BYTES = 64 * 1024
+
+STATUS_TEXTE = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+                500: "Internal Server Error"}
+
+
+class AnfrageFehler(Exception):
+    """Fehler in einer Anfrage, wird als JSON mit dem HTTP-Status beantwortet."""
+
+    def __init__(self, status, meldung):
+        super().__init__(meldung)
+        self.status = status
+
+
+class _Objekt(tuple):
+    """Hashbares JSON-Objekt: sortierte (Name, Wert)-Paare."""
+
+
+def _normalisiere(wert):
+    """Macht JSON-Eingaben hashbar: Zahlen als float, Listen als Tupel, dicts sortiert."""
+    if isinstance(wert, dict):
+        return _Objekt(sorted((str(k), _normalisiere(v)) for k, v in wert.items()))
+    if isinstance(wert, (list, tuple)):
+        # Schneller Weg für die übliche flache Zahlenliste
+        if all(type(v) is float or type(v) is int for v in wert):
+            return tuple(map(float, wert))
+        return tuple(_normalisiere(v) for v in wert)
+    if isinstance(wert, bool) or not isinstance(wert, (int, float)):
+        raise AnfrageFehler(400, f"Ungültiger Wert: {wert!r}")
+    return float(wert)
+
+
+def _als_array(wert):
+    """Tupel aus _normalisiere als float-Array, verschachtelte Schlüssel bleiben ein dict."""
+    if isinstance(wert, _Objekt):
+        return {name: _als_array(v) for name, v in wert}
+    return np.asarray(wert, dtype=float)
+
+
+def _json_wert(wert):
+    """Wandelt Ergebnisse in JSON-taugliche Werte um, NaN wird zu None."""
+    if isinstance(wert, Messwert):
+        return wert.als_dict()
+    if isinstance(wert, dict):
+        return {name: _json_wert(v) for name, v in wert.items()}
+    if np.ndim(wert) == 0:
+        wert = float(wert)
+        return None if math.isnan(wert) else wert
+    return [None if math.isnan(v) else v for v in np.asarray(wert, dtype=float).ravel().tolist()]
+
+
+def _elemente(parameter):
+    """Anzahl der Elemente nach dem Broadcasting (ohne sie anzulegen)."""
+    arrays = []
+    for wert in parameter.values():
+        arrays += list(wert.values()) if isinstance(wert, dict) else [wert]
+    return int(np.prod(np.broadcast_shapes(*(np.shape(a) for a in arrays)))) if arrays else 0
+
+
+def berechne(pfad, eingaben):
+    """
+    Berechnet einen Endpunkt für normalisierte Eingaben und liefert die fertige JSON-Antwort.
+
+    Args:
+        pfad (str): Einer der Pfade aus ENDPUNKTE.
+        eingaben (tuple): Ausgabe von _normalisiere für den JSON-Körper der Anfrage.
+
+    Returns:
+        bytes: Die JSON-Antwort.
+    """
+    funktion, pflicht, optional = ENDPUNKTE[pfad]
+    daten = dict(eingaben)
+    fehlend = [name for name in pflicht if name not in daten]
+    if fehlend:
+        raise AnfrageFehler(400, f"Fehlende Parameter: {', '.join(fehlend)}")
+    unbekannt = sorted(set(daten) - set(pflicht) - set(optional))
+    if unbekannt:
+        raise AnfrageFehler(400, f"Unbekannte Parameter: {', '.join(unbekannt)}")
+
+    for name, wert in daten.items():
+        if (name in OBJEKT_PARAMETER) != isinstance(wert, _Objekt):
+            art = "ein Objekt" if name in OBJEKT_PARAMETER else "eine Zahl oder eine Liste"
+            raise AnfrageFehler(400, f"{name} muss {art} sein.")
+
+    try:
+        # Ungleich lange verschachtelte Listen scheitern schon hier mit ValueError
+        parameter = {name: _als_array(wert) for name, wert in daten.items()}
+        if _elemente(parameter) > MAX_ELEMENTE:
+            raise AnfrageFehler(413, f"Höchstens {MAX_ELEMENTE} Elemente pro Anfrage.")
+        ergebnis = funktion(**parameter)
+    except (TypeError, ValueError) as fehler:
+        raise AnfrageFehler(400, str(fehler)) from fehler
+    return json.dumps(_json_wert(ergebnis), ensure_ascii=False).encode("utf-8")
+
+
+class AntwortCache:
+    """
+    LRU-Cache für fertige Antworten, begrenzt nach Anzahl und nach Gesamtgröße in Bytes.
+
+    Eine Antwort mit 1e6 Werten ist mehrere zehn MB groß, eine Begrenzung nur nach der Anzahl
+    der Einträge würde den Speicher also nicht begrenzen. Antworten über max_eintrag_bytes werden
+    nicht aufgenommen, damit eine einzelne große Anfrage nicht den ganzen Cache verdrängt.
+    berechne läuft auch in Threads des Executors, deshalb ist der Zugriff gesperrt.
+
+    Args:
+        max_eintraege (int): Höchstzahl zwischengespeicherter Antworten.
+        max_bytes (int): Höchstgröße aller zwischengespeicherten Antworten zusammen.
+        max_eintrag_bytes (int): Größere Antworten werden nicht gecacht (Standard: max_bytes / 16).
+    """
+
+    def __init__(self, max_eintraege=4096, max_bytes=256 * 1024 * 1024, max_eintrag_bytes=None):
+        self.max_eintraege = max_eintraege
+        self.max_bytes = max_bytes
+        self.max_eintrag_bytes = max_bytes // 16 if max_eintrag_bytes is None else max_eintrag_bytes
+        self._antworten = OrderedDict()
+        self._bytes = 0
+        self._sperre = threading.Lock()
+        self.treffer = self.fehlschlaege = self.zu_gross = 0
+
+    def berechne(self, pfad, eingaben):
+        """Wie berechne, mit zwischengespeicherter Antwort für bereits gerechnete Eingaben."""
+        schluessel = (pfad, eingaben)
+        with self._sperre:
+            antwort = self._antworten.get(schluessel)
+            if antwort is not None:
+                self._antworten.move_to_end(schluessel)
+                self.treffer += 1
+                return antwort
+            self.fehlschlaege += 1
+
+        antwort = berechne(pfad, eingaben)
+        if len(antwort) > self.max_eintrag_bytes or self.max_eintraege <= 0:
+            with self._sperre:
+                self.zu_gross += len(antwort) > self.max_eintrag_bytes
+            return antwort
+        with self._sperre:
+            if schluessel not in self._antworten:
+                self._antworten[schluessel] = antwort
+                self._bytes += len(antwort)
+                while len(self._antworten) > self.max_eintraege or self._bytes > self.max_bytes:
+                    _, alt = self._antworten.popitem(last=False)
+                    self._bytes -= len(alt)
+        return antwort
+
+    def statistik(self):
+        with self._sperre:
+            anfragen = self.treffer + self.fehlschlaege
+            return {
+                "treffer": self.treffer,
+                "fehlschlaege": self.fehlschlaege,
+                "trefferquote": self.treffer / anfragen if anfragen else 0.0,
+                "eintraege": len(self._antworten),
+                "max_eintraege": self.max_eintraege,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "nicht_gecacht_zu_gross": self.zu_gross,
+            }
+
+
+class Rechenserver:
+    """
+    asyncio-Server mit begrenztem LRU-Cache für die fertigen Antworten.
+
+    Args:
+        cache_groesse (int): Höchstzahl zwischengespeicherter Antworten.
+        cache_bytes (int): Höchstgröße aller zwischengespeicherten Antworten in Bytes.
+    """
+
+    def __init__(self, cache_groesse=4096, cache_bytes=256 * 1024 * 1024):
+        self.cache = AntwortCache(cache_groesse, cache_bytes)
+        self.berechne = self.cache.berechne
+
+    def cache_statistik(self):
+        return self.cache.statistik()
+
+    async def antworte(self, methode, pfad, koerper):
+        """Bearbeitet eine Anfrage und liefert (Status, JSON-Bytes)."""
+        if pfad == "/cache":
+            return 200, json.dumps(self.cache_statistik()).encode("utf-8")
+        if pfad not in ENDPUNKTE:
+            raise AnfrageFehler(404, f"Unbekannter Pfad: {pfad}")
+        if methode != "POST":
+            raise AnfrageFehler(405, "Nur POST mit JSON-Körper.")
+        try:
+            daten = json.loads(koerper or b"{}")
+        except json.JSONDecodeError as fehler:
+            raise AnfrageFehler(400, f"Ungültiges JSON: {fehler}") from fehler
+        if not isinstance(daten, dict):
+            raise AnfrageFehler(400, "Der JSON-Körper muss ein Objekt sein.")
+        eingaben = _normalisiere(daten)
+
+        if len(koerper) >= THREAD_AB_BYTES:
+            antwort = await asyncio.get_running_loop().run_in_executor(None, self.berechne, pfad, eingaben)
+        else:
+            antwort = self.berechne(pfad, eingaben)
+        return 200, antwort
+
+    async def verbindung(self, leser, schreiber):
+        """Bedient eine Verbindung, mit Keep-Alive für mehrere Anfragen nacheinander."""
+        try:
+            while True:
+                anfragezeile = await leser.readline()
+                if not anfragezeile:
+                    break
+                teile = anfragezeile.decode("latin-1").split()
+                kopf = {}
+                while (zeile := await leser.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, wert = zeile.decode("latin-1").partition(":")
+                    kopf[name.strip().lower()] = wert.strip()
+
+                version = teile[2] if len(teile) == 3 else ""
+                # Nach einer unlesbaren Anfragezeile oder Länge ist das Ende des Körpers unbekannt
+                lesbar = len(teile) == 3 and kopf.get("content-length", "0").isdigit()
+                try:
+                    if not lesbar:
+                        raise AnfrageFehler(400, "Ungültige Anfragezeile oder Content-Length.")
+                    methode, pfad, _ = teile
+                    laenge = int(kopf.get("content-length", "0"))
+                    if laenge > MAX_ANFRAGE_BYTES:
+                        raise AnfrageFehler(413, f"Höchstens {MAX_ANFRAGE_BYTES} Bytes pro Anfrage.")
+                    koerper = await leser.readexactly(laenge) if laenge else b""
+                    status, antwort = await self.antworte(methode, pfad.split("?")[0], koerper)
+                except AnfrageFehler as fehler:
+                    status = fehler.status
+                    antwort = json.dumps({"fehler": str(fehler)}, ensure_ascii=False).encode("utf-8")
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    raise
+                except Exception as fehler:
+                    # Jede Anfrage bekommt eine Antwort; der Fehler gehört ins Log des Servers
+                    traceback.print_exc(file=sys.stderr)
+                    status = 500
+                    antwort = json.dumps({"fehler": f"Interner Fehler: {type(fehler).__name__}: {fehler}"},
+                                         ensure_ascii=False).encode("utf-8")
+
+                offen_halten = (version == "HTTP/1.1" and kopf.get("connection", "").lower() != "close"
+                                and status != 413 and lesbar)
+                schreiber.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXTE[status]}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(antwort)}\r\n"
+                    f"Connection: {'keep-alive' if offen_halten else 'close'}\r\n\r\n".encode("latin-1") + antwort
+                )
+                await schreiber.drain()
+                if not offen_halten:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            schreiber.close()
+
+    async def starte(self, host="127.0.0.1", port=8000):
+        """Startet den Server und gibt das asyncio.Server-Objekt zurück."""
+        return await asyncio.start_server(self.verbindung, host, port)
+
+
+async def _dienen(host, port, cache_groesse, cache_mb):
+    server = await Rechenserver(cache_groesse, int(cache_mb * 1024 * 1024)).starte(host, port)
+    print(f"Rechenserver läuft auf http://{host}:{port}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lokaler HTTP/JSON-Dienst für die Zweitakt-Berechnungen.")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse (Standard: nur lokal)")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--cache", dest="cache_groesse", type=int, default=4096, help="Anzahl gecachter Antworten")
+    parser.add_argument("--cache-mb", type=float, default=256, help="Gesamtgröße gecachter Antworten in MB")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_dienen(args.host, args.port, args.cache_groesse, args.cache_mb))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,293 @@
+"""
+Schnell startende Kommandozeile für Stapelrechnungen, ohne Oberfläche, NumPy oder Matplotlib.
+
+Liest Aufträge als CSV oder JSON aus Dateien oder von stdin und schreibt jedes Ergebnis sofort
+nach stdout, ohne die ganze Eingabe zu laden. Gerechnet wird mit formeln (nur math), ein Aufruf
+startet deshalb in wenigen zehn Millisekunden und lässt sich tausendfach aus Shell-Skripten
+aufrufen. Matplotlib wird nur geladen, wenn eine Gradscheibe verlangt wird.
+
+Rechnungen und ihre Parameter (CSV-Spalten bzw. JSON-Schlüssel, [..] = optional):
+    kolbenweg     kurbelwinkel_grad, pleuelstange_mm, hub_mm
+    kurbelwinkel  kolbenweg_mm, pleuelstange_mm, hub_mm
+    auslass       laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms
+    einlass       oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge
+    steuerzeiten  hub_mm, pleuel_mm, [auslass_mm, ueberstroemer_mm, boost_mm, einlass_mm, ot_abstand_mm]
+                  (Spalten wie bei steuerzeiten.py, leere Zellen = Kanal nicht vorhanden)
+    gradscheibe   zuendwinkel, datei (PNG-Datei, die geschrieben wird)
+
+Eingabe: CSV mit Kopfzeile, JSON Lines (ein Objekt je Zeile) oder ein JSON-Array (wird als
+Ganzes gelesen). In JSON darf jedes Objekt seine Rechnung unter "rechnung" selbst angeben.
+Ausgabe: jede Eingabezeile mit angehängten Ergebnissen und der Spalte "fehler", im Format der
+Eingabe. Exit-Code 1, wenn ein Auftrag nicht gerechnet werden konnte.
+
+Aufruf:
+    python rechner.py auslass resonanz.csv
+    echo '{"laenge_m": 0.85, "oeffnungswinkel_grad": 190, "schallgeschwindigkeit_ms": 500}' | python rechner.py auslass
+    python rechner.py steuerzeiten zylinder.csv --ausgabe-format json
+"""
+import argparse
+import csv
+import itertools
+import json
+import math
+import sys
+
+import formeln
+from fehlercodes import FEHLERMELDUNGEN
+
+MESSWERT_FELDER = ("wert", "einheit")
+
+
+def _messwert(funktion, einheit):
+    """Macht aus einer formeln-Funktion mit (Wert, Fehlercode) eine Rechnung mit Ergebnisfeldern."""
+    def rechnung(**parameter):
+        wert, fehlercode = funktion(**parameter)
+        return {"wert": wert, "einheit": einheit, "fehler": FEHLERMELDUNGEN[fehlercode]}
+    return rechnung
+
+
+def _steuerzeiten(hub_mm, pleuel_mm, einlass_mm=None, ot_abstand_mm=0.0, **kanal_hoehen):
+    hoehen = {kanal: kanal_hoehen[f"{kanal}_mm"] for kanal in formeln.KANAELE if f"{kanal}_mm" in kanal_hoehen}
+    # Wie steuerzeiten.py: ungültige Geometrie und Kanäle außerhalb des Hubs sind ein Fehler der Zeile
+    kolbenwege = [hoehe - ot_abstand_mm for hoehe in hoehen.values()] + ([einlass_mm] if einlass_mm is not None else [])
+    for kolbenweg in kolbenwege:
+        _, fehlercode = formeln.kurbelwinkel(kolbenweg, pleuel_mm, hub_mm)
+        if fehlercode:
+            raise ValueError(FEHLERMELDUNGEN[fehlercode])
+    ergebnis = formeln.steuerzeiten(hoehen, hub_mm, pleuel_mm, einlass_mm, ot_abstand_mm)
+    return {f"{kanal}_{name}": wert for kanal, werte in ergebnis.items() for name, wert in werte.items()}
+
+
+def _steuerzeiten_felder(spalten):
+    """Ergebnisspalten der Steuerzeiten für die vorhandenen Kanalspalten."""
+    kanaele = [kanal for kanal in formeln.KANAELE if f"{kanal}_mm" in spalten]
+    felder = []
+    for kanal in kanaele:
+        felder += [f"{kanal}_oeffnet_grad", f"{kanal}_schliesst_grad", f"{kanal}_dauer_grad"]
+        if "auslass" in kanaele and len(kanaele) > 1:
+            felder.append(f"{kanal}_vorauslass_grad")
+    if "einlass_mm" in spalten:
+        felder += ["einlass_oeffnet_grad", "einlass_schliesst_grad", "einlass_dauer_grad"]
+    return felder
+
+
+def _gradscheibe(zuendwinkel, datei):
+    # Matplotlib erst hier laden, der Import allein dauert länger als alle anderen Rechnungen
+    from gradscheibe import gradscheibe_png
+    png = gradscheibe_png(zuendwinkel)
+    with open(datei, "wb") as ausgabe:
+        ausgabe.write(png)
+    return {"bytes": len(png)}
+
+
+# Name -> (Funktion, Pflichtparameter, optionale Parameter, Ergebnisspalten abhängig von den Eingabespalten)
+RECHNUNGEN = {
+    "kolbenweg": (_messwert(formeln.kolbenweg, "mm"), ("kurbelwinkel_grad", "pleuelstange_mm", "hub_mm"), (),
+                  lambda spalten: MESSWERT_FELDER),
+    "kurbelwinkel": (_messwert(formeln.kurbelwinkel, "°"), ("kolbenweg_mm", "pleuelstange_mm", "hub_mm"), (),
+                     lambda spalten: MESSWERT_FELDER),
+    "auslass": (_messwert(formeln.auslass_resonanz, "U/min"),
+                ("laenge_m", "oeffnungswinkel_grad", "schallgeschwindigkeit_ms"), (), lambda spalten: MESSWERT_FELDER),
+    "einlass": (_messwert(formeln.einlass_resonanz, "U/min"),
+                ("oeffnungswinkel_grad", "hubraum_ccm", "kurbel_faktor", "vergaser_d_mm", "ansaug_faktor", "ansaug_laenge"),
+                (), lambda spalten: MESSWERT_FELDER),
+    "steuerzeiten": (_steuerzeiten, ("hub_mm", "pleuel_mm"),
+                     tuple(f"{kanal}_mm" for kanal in formeln.KANAELE) + ("einlass_mm", "ot_abstand_mm"),
+                     _steuerzeiten_felder),
+    "gradscheibe": (_gradscheibe, ("zuendwinkel", "datei"), (), lambda spalten: ("bytes",)),
+}
+
+# Parameter, die als Text übergeben werden
+TEXT_PARAMETER = {"datei"}
+
+
+def _zahl(wert):
+    """Zahl aus einer CSV-Zelle oder einem JSON-Wert, Komma als Dezimaltrenner erlaubt."""
+    if isinstance(wert, bool) or not isinstance(wert, (int, float, str)):
+        raise ValueError(f"Ungültiger Wert: {wert!r}")
+    if isinstance(wert, str):
+        try:
+            return float(wert.strip().replace(",", "."))
+        except ValueError:
+            raise ValueError(f"Ungültiger Wert: {wert!r}") from None
+    return float(wert)
+
+
+def _leer(wert):
+    return wert is None or (isinstance(wert, str) and wert.strip() == "")
+
+
+def rechne(rechnung, auftrag):
+    """
+    Rechnet einen Auftrag.
+
+    Args:
+        rechnung (str): Einer der Namen aus RECHNUNGEN.
+        auftrag (dict): Parameter als Zahlen oder Texte; weitere Schlüssel (z.B. name) werden übergangen.
+
+    Returns:
+        dict: Ergebnisfelder, immer mit "fehler" ("" wenn gültig).
+
+    Raises:
+        ValueError: Bei unbekannter Rechnung, fehlenden oder nicht lesbaren Parametern.
+    """
+    if rechnung not in RECHNUNGEN:
+        raise ValueError(f"Unbekannte Rechnung: {rechnung!r}")
+    funktion, pflicht, optional, _ = RECHNUNGEN[rechnung]
+    fehlend = [name for name in pflicht if _leer(auftrag.get(name))]
+    if fehlend:
+        raise ValueError(f"Fehlende Parameter: {', '.join(fehlend)}")
+    parameter = {}
+    for name in pflicht + optional:
+        if not _leer(auftrag.get(name)):
+            parameter[name] = str(auftrag[name]) if name in TEXT_PARAMETER else _zahl(auftrag[name])
+    ergebnis = funktion(**parameter)
+    ergebnis.setdefault("fehler", "")
+    return ergebnis
+
+
+class _JsonZeile(str):
+    """Noch nicht geparste Zeile einer JSON-Lines-Eingabe."""
+
+
+def lies_auftraege(datei):
+    """
+    Erkennt das Format an der ersten Zeile und liefert die Aufträge einzeln.
+
+    JSON Lines werden erst in verarbeite geparst (als _JsonZeile), damit eine kaputte Zeile nur
+    ihren eigenen Auftrag betrifft und nicht den ganzen Strom abbricht.
+
+    Returns:
+        tuple: ("csv" oder "json", Spalten der CSV bzw. None, Iterator über dicts bzw. _JsonZeile).
+
+    Raises:
+        ValueError: Wenn ein JSON-Array nicht lesbar ist; anders als bei JSON Lines betrifft das die ganze Datei.
+    """
+    erste = datei.readline()
+    while erste and not erste.strip():
+        erste = datei.readline()
+    zeilen = itertools.chain([erste], datei)
+    if erste.lstrip().startswith("["):
+        try:
+            return "json", None, iter(json.loads("".join(zeilen)))
+        except json.JSONDecodeError as fehler:
+            raise ValueError(f"Ungültiges JSON-Array: {fehler.msg} (Zeile {fehler.lineno}, Spalte {fehler.colno})") from fehler
+    if erste.lstrip().startswith("{"):
+        return "json", None, (_JsonZeile(zeile) for zeile in zeilen if zeile.strip())
+    leser = csv.DictReader(zeilen)
+    return "csv", leser.fieldnames or [], leser
+
+
+def _csv_wert(wert):
+    if isinstance(wert, float):
+        return "" if math.isnan(wert) else repr(wert)
+    return wert
+
+
+def _json_wert(wert):
+    return None if isinstance(wert, float) and math.isnan(wert) else wert
+
+
+class Ausgabe:
+    """
+    Schreibt Ergebnisse zeilenweise als CSV oder JSON Lines.
+
+    Bei CSV stehen die Spalten nach dem ersten Auftrag fest: Eingabespalten, Ergebnisspalten der
+    Rechnung, fehler. Ergebnisse anderer Rechnungen ohne passende Spalte werden weggelassen.
+
+    Args:
+        datei: Textdatei-Objekt für die Ausgabe.
+        format (str): "csv" oder "json".
+        sofort (bool): Nach jeder Zeile leeren, z.B. wenn ein Skript auf jede Antwort wartet.
+    """
+
+    def __init__(self, datei, format, sofort=False):
+        self.datei = datei
+        self.format = format
+        self.sofort = sofort
+        self.schreiber = None
+
+    def schreibe(self, rechnung, auftrag, ergebnis, spalten=None):
+        if self.format == "json":
+            zeile = {**auftrag, **{name: _json_wert(wert) for name, wert in ergebnis.items()}}
+            self.datei.write(json.dumps(zeile, ensure_ascii=False) + "\n")
+        else:
+            if self.schreiber is None:
+                spalten = list(spalten or auftrag)
+                felder = RECHNUNGEN[rechnung][3](spalten) if rechnung in RECHNUNGEN else ()
+                spalten += [feld for feld in (*felder, "fehler") if feld not in spalten]
+                self.schreiber = csv.DictWriter(self.datei, fieldnames=spalten, extrasaction="ignore")
+                self.schreiber.writeheader()
+            self.schreiber.writerow({**auftrag, **{name: _csv_wert(wert) for name, wert in ergebnis.items()}})
+        if self.sofort:
+            self.datei.flush()
+
+
+def verarbeite(datei, rechnung, ausgabe=None, ausgabe_format=None, sofort=False):
+    """
+    Rechnet alle Aufträge einer Eingabedatei und schreibt die Ergebnisse nach und nach.
+
+    Args:
+        datei: Textdatei-Objekt mit CSV oder JSON.
+        rechnung (str | None): Rechnung für Aufträge ohne eigenes "rechnung"-Feld.
+        ausgabe (Ausgabe | None): Ziel; None legt eine Ausgabe auf stdout im Format der Eingabe an.
+        ausgabe_format (str | None): Format für eine neu angelegte Ausgabe.
+        sofort (bool): Eine neu angelegte Ausgabe nach jeder Zeile leeren.
+
+    Returns:
+        tuple: (Ausgabe, Anzahl der Aufträge, Anzahl der Aufträge mit Eingabefehlern).
+
+    Raises:
+        ValueError: Wenn die Eingabe als Ganzes nicht lesbar ist (siehe lies_auftraege).
+    """
+    format, spalten, auftraege = lies_auftraege(datei)
+    if ausgabe is None:
+        ausgabe = Ausgabe(sys.stdout, ausgabe_format or format, sofort)
+    anzahl = fehlerhaft = 0
+    for auftrag in auftraege:
+        anzahl += 1
+        name = rechnung
+        try:
+            if isinstance(auftrag, _JsonZeile):
+                try:
+                    auftrag = json.loads(auftrag)
+                except json.JSONDecodeError as fehler:
+                    raise ValueError(f"Ungültiges JSON in Auftrag {anzahl}: {fehler.msg}") from fehler
+            if not isinstance(auftrag, dict):
+                raise ValueError("Ein Auftrag muss ein JSON-Objekt sein.")
+            name = auftrag.get("rechnung") or rechnung
+            ergebnis = rechne(name, auftrag)
+        except (ValueError, ArithmeticError, OSError) as fehler:
+            fehlerhaft += 1
+            ergebnis = {"fehler": str(fehler)}
+        ausgabe.schreibe(name, auftrag if isinstance(auftrag, dict) else {}, ergebnis, spalten)
+    return ausgabe, anzahl, fehlerhaft
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stapelrechnungen aus CSV/JSON, Ergebnisse nach stdout.")
+    parser.add_argument("rechnung", nargs="?", help=f"Eine von {', '.join(RECHNUNGEN)}; weglassen, wenn jeder "
+                                                    "JSON-Auftrag sein Feld \"rechnung\" hat")
+    parser.add_argument("eingabe", nargs="*", default=["-"], help="CSV- oder JSON-Dateien (- für stdin)")
+    parser.add_argument("--ausgabe-format", choices=("csv", "json"), help="Standard: Format der ersten Eingabe")
+    parser.add_argument("-u", "--sofort", action="store_true", help="Nach jedem Ergebnis die Ausgabe leeren")
+    args = parser.parse_args()
+    if args.rechnung is not None and args.rechnung not in RECHNUNGEN:
+        # Kein Rechnungsname, sondern schon die erste Eingabe
+        args.eingabe = [args.rechnung] + [pfad for pfad in args.eingabe if pfad != "-"]
+        args.rechnung = None
+
+    ausgabe = None
+    fehlerhaft = 0
+    for pfad in args.eingabe:
+        try:
+            datei = sys.stdin if pfad == "-" else open(pfad, newline="", encoding="utf-8")
+        except OSError as fehler:
+            parser.error(f"{pfad}: {fehler.strerror} (keine Datei und keine Rechnung)")
+        with datei:
+            try:
+                ausgabe, _, fehler = verarbeite(datei, args.rechnung, ausgabe, args.ausgabe_format, args.sofort)
+            except ValueError as ungueltig:
+                parser.error(f"{pfad}: {ungueltig}")
+        fehlerhaft += fehler
+    sys.exit(1 if fehlerhaft else 0)
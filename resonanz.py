@@ -0,0 +1,146 @@
+"""
+Resonanzdrehzahlen von Auslass und Einlass ohne UI-Abhängigkeiten.
+
+Die *_resonanz_messwert Funktionen liefern Messwerte mit Einheit und Fehlercode (siehe ergebnisse),
+die *_resonanzdrehzahl Funktionen reine Zahlen für Massenrechnungen und berechne_* den Anzeigetext.
+
+Die Formeln stammen aus dem Buch "Zweitakt-Motoren Tuning" von Christian Rieck.
+"""
+import numpy as np
+
+import formeln
+from ergebnisse import FEHLER_NICHT_POSITIV, FEHLER_WINKEL_ZU_KLEIN, GUELTIG, Messwert, alle_skalar, formatiere_wert, positiv
+
+
+def berechne_auslass_resonanz(laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms):
+    """
+    Berechnet die Drehzahl, bei der der Auspuff in Resonanz ist, als Anzeigetext.
+
+    Formel: n = (c_s * φ) / (12 * l_r)
+
+    Args:
+        laenge_m (float): Resonanzlänge vom Auslassschlitz bis zum Ende des Gegenkonus in m.
+        oeffnungswinkel_grad (float): Gesamter Öffnungswinkel des Auslassschlitzes in °KW.
+        schallgeschwindigkeit_ms (float): Schallgeschwindigkeit im Abgas in m/s.
+
+    Returns:
+        str: Die Resonanzdrehzahl, z.B. "9722 U/min", oder eine Fehlermeldung.
+    """
+    if alle_skalar(laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms):
+        # Skalarer Pfad über formeln, ohne Messwert
+        wert, fehlercode = formeln.auslass_resonanz(
+            float(laenge_m), float(oeffnungswinkel_grad), float(schallgeschwindigkeit_ms)
+        )
+        return formatiere_wert(wert, "U/min", fehlercode)
+    return auslass_resonanz_messwert(laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms).formatiere()
+
+
+def berechne_einlass_resonanz(oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge):
+    """
+    Berechnet die Drehzahl der besten Zylinderfüllung durch die Einlass-Schwingung als Anzeigetext.
+
+    Formel: n = (1750 * φ_eff) / sqrt(V_k * l / F_m)
+
+    Args:
+        oeffnungswinkel_grad (float): Gemessener Einlass-Öffnungswinkel in °KW.
+        hubraum_ccm (float): Hubraum in cm³.
+        kurbel_faktor (float): Kurbelhausvolumen als Vielfaches des Hubraums.
+        vergaser_d_mm (float): Vergaserdurchmesser in mm.
+        ansaug_faktor (float): Faktor für die mittlere Ansaugfläche.
+        ansaug_laenge (float): Länge des Ansaugwegs in cm.
+
+    Returns:
+        str: Die Resonanzdrehzahl, z.B. "9722 U/min", oder eine Fehlermeldung.
+    """
+    eingaben = (oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge)
+    if alle_skalar(*eingaben):
+        # Skalarer Pfad über formeln, ohne Messwert
+        wert, fehlercode = formeln.einlass_resonanz(*(float(eingabe) for eingabe in eingaben))
+        return formatiere_wert(wert, "U/min", fehlercode)
+    return einlass_resonanz_messwert(*eingaben).formatiere()
+
+
+def auslass_resonanz_messwert(laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms):
+    """
+    Auslass-Resonanzdrehzahl als Messwert in U/min, für Skalare oder NumPy-Arrays.
+
+    Returns:
+        Messwert: Drehzahl je Element, Fehlercode FEHLER_NICHT_POSITIV, wenn Länge, Winkel oder
+            Schallgeschwindigkeit nicht positiv, NaN oder unendlich sind.
+    """
+    if alle_skalar(laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms):
+        wert, fehlercode = formeln.auslass_resonanz(
+            float(laenge_m), float(oeffnungswinkel_grad), float(schallgeschwindigkeit_ms)
+        )
+        return Messwert(float(wert), "U/min", fehlercode)
+    gueltig = positiv(laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms)
+    return Messwert(
+        auslass_resonanzdrehzahl(laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms),
+        "U/min",
+        np.where(gueltig, GUELTIG, FEHLER_NICHT_POSITIV),
+    )
+
+
+def einlass_resonanz_messwert(oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge):
+    """
+    Einlass-Resonanzdrehzahl als Messwert in U/min, für Skalare oder NumPy-Arrays.
+
+    Returns:
+        Messwert: Drehzahl je Element, Fehlercode FEHLER_NICHT_POSITIV bei nicht positiven,
+            NaN oder unendlichen Eingaben bzw. FEHLER_WINKEL_ZU_KLEIN, wenn der effektive Winkel <= 0 ist.
+    """
+    eingaben = (oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge)
+    if alle_skalar(*eingaben):
+        wert, fehlercode = formeln.einlass_resonanz(*(float(eingabe) for eingabe in eingaben))
+        return Messwert(float(wert), "U/min", fehlercode)
+    winkel = np.asarray(oeffnungswinkel_grad, dtype=float)
+    eingaben_positiv = positiv(
+        np.asarray(hubraum_ccm, dtype=float) * kurbel_faktor,
+        ansaug_faktor * np.asarray(vergaser_d_mm, dtype=float)**2,
+        winkel,
+        ansaug_laenge,
+    )
+    fehlercode = np.where(eingaben_positiv, np.where(winkel - 25 > 0, GUELTIG, FEHLER_WINKEL_ZU_KLEIN), FEHLER_NICHT_POSITIV)
+    drehzahl = einlass_resonanzdrehzahl(
+        oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge
+    )
+    return Messwert(drehzahl, "U/min", fehlercode)
+
+
+def auslass_resonanzdrehzahl(laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms):
+    """
+    Vektorisierte Auslass-Resonanzdrehzahl für Skalare oder NumPy-Arrays.
+
+    Gleiche Formel wie auslass_resonanz_messwert, aber als reine Zahl in U/min für Massenrechnungen.
+    Ungültige Eingaben (Länge, Öffnungswinkel oder Schallgeschwindigkeit nicht positiv) liefern NaN.
+
+    Returns:
+        float | np.ndarray: Die Resonanzdrehzahl in U/min.
+    """
+    laenge = np.asarray(laenge_m, dtype=float)
+    winkel = np.asarray(oeffnungswinkel_grad, dtype=float)
+    gueltig = positiv(laenge, winkel, schallgeschwindigkeit_ms)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drehzahl = np.where(gueltig, (schallgeschwindigkeit_ms * winkel) / (12 * laenge), np.nan)
+    return float(drehzahl) if drehzahl.ndim == 0 else drehzahl
+
+
+def einlass_resonanzdrehzahl(oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge):
+    """
+    Vektorisierte Einlass-Resonanzdrehzahl für Skalare oder NumPy-Arrays.
+
+    Gleiche Formel wie einlass_resonanz_messwert, aber als reine Zahl in U/min für Massenrechnungen.
+    Ungültige Eingaben und effektive Winkel <= 0 liefern NaN.
+
+    Returns:
+        float | np.ndarray: Die Resonanzdrehzahl in U/min.
+    """
+    kurbelhausvolumen_cm3 = np.asarray(hubraum_ccm, dtype=float) * kurbel_faktor
+    querschnitt_cm2 = ansaug_faktor * (np.asarray(vergaser_d_mm, dtype=float) / 10 / 2)**2 * np.pi
+    effektiver_winkel = np.asarray(oeffnungswinkel_grad, dtype=float) - 25
+    laenge = np.asarray(ansaug_laenge, dtype=float)
+    gueltig = (kurbelhausvolumen_cm3 > 0) & (querschnitt_cm2 > 0) & (effektiver_winkel > 0) & (laenge > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        verhaeltnis = kurbelhausvolumen_cm3 * laenge / querschnitt_cm2
+        drehzahl = np.where(gueltig, (1750 * effektiver_winkel) / np.sqrt(verhaeltnis), np.nan)
+    return float(drehzahl) if drehzahl.ndim == 0 else drehzahl
@@ -0,0 +1,225 @@
+"""
+Steuerzeiten aus gemessenen Kanalhöhen ohne UI-Abhängigkeiten.
+
+Aus dem Abstand Zylinderoberkante bis Kanaloberkante werden für alle Kanäle
+Öffnungs- und Schließwinkel, Steuerdauer und Vorauslass in einem Durchgang über
+hub_zu_kurbelwinkel_beide berechnet. Alle Höhen dürfen Arrays sein (z.B. ein ganzes
+Regal voller Zylinder), Hub und Pleuellänge broadcasten mit.
+
+Aufruf als CSV-Stapelverarbeitung:
+    python steuerzeiten.py zylinder.csv -o steuerzeiten.csv
+"""
+import argparse
+import csv
+import math
+import sys
+
+import numpy as np
+
+from fehlercodes import FEHLERMELDUNGEN, GUELTIG
+from formeln import KANAELE
+from kinematik import hub_zu_kurbelwinkel_beide, kurbelwinkel_messwert
+from resonanz import auslass_resonanz_messwert, einlass_resonanz_messwert
+
+# Optionale CSV-Spalten für die Resonanzdrehzahlen
+AUSLASS_RESONANZ_SPALTEN = ("resonanzlaenge_m", "schall_ms")
+EINLASS_RESONANZ_SPALTEN = ("hubraum_ccm", "kurbel_faktor", "vergaser_d_mm", "ansaug_faktor", "ansaug_laenge_cm")
+
+
+def berechne_steuerzeiten(kanal_hoehen_mm, hub_mm, pleuelstange_mm, einlass_kolbenweg_mm=None, ot_abstand_mm=0.0):
+    """
+    Berechnet die Steuerzeiten aller Kanäle in einem vektorisierten Durchgang.
+
+    Auslass, Überströmer und Boost-Kanal öffnen beim Abwärtshub, wenn der Kolbenboden die
+    Kanaloberkante freigibt, und schließen symmetrisch zum UT. Der kolbengesteuerte Einlass
+    öffnet vor OT, wenn das Kolbenhemd die Kanalunterkante freigibt, und schließt symmetrisch
+    nach OT.
+
+    Args:
+        kanal_hoehen_mm (dict): Kanalname -> Abstand Zylinderoberkante bis Kanaloberkante in mm
+            (float oder np.ndarray). Der Auslass muss unter dem Schlüssel "auslass" stehen,
+            damit der Vorauslass berechnet werden kann.
+        hub_mm (float | np.ndarray): Der Gesamthub des Motors in mm.
+        pleuelstange_mm (float | np.ndarray): Die Länge der Pleuelstange in mm.
+        einlass_kolbenweg_mm (float | np.ndarray): Kolbenweg vor OT in mm, bei dem der Einlass
+            öffnet. None, wenn der Motor keinen kolbengesteuerten Einlass hat.
+        ot_abstand_mm (float | np.ndarray): Abstand Zylinderoberkante bis Kolbenboden im OT in mm.
+
+    Returns:
+        dict: Kanalname -> dict mit "oeffnet_grad", "schliesst_grad" und "dauer_grad" in °KW nach OT.
+            Jeder Kanal außer dem Einlass erhält zusätzlich "vorauslass_grad": beim Auslass der
+            Abstand zum zuerst öffnenden Spülkanal, bei den Spülkanälen der Abstand zum Auslass.
+    """
+    namen = list(kanal_hoehen_mm)
+    ergebnis = {}
+
+    if namen:
+        hoehen = np.stack(np.broadcast_arrays(*(np.asarray(kanal_hoehen_mm[name], dtype=float) for name in namen)))
+        # Hub und Pleuel bekommen eine führende Achse, damit sie über alle Kanäle broadcasten
+        kolbenweg = hoehen - np.asarray(ot_abstand_mm, dtype=float)
+        oeffnet, schliesst = hub_zu_kurbelwinkel_beide(
+            kolbenweg, np.asarray(pleuelstange_mm, dtype=float)[np.newaxis], np.asarray(hub_mm, dtype=float)[np.newaxis]
+        )
+        dauer = schliesst - oeffnet
+        for i, name in enumerate(namen):
+            ergebnis[name] = {
+                "oeffnet_grad": _skalar_oder_array(oeffnet[i]),
+                "schliesst_grad": _skalar_oder_array(schliesst[i]),
+                "dauer_grad": _skalar_oder_array(dauer[i]),
+            }
+
+        if "auslass" in ergebnis:
+            auslass_oeffnet = oeffnet[namen.index("auslass")]
+            spuelkanaele = [i for i, name in enumerate(namen) if name != "auslass"]
+            for i in spuelkanaele:
+                ergebnis[namen[i]]["vorauslass_grad"] = _skalar_oder_array(oeffnet[i] - auslass_oeffnet)
+            if spuelkanaele:
+                # fmin ignoriert fehlende (NaN) Kanäle einzelner Zylinder
+                erster_spuelkanal = np.fmin.reduce(oeffnet[spuelkanaele], axis=0)
+                ergebnis["auslass"]["vorauslass_grad"] = _skalar_oder_array(erster_spuelkanal - auslass_oeffnet)
+
+    if einlass_kolbenweg_mm is not None:
+        nach_ot, vor_ot = hub_zu_kurbelwinkel_beide(einlass_kolbenweg_mm, pleuelstange_mm, hub_mm)
+        ergebnis["einlass"] = {
+            "oeffnet_grad": vor_ot,
+            "schliesst_grad": nach_ot,
+            "dauer_grad": 2 * nach_ot,
+        }
+    return ergebnis
+
+
+def _skalar_oder_array(wert):
+    """Gibt 0-dimensionale Arrays als float zurück."""
+    return float(wert) if np.ndim(wert) == 0 else wert
+
+
+def steuerzeiten_csv(eingabe, ausgabe):
+    """
+    Berechnet die Steuerzeiten für alle Zylinder einer CSV-Datei in einem Durchgang.
+
+    Pflichtspalten sind hub_mm, pleuel_mm und auslass_mm. Optional sind name, ot_abstand_mm,
+    ueberstroemer_mm, boost_mm und einlass_mm (Kolbenweg vor OT). Leere Zellen bedeuten
+    "Kanal nicht vorhanden". Sind zusätzlich resonanzlaenge_m und schall_ms bzw. die
+    Einlass-Spalten (hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge_cm)
+    vorhanden, werden die ermittelten Steuerdauern direkt in die Resonanzdrehzahlen eingesetzt.
+
+    Zylinder mit nicht lesbaren Zellen, leerem hub_mm oder pleuel_mm, ungültiger Geometrie (Pleuel
+    kürzer als der Kurbelradius, Werte <= 0) oder einem Kanal außerhalb des Hubs (z.B. Kanaloberkante
+    über dem Kolbenboden im OT) erhalten leere Ergebniszellen und eine Meldung in der Spalte "fehler";
+    die übrigen Zeilen werden normal berechnet.
+
+    Args:
+        eingabe: Textdatei-Objekt mit der Eingabe-CSV.
+        ausgabe: Textdatei-Objekt für die Ergebnis-CSV.
+
+    Returns:
+        int: Anzahl der verarbeiteten Zylinder.
+    """
+    zeilen = list(csv.DictReader(eingabe))
+    if not zeilen:
+        return 0
+
+    # Erste Meldung je Zeile; Lesefehler einer Zelle betreffen nur ihre Zeile
+    fehler = [""] * len(zeilen)
+
+    def spalte(name, pflicht=False):
+        werte = np.full(len(zeilen), np.nan)
+        for i, zeile in enumerate(zeilen):
+            try:
+                werte[i] = _zahl(zeile.get(name))
+            except ValueError:
+                fehler[i] = fehler[i] or f"Ungültiger Wert in {name}: {zeile.get(name)!r}"
+            else:
+                if pflicht and math.isnan(werte[i]):
+                    fehler[i] = fehler[i] or f"Fehlender Wert: {name}"
+        return werte
+
+    kanaele = [kanal for kanal in KANAELE if f"{kanal}_mm" in zeilen[0]]
+    hoehen = {kanal: spalte(f"{kanal}_mm") for kanal in kanaele}
+    ot_abstand = spalte("ot_abstand_mm") if "ot_abstand_mm" in zeilen[0] else 0.0
+    ot_abstand = np.nan_to_num(ot_abstand)
+    einlass = spalte("einlass_mm") if "einlass_mm" in zeilen[0] else None
+    hub, pleuel = spalte("hub_mm", pflicht=True), spalte("pleuel_mm", pflicht=True)
+    resonanz_spalten = {
+        name: spalte(name) for name in AUSLASS_RESONANZ_SPALTEN + EINLASS_RESONANZ_SPALTEN if name in zeilen[0]
+    }
+
+    # Fehlercode je Zylinder: der erste ungültige Kanal zählt, fehlende Kanäle (NaN) werden übergangen
+    fehlercode = np.full(len(zeilen), GUELTIG)
+    kolbenwege = [hoehen[kanal] - ot_abstand for kanal in kanaele] + ([einlass] if einlass is not None else [])
+    for kolbenweg in kolbenwege:
+        code = np.where(np.isnan(kolbenweg), GUELTIG, kurbelwinkel_messwert(kolbenweg, pleuel, hub).fehlercode)
+        fehlercode = np.where(fehlercode == GUELTIG, code, fehlercode)
+    for i, code in enumerate(fehlercode.tolist()):
+        fehler[i] = fehler[i] or FEHLERMELDUNGEN[code]
+    gueltig = np.array([not meldung for meldung in fehler], dtype=bool)
+
+    # Ungültige Zylinder mit einer gültigen Ersatzgeometrie rechnen, ihre Werte werden nicht geschrieben
+    ergebnis = berechne_steuerzeiten(
+        hoehen, np.where(gueltig, hub, 1.0), np.where(gueltig, pleuel, 1.0), einlass, ot_abstand
+    )
+
+    felder = ["name"]
+    for kanal in ergebnis:
+        felder += [f"{kanal}_{wert}" for wert in ergebnis[kanal]]
+    mit_auslass_resonanz = "auslass" in ergebnis and all(s in zeilen[0] for s in AUSLASS_RESONANZ_SPALTEN)
+    mit_einlass_resonanz = "einlass" in ergebnis and all(s in zeilen[0] for s in EINLASS_RESONANZ_SPALTEN)
+    if mit_auslass_resonanz:
+        felder.append("auslass_resonanz")
+    if mit_einlass_resonanz:
+        felder.append("einlass_resonanz")
+    felder.append("fehler")
+
+    # Resonanzdrehzahlen für alle Zylinder auf einmal; Zeilen mit fehlenden Werten bleiben leer
+    resonanzen = {}
+    if mit_auslass_resonanz:
+        werte = [resonanz_spalten["resonanzlaenge_m"], ergebnis["auslass"]["dauer_grad"], resonanz_spalten["schall_ms"]]
+        resonanzen["auslass_resonanz"] = (auslass_resonanz_messwert(*werte).formatiere(), _vollstaendig(werte))
+    if mit_einlass_resonanz:
+        werte = [ergebnis["einlass"]["dauer_grad"]] + [resonanz_spalten[s] for s in EINLASS_RESONANZ_SPALTEN]
+        resonanzen["einlass_resonanz"] = (einlass_resonanz_messwert(*werte).formatiere(), _vollstaendig(werte))
+
+    schreiber = csv.DictWriter(ausgabe, fieldnames=felder)
+    schreiber.writeheader()
+    for i, zeile in enumerate(zeilen):
+        aus = {"name": zeile.get("name", i + 1)}
+        if not gueltig[i]:
+            aus["fehler"] = fehler[i]
+            schreiber.writerow(aus)
+            continue
+        for kanal, werte in ergebnis.items():
+            for wert_name, wert in werte.items():
+                aus[f"{kanal}_{wert_name}"] = _formatiere(wert[i])
+        for feld, (texte, vollstaendig) in resonanzen.items():
+            if vollstaendig[i]:
+                aus[feld] = texte[i]
+        schreiber.writerow(aus)
+    return len(zeilen)
+
+
+def _vollstaendig(spalten):
+    """True für jede Zeile, in der keine der Spalten NaN ist."""
+    return ~np.isnan(np.broadcast_arrays(*spalten)).any(axis=0)
+
+
+def _zahl(text):
+    """Liest eine Zahl aus einer CSV-Zelle, leere Zellen werden zu NaN."""
+    if text is None or str(text).strip() == "":
+        return math.nan
+    return float(str(text).replace(",", "."))
+
+
+def _formatiere(wert):
+    return "" if math.isnan(wert) else f"{wert:.2f}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Steuerzeiten für eine CSV-Datei voller Zylinder berechnen.")
+    parser.add_argument("eingabe", help="Eingabe-CSV (- für stdin)")
+    parser.add_argument("-o", "--ausgabe", default="-", help="Ausgabe-CSV (Standard: stdout)")
+    args = parser.parse_args()
+
+    eingabe = sys.stdin if args.eingabe == "-" else open(args.eingabe, newline="", encoding="utf-8")
+    ausgabe = sys.stdout if args.ausgabe == "-" else open(args.ausgabe, "w", newline="", encoding="utf-8")
+    with eingabe, ausgabe:
+        steuerzeiten_csv(eingabe, ausgabe)
@@ -0,0 +1,260 @@
+"""
+Monte-Carlo-Toleranzanalyse für Kurbelwinkel und Resonanzdrehzahlen.
+
+Gemessene Eingaben haben Toleranzen (Gradscheibe etwa ±1°, Längen etwa ±2 mm). Für jede
+Eingabe wird eine Verteilung angegeben, daraus werden paketweise Stichproben gezogen und
+vektorisiert durch die Formel geschickt. Von jedem Paket bleiben nur additive Kennzahlen übrig:
+Histogramm mit festen Klassen, verschobene Potenzsummen für Mittelwert und Streuung sowie die
+Kreuzsummen für die Korrelation jeder Eingabe mit dem Ergebnis. Der Speicherbedarf hängt daher
+nur von der Paketgröße ab, nicht von der Anzahl der Stichproben. Große Läufe werden paketweise
+auf einen Prozesspool verteilt; jedes Paket hat einen eigenen Zufallsstrom, das Ergebnis hängt
+also nicht von der Anzahl der Prozesse ab.
+
+Verteilungen:
+    0.85                                              fester Wert
+    {"verteilung": "normal", "mittel": 0.85, "streuung": 0.001}
+    {"verteilung": "gleich", "von": 0.848, "bis": 0.852}
+    {"verteilung": "dreieck", "von": 189, "spitze": 190, "bis": 191}
+
+Aufruf:
+    python toleranzanalyse.py auslass -p laenge_m=normal:0.85:0.001 -p oeffnungswinkel_grad=gleich:189:191 \\
+        -p schallgeschwindigkeit_ms=500 -n 10000000
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from kinematik import kurbelwinkel_messwert
+from resonanz import auslass_resonanzdrehzahl, einlass_resonanzdrehzahl
+
+PERZENTILE = (0.1, 1, 5, 25, 50, 75, 95, 99, 99.9)
+
+
+def _kurbelwinkel(kolbenweg_mm, pleuelstange_mm, hub_mm):
+    # Ungültige Geometrien als NaN statt ValueError
+    return kurbelwinkel_messwert(kolbenweg_mm, pleuelstange_mm, hub_mm).wert
+
+
+# Formelname -> (Funktion, Parameter in Aufrufreihenfolge, Einheit des Ergebnisses)
+FORMELN = {
+    "kurbelwinkel": (_kurbelwinkel, ("kolbenweg_mm", "pleuelstange_mm", "hub_mm"), "°"),
+    "auslass": (auslass_resonanzdrehzahl, ("laenge_m", "oeffnungswinkel_grad", "schallgeschwindigkeit_ms"), "U/min"),
+    "einlass": (einlass_resonanzdrehzahl, ("oeffnungswinkel_grad", "hubraum_ccm", "kurbel_faktor",
+                                           "vergaser_d_mm", "ansaug_faktor", "ansaug_laenge"), "U/min"),
+}
+
+
+def _ziehe(zufall, verteilung, anzahl):
+    """Zieht anzahl Werte aus einer Verteilungsangabe (siehe Modulbeschreibung)."""
+    if isinstance(verteilung, (int, float)):
+        return np.full(anzahl, float(verteilung))
+    art = verteilung.get("verteilung")
+    if art == "normal":
+        return zufall.normal(verteilung["mittel"], verteilung["streuung"], anzahl)
+    if art == "gleich":
+        return zufall.uniform(verteilung["von"], verteilung["bis"], anzahl)
+    if art == "dreieck":
+        return zufall.triangular(verteilung["von"], verteilung["spitze"], verteilung["bis"], anzahl)
+    raise ValueError(f"Unbekannte Verteilung: {art}")
+
+
+def _pruefe(formel, verteilungen):
+    if formel not in FORMELN:
+        raise ValueError(f"Unbekannte Formel: {formel}")
+    _, parameter, _ = FORMELN[formel]
+    fehlend = [name for name in parameter if name not in verteilungen]
+    if fehlend:
+        raise ValueError(f"Für '{formel}' fehlen Verteilungen für: {', '.join(fehlend)}")
+    return parameter
+
+
+def _stichprobe(formel, verteilungen, saat, anzahl):
+    """Zieht ein Paket und wertet die Formel aus; Rückgabe (Eingaben (P, anzahl), Ergebnis (anzahl,))."""
+    funktion, parameter, _ = FORMELN[formel]
+    zufall = np.random.default_rng(saat)
+    eingaben = np.array([_ziehe(zufall, verteilungen[name], anzahl) for name in parameter])
+    return eingaben, np.asarray(funktion(*eingaben), dtype=float)
+
+
+def _kennzahlen(eingaben, ergebnis, kanten, verschiebung_x, verschiebung_y):
+    """Additive Kennzahlen eines Pakets; Summen über gültige Stichproben, um die Pilotwerte verschoben."""
+    gueltig = np.isfinite(ergebnis)
+    x = eingaben[:, gueltig] - verschiebung_x[:, np.newaxis]
+    y = ergebnis[gueltig] - verschiebung_y
+    zaehler = np.bincount(np.searchsorted(kanten, ergebnis[gueltig], side="right"), minlength=len(kanten) + 1)
+    return {
+        "anzahl": len(ergebnis),
+        "gueltig": int(gueltig.sum()),
+        "histogramm": zaehler,   # [unterlauf, Klassen..., überlauf]
+        "summe_y": y.sum(),
+        "summe_yy": (y * y).sum(),
+        "summe_x": x.sum(axis=1),
+        "summe_xx": (x * x).sum(axis=1),
+        "summe_xy": x @ y,
+    }
+
+
+def _berechne_paket(formel, verteilungen, saat, anzahl, kanten, verschiebung_x, verschiebung_y):
+    # Läuft im Arbeitsprozess
+    eingaben, ergebnis = _stichprobe(formel, verteilungen, saat, anzahl)
+    return _kennzahlen(eingaben, ergebnis, kanten, verschiebung_x, verschiebung_y)
+
+
+def _perzentile(kanten, histogramm, gesamt, werte):
+    """Perzentile aus dem Histogramm, linear innerhalb der Klasse."""
+    kumuliert = np.cumsum(histogramm)
+    ergebnis = {}
+    for p in werte:
+        ziel = p / 100 * gesamt
+        i = int(np.searchsorted(kumuliert, ziel, side="left"))
+        if i == 0:
+            ergebnis[p] = float(kanten[0])
+        elif i > len(kanten) - 1:
+            ergebnis[p] = float(kanten[-1])
+        else:
+            # Klasse i liegt zwischen kanten[i - 1] und kanten[i]
+            vorher = kumuliert[i - 1]
+            anteil = (ziel - vorher) / histogramm[i] if histogramm[i] else 0.0
+            ergebnis[p] = float(kanten[i - 1] + anteil * (kanten[i] - kanten[i - 1]))
+    return ergebnis
+
+
+def toleranzanalyse(formel, verteilungen, anzahl=1_000_000, paketgroesse=250_000, klassen=2000,
+                    prozesse=None, saat=0):
+    """
+    Pflanzt die Toleranzen der Eingaben per Monte-Carlo-Simulation in das Ergebnis fort.
+
+    Das erste Paket läuft im aktuellen Prozess und legt den Bereich des Histogramms fest
+    (Spannweite des Pakets, auf beiden Seiten um die halbe Spannweite erweitert); Werte
+    außerhalb landen in Unter- und Überlaufklassen. Die Empfindlichkeit jeder Eingabe ist die
+    Korrelation mit dem Ergebnis; ihr Quadrat ist der Anteil der Ergebnisstreuung, den die
+    Eingabe bei linearer Näherung allein erklärt.
+
+    Args:
+        formel (str): "kurbelwinkel", "auslass" oder "einlass", siehe FORMELN.
+        verteilungen (dict): Parametername -> Verteilungsangabe (siehe Modulbeschreibung).
+        anzahl (int): Anzahl der Stichproben.
+        paketgroesse (int): Stichproben pro Paket, bestimmt den Speicherbedarf.
+        klassen (int): Anzahl der Histogrammklassen.
+        prozesse (int): Anzahl der Arbeitsprozesse, None für alle Kerne, 1 für keinen Pool.
+        saat (int): Startwert des Zufallsgenerators.
+
+    Returns:
+        dict: "anzahl", "gueltig", "einheit", "mittel", "streuung", "perzentile" (Perzent -> Wert),
+            "histogramm" (Klassengrenzen, Anzahl je Klasse) und "empfindlichkeit" (Liste von dicts
+            mit "parameter", "korrelation", "varianzanteil" und "steigung", größter Anteil zuerst).
+    """
+    for name, wert in (("anzahl", anzahl), ("paketgroesse", paketgroesse), ("klassen", klassen)):
+        if wert <= 0:
+            raise ValueError(f"{name} muss größer als 0 sein, nicht {wert}.")
+    parameter = _pruefe(formel, verteilungen)
+    _, _, einheit = FORMELN[formel]
+    groessen = [min(paketgroesse, anzahl - start) for start in range(0, anzahl, paketgroesse)]
+    saaten = np.random.SeedSequence(saat).spawn(len(groessen))
+
+    # Pilotpaket: Histogrammbereich und Verschiebungen für numerisch stabile Summen
+    eingaben, ergebnis = _stichprobe(formel, verteilungen, saaten[0], groessen[0])
+    gueltig = ergebnis[np.isfinite(ergebnis)]
+    if len(gueltig) == 0:
+        raise ValueError("Keine gültigen Ergebnisse im ersten Paket, bitte die Verteilungen prüfen.")
+    unten, oben = float(gueltig.min()), float(gueltig.max())
+    rand = 0.5 * (oben - unten) or max(abs(oben) * 1e-9, 1e-12)
+    kanten = np.linspace(unten - rand, oben + rand, klassen + 1)
+    verschiebung_x = eingaben.mean(axis=1)
+    verschiebung_y = float(gueltig.mean())
+    summen = _kennzahlen(eingaben, ergebnis, kanten, verschiebung_x, verschiebung_y)
+    del eingaben, ergebnis, gueltig
+
+    def addiere(teil):
+        for name, wert in teil.items():
+            summen[name] = summen[name] + wert
+
+    argumente = (kanten, verschiebung_x, verschiebung_y)
+    prozesse = prozesse or os.cpu_count() or 1
+    if prozesse == 1 or len(groessen) <= 2:
+        for s, n in zip(saaten[1:], groessen[1:]):
+            addiere(_berechne_paket(formel, verteilungen, s, n, *argumente))
+    else:
+        with ProcessPoolExecutor(max_workers=prozesse) as pool:
+            unterwegs = []
+            for s, n in zip(saaten[1:], groessen[1:]):
+                unterwegs.append(pool.submit(_berechne_paket, formel, verteilungen, s, n, *argumente))
+                if len(unterwegs) >= 2 * prozesse:
+                    addiere(unterwegs.pop(0).result())
+            for auftrag in unterwegs:
+                addiere(auftrag.result())
+
+    n = summen["gueltig"]
+    mittel_y = summen["summe_y"] / n
+    var_y = summen["summe_yy"] / n - mittel_y**2
+    mittel_x = summen["summe_x"] / n
+    var_x = summen["summe_xx"] / n - mittel_x**2
+    kov = summen["summe_xy"] / n - mittel_x * mittel_y
+    with np.errstate(divide="ignore", invalid="ignore"):
+        korrelation = np.where(var_x > 0, kov / np.sqrt(var_x * var_y), 0.0)
+        steigung = np.where(var_x > 0, kov / var_x, 0.0)
+    empfindlichkeit = sorted(
+        ({"parameter": name, "korrelation": float(k), "varianzanteil": float(k * k), "steigung": float(b)}
+         for name, k, b in zip(parameter, korrelation, steigung)),
+        key=lambda eintrag: -eintrag["varianzanteil"],
+    )
+
+    histogramm = summen["histogramm"]
+    return {
+        "anzahl": summen["anzahl"],
+        "gueltig": n,
+        "einheit": einheit,
+        "mittel": float(mittel_y + verschiebung_y),
+        "streuung": float(np.sqrt(max(var_y, 0.0) * n / max(n - 1, 1))),
+        "perzentile": _perzentile(kanten, histogramm, n, PERZENTILE),
+        "histogramm": (kanten, histogramm[1:-1]),
+        "empfindlichkeit": empfindlichkeit,
+    }
+
+
+def _lies_verteilung(text):
+    """Liest "name=wert", "name=normal:mittel:streuung", "name=gleich:von:bis" oder "name=dreieck:von:spitze:bis"."""
+    name, _, angabe = text.partition("=")
+    teile = angabe.split(":")
+    if len(teile) == 1:
+        return name, float(teile[0])
+    art, zahlen = teile[0], [float(teil) for teil in teile[1:]]
+    schluessel = {"normal": ("mittel", "streuung"), "gleich": ("von", "bis"), "dreieck": ("von", "spitze", "bis")}
+    if art not in schluessel or len(zahlen) != len(schluessel[art]):
+        raise argparse.ArgumentTypeError(f"Ungültige Verteilung: {angabe}")
+    return name, {"verteilung": art, **dict(zip(schluessel[art], zahlen))}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monte-Carlo-Toleranzanalyse der Zweitakt-Formeln.")
+    parser.add_argument("formel", choices=sorted(FORMELN))
+    parser.add_argument("-p", "--parameter", action="append", default=[], type=_lies_verteilung,
+                        help="name=wert, name=normal:mittel:streuung, name=gleich:von:bis oder name=dreieck:von:spitze:bis")
+    parser.add_argument("-n", "--anzahl", type=int, default=1_000_000)
+    parser.add_argument("-j", "--prozesse", type=int, default=None, help="Anzahl Arbeitsprozesse")
+    parser.add_argument("--paketgroesse", type=int, default=250_000)
+    parser.add_argument("--saat", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Ergebnis als JSON ausgeben")
+    args = parser.parse_args()
+
+    ergebnis = toleranzanalyse(args.formel, dict(args.parameter), args.anzahl, args.paketgroesse,
+                               prozesse=args.prozesse, saat=args.saat)
+    if args.json:
+        kanten, zaehler = ergebnis["histogramm"]
+        ergebnis["histogramm"] = {"kanten": kanten.tolist(), "anzahl": zaehler.tolist()}
+        json.dump(ergebnis, sys.stdout, ensure_ascii=False, indent=1)
+        sys.stdout.write("\n")
+    else:
+        einheit = ergebnis["einheit"]
+        print(f"{ergebnis['gueltig']} von {ergebnis['anzahl']} Stichproben gültig")
+        print(f"Mittelwert {ergebnis['mittel']:.2f} {einheit}, Streuung {ergebnis['streuung']:.2f} {einheit}")
+        for p, wert in ergebnis["perzentile"].items():
+            print(f"  P{p:<5g} {wert:10.2f} {einheit}")
+        print("Empfindlichkeit (Anteil an der Streuung):")
+        for eintrag in ergebnis["empfindlichkeit"]:
+            print(f"  {eintrag['parameter']:<26} {eintrag['varianzanteil']:6.1%}  "
+                  f"(Korrelation {eintrag['korrelation']:+.3f}, Steigung {eintrag['steigung']:+.4g})")
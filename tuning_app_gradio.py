@@ -1,116 +1,156 @@
 import gradio as gr
 import matplotlib.pyplot as plt
 import numpy as np
-import math
+import json
+import tempfile
+import threading
+
+import abgastemperatur
+import auslegung
+import motorspeicher
+import steuerzeiten
+import zeitquerschnitt
+from gradscheibe import rendere_gradscheibe
+from gradscheiben_export import exportiere_gradscheiben
+from kinematik import berechne_kolbenweg, berechne_kurbelwinkel
+from resonanz import berechne_auslass_resonanz, berechne_einlass_resonanz
 
 # ==============================================================================
 # 1. BERECHNUNGSLOGIK (unverändert)
 # ==============================================================================
-def kurbelwinkel_zu_hub_exakt(kurbelwinkel_grad, pleuelstange_mm, hub_mm):
-    if hub_mm <= 0 or pleuelstange_mm <= 0:
-        return 0.0
-    radius_mm = hub_mm / 2.0
-    if pleuelstange_mm < radius_mm:
-        raise ValueError("Pleuellänge muss größer als der Kurbelradius sein.")
-    kurbelwinkel_rad = math.radians(kurbelwinkel_grad)
-    l_r_verhaeltnis = pleuelstange_mm / radius_mm
-    
-    innerhalb_der_wurzel_wert = l_r_verhaeltnis**2 - math.sin(kurbelwinkel_rad)**2
-    if innerhalb_der_wurzel_wert < 0:
-        innerhalb_der_wurzel_wert = 0
-
-    kolbenweg_s = radius_mm * (
-        1 + l_r_verhaeltnis - math.cos(kurbelwinkel_rad) - math.sqrt(innerhalb_der_wurzel_wert)
+# Kurbeltrieb-Kinematik siehe Modul kinematik, Resonanzdrehzahlen siehe Modul resonanz.
+# Die Module liefern Zahlen bzw. Messwerte; die Texte für die Anzeige entstehen erst hier.
+
+def kurbelwinkel_text(kolbenweg_mm, pleuelstange_mm, hub_mm):
+    return berechne_kurbelwinkel(kolbenweg_mm, pleuelstange_mm, hub_mm, ".2f")
+
+def kolbenweg_text(kurbelwinkel_grad, pleuelstange_mm, hub_mm):
+    return berechne_kolbenweg(kurbelwinkel_grad, pleuelstange_mm, hub_mm, ".3f")
+
+def schall_aus_abgastemperatur(laenge_m, egt_auslass_c, egt_grenz_c, abklinglaenge_m):
+    x_m = np.linspace(0.0, laenge_m, 201)
+    profil_k = abgastemperatur.temperaturprofil_abklingend(x_m, egt_auslass_c + 273.15, egt_grenz_c + 273.15, abklinglaenge_m)
+    return round(abgastemperatur.effektive_schallgeschwindigkeit(laenge_m, x_m, profil_k))
+
+def auslass_auslegung_text(ziel_drehzahl, oeffnungswinkel_grad, schallgeschwindigkeit_ms):
+    laenge = auslegung.auslass_resonanzlaenge(ziel_drehzahl, oeffnungswinkel_grad, schallgeschwindigkeit_ms)
+    return f"{laenge:.3f} m"
+
+def einlass_auslegung_text(ziel_drehzahl, oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge):
+    laenge = auslegung.einlass_ansauglaenge(ziel_drehzahl, oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor)
+    vergaser = auslegung.einlass_vergaserdurchmesser(ziel_drehzahl, oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, ansaug_faktor, ansaug_laenge)
+    return f"{laenge:.1f} cm", f"{vergaser:.1f} mm"
+
+def steuerzeiten_tabelle(hub_mm, pleuelstange_mm, auslass_mm, ueberstroemer_mm, boost_mm, einlass_kolbenweg_mm):
+    kanal_hoehen = {"auslass": auslass_mm, "ueberstroemer": ueberstroemer_mm}
+    if boost_mm > 0:
+        kanal_hoehen["boost"] = boost_mm
+    zeiten = steuerzeiten.berechne_steuerzeiten(
+        kanal_hoehen, hub_mm, pleuelstange_mm, einlass_kolbenweg_mm if einlass_kolbenweg_mm > 0 else None
     )
-    return kolbenweg_s
-
-def hub_zu_kurbelwinkel(kolbenweg_mm, pleuelstange_mm, hub_mm, toleranz=0.0001):
-    if hub_mm <= 0 or pleuelstange_mm <= 0 or kolbenweg_mm < 0:
-        return 0.0
-    if kolbenweg_mm > hub_mm:
-        return 180.0
-        
-    winkel_unten = 0.0
-    winkel_oben = 180.0
-    
-    for _ in range(100):
-        test_winkel = (winkel_unten + winkel_oben) / 2
-        berechneter_hub = kurbelwinkel_zu_hub_exakt(test_winkel, pleuelstange_mm, hub_mm)
-        
-        if abs(berechneter_hub - kolbenweg_mm) < toleranz:
-            return test_winkel
-        
-        if berechneter_hub > kolbenweg_mm:
-            winkel_oben = test_winkel
-        else:
-            winkel_unten = test_winkel
-            
-    return (winkel_unten + winkel_oben) / 2
-
-def berechne_auslass_resonanz(laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms):
-    if laenge_m <= 0 or oeffnungswinkel_grad <= 0:
-        return "Eingabewerte müssen positiv sein."
-    # Formel n = (c_s * φ) / (12 * l_r)
-    drehzahl = (schallgeschwindigkeit_ms * oeffnungswinkel_grad) / (12 * laenge_m)
-    return f"{drehzahl:.0f} U/min"
-
-def berechne_einlass_resonanz(oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge):
-    kurbelhausvolumen_cm3 = hubraum_ccm*kurbel_faktor
-    querschnitt_cm2 = ansaug_faktor*(vergaser_d_mm/10/2)**2*math.pi
-    if kurbelhausvolumen_cm3 <= 0 or querschnitt_cm2 <= 0 or oeffnungswinkel_grad <=0:
-        return "Eingabewerte müssen positiv sein."
-    # Formel n = (1750 * φ) / sqrt(V_k / F_m)
-    # Hinweis aus dem Buch: Der effektive Winkel ist ca. 25-30° kleiner als der gemessene.
-    effektiver_winkel = oeffnungswinkel_grad - 25 
-    if effektiver_winkel <= 0:
-        return "Effektiver Winkel zu klein. Bitte größeren Öffnungswinkel angeben."
-    
-    verhaeltnis = kurbelhausvolumen_cm3 * ansaug_laenge / querschnitt_cm2
-    drehzahl = (1750 * effektiver_winkel) / math.sqrt(verhaeltnis)
-    return f"{drehzahl:.0f} U/min"
+    tabelle = [
+        [kanal, round(werte["oeffnet_grad"], 1), round(werte["schliesst_grad"], 1), round(werte["dauer_grad"], 1),
+         round(werte["vorauslass_grad"], 1) if "vorauslass_grad" in werte else None]
+        for kanal, werte in zeiten.items()
+    ]
+    # Steuerdauern auf den Bereich der Schieberegler begrenzt direkt in die Resonanzrechner übernehmen
+    auslass_dauer = min(max(zeiten["auslass"]["dauer_grad"], 100), 200)
+    einlass_dauer = min(max(zeiten["einlass"]["dauer_grad"], 100), 180) if "einlass" in zeiten else gr.update()
+    return tabelle, auslass_dauer, einlass_dauer
 
-# ==============================================================================
-# 2. PLOT-FUNKTION FÜR DIE GRADSCHEIBE
-# ==============================================================================
+def steuerzeiten_datei(csv_pfad):
+    with open(csv_pfad, newline="", encoding="utf-8") as eingabe, \
+            tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="", encoding="utf-8") as ausgabe:
+        steuerzeiten.steuerzeiten_csv(eingabe, ausgabe)
+    return ausgabe.name
 
-def plotte_gradscheibe(zuendwinkel):
-    fig, ax = plt.subplots(figsize=(10, 10), subplot_kw={'projection': 'polar'})
-    
-    ax.set_theta_zero_location('N')
-    ax.set_theta_direction(-1)
-    ax.set_yticklabels([])
-    ax.set_rgrids([])
-    ax.spines['polar'].set_visible(False)
-    ax.set_ylim(0, 1.2)
-
-    for grad in range(0, 360):
-        winkel_rad = np.deg2rad(grad)
-        if grad % 10 == 0:
-            ax.plot([winkel_rad, winkel_rad], [0.9, 1.0], color='black', linewidth=1.5)
-            ax.text(winkel_rad, 1.05, str(grad), ha='center', va='center', fontsize=12, weight='bold')
-        elif grad % 5 == 0:
-            ax.plot([winkel_rad, winkel_rad], [0.95, 1.0], color='black', linewidth=1)
-        else:
-            ax.plot([winkel_rad, winkel_rad], [0.98, 1.0], color='gray', linewidth=0.5)
-
-    if zuendwinkel is not None and 0 < zuendwinkel < 360:
-        zuendwinkel_rad = np.deg2rad(zuendwinkel)
-        ax.plot([zuendwinkel_rad, zuendwinkel_rad], [0.85, 1.0], color='red', linewidth=2.5, zorder=10)
-        ax.text(zuendwinkel_rad, 0.8, f'Zündung\n({zuendwinkel:.1f}°)', ha='center', va='center', fontsize=14, weight='bold', color='red', rotation=-zuendwinkel)
-
-    ax.text(0, 0, 'Gradscheibe\nOT bei 0°', ha='center', va='center', fontsize=16, weight='bold')
-    ax.annotate('Motordrehrichtung',
-                xy=np.deg2rad([300, 1]),
-                xytext=np.deg2rad([300, 0.6]),
-                #xycoords='polar', textcoords='polar',
-                arrowprops=dict(arrowstyle="<-", color="blue", linewidth=2, connectionstyle="arc3,rad=0.2"),
-                ha='center', va='center', fontsize=12, color='blue')
-    
-    return fig
+def gradscheiben_datei(json_pfad):
+    with open(json_pfad, encoding="utf-8") as datei:
+        scheiben = json.load(datei)
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as ausgabe:
+        pass
+    exportiere_gradscheiben(scheiben, ausgabe.name)
+    return ausgabe.name
+
+# Motor-Ablage, gemeinsam für alle Sitzungen; die Datenbank wird erst beim ersten Zugriff geöffnet
+# (bzw. angelegt), nicht schon beim Import, z.B. durch die Benchmarks
+_motor_speicher = None
+_motor_speicher_sperre = threading.Lock()
+
+def motor_speicher():
+    global _motor_speicher
+    with _motor_speicher_sperre:
+        if _motor_speicher is None:
+            _motor_speicher = motorspeicher.Motorspeicher()
+        return _motor_speicher
+
+# Felder, die beim Speichern aus den Eingaben gelesen werden (Reihenfolge der inputs in der Oberfläche)
+MOTOR_FELDER = (
+    "resonanzlaenge_m", "schall_ms", "hubraum_ccm", "kurbel_faktor", "vergaser_d_mm", "ansaug_faktor", "ansaug_laenge_cm",
+    "hub_mm", "pleuel_mm", "zuendung_mm", "auslass_mm", "ueberstroemer_mm", "boost_mm", "einlass_mm",
+)
+
+def modelle_auswahl():
+    return gr.update(choices=["Alle"] + motor_speicher().modelle())
+
+def motor_namen(modell):
+    namen = [motor["name"] for motor in motor_speicher().suche(None if modell in (None, "Alle") else modell)]
+    return gr.update(choices=namen, value=namen[0] if namen else None)
+
+def motor_laden_werte(name):
+    """Eingaben und gespeicherte Ergebnisse eines Motors für die Oberfläche, ohne etwas zu berechnen."""
+    motor = motor_speicher().lade(name)
+    if motor is None:
+        raise gr.Error(f"Motor nicht gefunden: {name}")
+    ergebnisse = motor["ergebnisse"]
+    zeiten = ergebnisse.get("steuerzeiten") or {}
+    werte = dict(motor["eingaben"])
+    werte["auslass_winkel"] = min(max(zeiten["auslass"]["dauer_grad"], 100), 200) if "auslass" in zeiten else None
+    werte["einlass_winkel"] = min(max(zeiten["einlass"]["dauer_grad"], 100), 180) if "einlass" in zeiten else None
+    werte["steuerzeiten_tabelle"] = [
+        [kanal, round(z["oeffnet_grad"], 1), round(z["schliesst_grad"], 1), round(z["dauer_grad"], 1),
+         round(z["vorauslass_grad"], 1) if "vorauslass_grad" in z else None]
+        for kanal, z in zeiten.items()
+    ] or None
+    for gruppe in ("auslass_resonanz", "einlass_resonanz"):
+        werte[gruppe] = ergebnisse[gruppe]["text"] if ergebnisse.get(gruppe) else None
+    werte["zuendwinkel"] = next(
+        (m["winkel"] for m in (ergebnisse.get("gradscheibe") or {}).get("markierungen", []) if m["text"] == "Zündung"), None
+    )
+    werte.update(name=motor["name"], modell=motor["modell"], ergebnisse=ergebnisse)
+    return werte
+
+def motor_speichern(name, modell, *eingaben):
+    if not name or not name.strip():
+        raise gr.Error("Bitte einen Namen angeben.")
+    # Felder, die es in dieser Oberfläche nicht gibt (z.B. ot_abstand_mm), und ein leeres Modell behält speichere bei
+    motor_speicher().speichere(name.strip(), dict(zip(MOTOR_FELDER, eingaben)), (modell or "").strip() or None)
+    return f"{name.strip()} gespeichert.", modelle_auswahl()
 
+def motoren_importieren(pfad):
+    with open(pfad, newline="", encoding="utf-8") as datei:
+        statistik = motor_speicher().importiere(datei, "json" if pfad.endswith(".json") else "csv")
+    return f"{statistik['motoren']} Motoren importiert.", modelle_auswahl()
+
+def motoren_exportieren():
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="", encoding="utf-8") as ausgabe:
+        motor_speicher().exportiere(ausgabe, "csv")
+    return ausgabe.name
+
+def plotte_zeitquerschnitt(hub_mm, pleuelstange_mm, hubraum_ccm, kante_mm, breite_mm, hoehe_mm, eckradius_mm, anzahl, drehzahl_min, drehzahl_max):
+    drehzahlen = np.arange(drehzahl_min, drehzahl_max + 1, 100)
+    werte = zeitquerschnitt.spezifischer_zeitquerschnitt(
+        drehzahlen, hubraum_ccm, hub_mm, pleuelstange_mm, kante_mm, breite_mm, hoehe_mm, eckradius_mm, int(anzahl)
+    )
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.plot(drehzahlen, werte)
+    ax.set_xlabel("Drehzahl (U/min)")
+    ax.set_ylabel("Zeitquerschnitt (s/m)")
+    ax.grid(True)
+    return fig
 
 # ==============================================================================
-# 3. GRADIO APP INTERFACE
+# 2. GRADIO APP INTERFACE
 # ==============================================================================
 with gr.Blocks(theme=gr.themes.Soft(), title="Zweitakt-Tuner") as app:
     gr.Markdown("# Zweitakt-Tuner")
@@ -123,15 +163,27 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Zweitakt-Tuner") as app:
                 with gr.Column(scale=2):
                     auslass_laenge = gr.Slider(0.5, 1.5, label="Resonanzlänge (m)", info="Länge vom Auslassschlitz bis zum Ende des Gegenkonus.", value=0.85)
                     auslass_winkel = gr.Slider(100, 200, label="Auslass-Öffnungswinkel (°KW)", info="Gesamter Öffnungswinkel des Auslassschlitzes.", value=140)
-                    schall_ms = gr.Slider(450, 550, label="Schallgeschwindigkeit im Abgas (m/s)", info="Normalerweise ca. 500 m/s.", value=500)
+                    schall_ms = gr.Slider(330, 600, label="Schallgeschwindigkeit im Abgas (m/s)", info="Normalerweise ca. 500 m/s.", value=500)
+                    with gr.Accordion("Schallgeschwindigkeit aus Abgastemperatur", open=False):
+                        egt_auslass = gr.Slider(200, 1000, label="Abgastemperatur am Auslass (°C)", value=650)
+                        egt_grenz = gr.Slider(0, 800, label="Abgastemperatur weit stromab (°C)", value=300)
+                        egt_abklinglaenge = gr.Slider(0.1, 3.0, label="Abklinglänge (m)", info="Strecke, nach der der Temperaturunterschied auf etwa ein Drittel gefallen ist.", value=0.8)
+                        egt_btn = gr.Button("Schallgeschwindigkeit übernehmen")
                 with gr.Column(scale=1):
                     gr.Markdown("### Ergebnis")
                     auslass_drehzahl_output = gr.Textbox(label="Resonanzdrehzahl", interactive=False)
+                    gr.Markdown("### Auslegung")
+                    auslass_ziel = gr.Number(label="Zieldrehzahl (U/min)", value=9000)
+                    auslass_laenge_output = gr.Textbox(label="Benötigte Resonanzlänge", interactive=False)
             
             auslass_inputs = [auslass_laenge, auslass_winkel, schall_ms]
             for component in auslass_inputs:
                 component.change(berechne_auslass_resonanz, inputs=auslass_inputs, outputs=auslass_drehzahl_output)
             app.load(berechne_auslass_resonanz, inputs=auslass_inputs, outputs=auslass_drehzahl_output)
+            egt_btn.click(schall_aus_abgastemperatur, inputs=[auslass_laenge, egt_auslass, egt_grenz, egt_abklinglaenge], outputs=schall_ms)
+            auslass_auslegung_inputs = [auslass_ziel, auslass_winkel, schall_ms]
+            for component in auslass_auslegung_inputs:
+                component.change(auslass_auslegung_text, inputs=auslass_auslegung_inputs, outputs=auslass_laenge_output)
 
         with gr.TabItem("Resonanzdrehzahl Einlass"):
             gr.Markdown("### Berechnet die Drehzahl der besten Zylinderfüllung durch die Einlass-Schwingung.")
@@ -146,11 +198,18 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Zweitakt-Tuner") as app:
                 with gr.Column(scale=1):
                     gr.Markdown("### Ergebnis")
                     einlass_drehzahl_output = gr.Textbox(label="Resonanzdrehzahl", interactive=False)
+                    gr.Markdown("### Auslegung")
+                    einlass_ziel = gr.Number(label="Zieldrehzahl (U/min)", value=7000)
+                    ansauglaenge_output = gr.Textbox(label="Benötigte Ansauglänge (beim eingestellten Vergaser)", interactive=False)
+                    vergaser_output = gr.Textbox(label="Benötigter Vergaser (bei der eingestellten Ansauglänge)", interactive=False)
 
             einlass_inputs = [einlass_winkel, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge]
             for component in einlass_inputs:
                 component.change(berechne_einlass_resonanz, inputs=einlass_inputs, outputs=einlass_drehzahl_output)
             app.load(berechne_einlass_resonanz, inputs=einlass_inputs, outputs=einlass_drehzahl_output)
+            einlass_auslegung_inputs = [einlass_ziel, einlass_winkel, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge]
+            for component in einlass_auslegung_inputs:
+                component.change(einlass_auslegung_text, inputs=einlass_auslegung_inputs, outputs=[ansauglaenge_output, vergaser_output])
 
         with gr.TabItem("Werkzeuge"):
             with gr.Row():
@@ -161,21 +220,121 @@ with gr.Blocks(theme=gr.themes.Soft(), title="Zweitakt-Tuner") as app:
                     kolbenweg_input = gr.Number(label="Kolbenweg vor OT (mm)", value=2.0)
                     berechnen_btn1 = gr.Button("Winkel berechnen", variant="primary")
                     winkel_output = gr.Textbox(label="Benötigter Kurbelwinkel (° vor OT)", interactive=False)
-                    berechnen_btn1.click(hub_zu_kurbelwinkel, inputs=[kolbenweg_input, pleuel_input1, hub_input1], outputs=winkel_output)
+                    berechnen_btn1.click(kurbelwinkel_text, inputs=[kolbenweg_input, pleuel_input1, hub_input1], outputs=winkel_output)
                 with gr.Column():
                     gr.Markdown("#### Winkel → Hub")
                     hub_input2 = gr.Number(label="Hub (mm)", value=44.0)
                     pleuel_input2 = gr.Number(label="Pleuellänge (mm)", value=95.0)
                     winkel_input2 = gr.Slider(0, 180, label="Kurbelwinkel nach OT (°)", value=90)
                     hub_output = gr.Textbox(label="Kolbenweg vom OT (mm)", interactive=False)
-                    winkel_input2.change(kurbelwinkel_zu_hub_exakt, inputs=[winkel_input2, pleuel_input2, hub_input2], outputs=hub_output)
+                    winkel_input2.change(kolbenweg_text, inputs=[winkel_input2, pleuel_input2, hub_input2], outputs=hub_output)
             
+            gr.Markdown("--- \n ### Steuerzeiten aus Kanalhöhen")
+            with gr.Row():
+                with gr.Column():
+                    hub_input3 = gr.Number(label="Hub (mm)", value=44.0)
+                    pleuel_input3 = gr.Number(label="Pleuellänge (mm)", value=95.0)
+                    auslass_hoehe = gr.Number(label="Zylinderoberkante bis Auslass (mm)", value=23.0)
+                    ueberstroemer_hoehe = gr.Number(label="Zylinderoberkante bis Überströmer (mm)", value=28.5)
+                    boost_hoehe = gr.Number(label="Zylinderoberkante bis Boost-Kanal (mm)", info="0 = kein Boost-Kanal", value=0.0)
+                    einlass_kolbenweg = gr.Number(label="Kolbenweg vor OT beim Öffnen des Einlasses (mm)", info="0 = kein kolbengesteuerter Einlass", value=0.0)
+                    berechnen_btn3 = gr.Button("Steuerzeiten berechnen und übernehmen", variant="primary")
+                with gr.Column():
+                    steuerzeiten_output = gr.Dataframe(headers=["Kanal", "Öffnet (°n.OT)", "Schließt (°n.OT)", "Dauer (°KW)", "Vorauslass (°KW)"], interactive=False)
+                    zylinder_csv = gr.File(label="Zylinder-CSV (Stapelverarbeitung)", file_types=[".csv"], type="filepath")
+                    steuerzeiten_csv_output = gr.File(label="Steuerzeiten (CSV)")
+                berechnen_btn3.click(
+                    steuerzeiten_tabelle,
+                    inputs=[hub_input3, pleuel_input3, auslass_hoehe, ueberstroemer_hoehe, boost_hoehe, einlass_kolbenweg],
+                    outputs=[steuerzeiten_output, auslass_winkel, einlass_winkel],
+                )
+                zylinder_csv.upload(steuerzeiten_datei, inputs=zylinder_csv, outputs=steuerzeiten_csv_output)
+
+            gr.Markdown("--- \n ### Spezifischer Zeitquerschnitt")
+            with gr.Row():
+                with gr.Column():
+                    hub_input4 = gr.Number(label="Hub (mm)", value=44.0)
+                    pleuel_input4 = gr.Number(label="Pleuellänge (mm)", value=95.0)
+                    hubraum_input4 = gr.Number(label="Hubraum (cm³)", value=50)
+                    kante_input = gr.Number(label="Zylinderoberkante bis Kanaloberkante (mm)", value=23.0)
+                    breite_input = gr.Number(label="Kanalbreite (mm)", value=26.0)
+                    hoehe_input = gr.Number(label="Kanalhöhe (mm)", value=18.0)
+                    eckradius_input = gr.Number(label="Eckradius (mm)", value=4.0)
+                    anzahl_input = gr.Number(label="Anzahl gleicher Kanäle", value=1, precision=0)
+                    drehzahl_min = gr.Number(label="Drehzahl von (U/min)", value=4000)
+                    drehzahl_max = gr.Number(label="Drehzahl bis (U/min)", value=12000)
+                    berechnen_btn4 = gr.Button("Zeitquerschnitt berechnen", variant="primary")
+                zeitquerschnitt_output = gr.Plot(label="Zeitquerschnitt")
+                berechnen_btn4.click(
+                    plotte_zeitquerschnitt,
+                    inputs=[hub_input4, pleuel_input4, hubraum_input4, kante_input, breite_input, hoehe_input, eckradius_input, anzahl_input, drehzahl_min, drehzahl_max],
+                    outputs=zeitquerschnitt_output,
+                )
+
             gr.Markdown("--- \n ### Druckbare Gradscheibe")
             with gr.Row():
                 winkel_fuer_scheibe = gr.Number(label="Zündwinkel hervorheben (°)", value=21.86)
-                plot_output = gr.Plot(label="Gradscheibe")
-            winkel_fuer_scheibe.change(plotte_gradscheibe, inputs=winkel_fuer_scheibe, outputs=plot_output)
-            app.load(plotte_gradscheibe, inputs=winkel_fuer_scheibe, outputs=plot_output)
+                plot_output = gr.Image(label="Gradscheibe", type="numpy")
+            winkel_fuer_scheibe.change(rendere_gradscheibe, inputs=winkel_fuer_scheibe, outputs=plot_output)
+            app.load(rendere_gradscheibe, inputs=winkel_fuer_scheibe, outputs=plot_output)
+            with gr.Row():
+                scheiben_json = gr.File(label="Stapelexport: Scheiben-Liste (JSON)", file_types=[".json"], type="filepath")
+                gradscheiben_pdf = gr.File(label="Gradscheiben (PDF, maßstabsgetreu)")
+            scheiben_json.upload(gradscheiben_datei, inputs=scheiben_json, outputs=gradscheiben_pdf)
+
+        with gr.TabItem("Motoren"):
+            gr.Markdown("### Gespeicherte Motoren")
+            with gr.Row():
+                with gr.Column():
+                    modell_filter = gr.Dropdown(["Alle"], value="Alle", label="Modell")
+                    motor_auswahl = gr.Dropdown([], label="Motor")
+                    laden_btn = gr.Button("Motor laden", variant="primary")
+                    motor_ergebnisse = gr.JSON(label="Gespeicherte Ergebnisse")
+                with gr.Column():
+                    motor_name = gr.Textbox(label="Name")
+                    motor_modell = gr.Textbox(label="Modell")
+                    speichern_btn = gr.Button("Aktuelle Eingaben speichern")
+                    motor_status = gr.Textbox(label="Status", interactive=False)
+                    motoren_import = gr.File(label="Import: Motoren (CSV oder JSON)", file_types=[".csv", ".json"], type="filepath")
+                    export_btn = gr.Button("Alle Motoren exportieren (CSV)")
+                    motoren_export = gr.File(label="Motoren (CSV)")
+
+            # Beim Laden bekommt jede Komponente den gespeicherten Wert; fehlende Werte bleiben unverändert
+            motor_komponenten = {
+                "resonanzlaenge_m": [auslass_laenge], "schall_ms": [schall_ms], "auslass_winkel": [auslass_winkel],
+                "einlass_winkel": [einlass_winkel], "hubraum_ccm": [hubraum_ccm, hubraum_input4], "kurbel_faktor": [kurbel_faktor],
+                "vergaser_d_mm": [vergaser_d_mm], "ansaug_faktor": [ansaug_faktor], "ansaug_laenge_cm": [ansaug_laenge],
+                "hub_mm": [hub_input1, hub_input2, hub_input3, hub_input4],
+                "pleuel_mm": [pleuel_input1, pleuel_input2, pleuel_input3, pleuel_input4],
+                "zuendung_mm": [kolbenweg_input], "auslass_mm": [auslass_hoehe], "ueberstroemer_mm": [ueberstroemer_hoehe],
+                "boost_mm": [boost_hoehe], "einlass_mm": [einlass_kolbenweg], "steuerzeiten_tabelle": [steuerzeiten_output],
+                "auslass_resonanz": [auslass_drehzahl_output], "einlass_resonanz": [einlass_drehzahl_output],
+                "zuendwinkel": [winkel_fuer_scheibe], "name": [motor_name], "modell": [motor_modell],
+                "ergebnisse": [motor_ergebnisse],
+            }
+
+            def motor_laden(name):
+                werte = motor_laden_werte(name)
+                return {
+                    komponente: gr.update() if werte[feld] is None else werte[feld]
+                    for feld, komponenten in motor_komponenten.items() for komponente in komponenten
+                }
+
+            modell_filter.change(motor_namen, inputs=modell_filter, outputs=motor_auswahl)
+            app.load(modelle_auswahl, outputs=modell_filter)
+            app.load(motor_namen, inputs=modell_filter, outputs=motor_auswahl)
+            laden_btn.click(motor_laden, inputs=motor_auswahl,
+                            outputs=[k for komponenten in motor_komponenten.values() for k in komponenten])
+            speichern_btn.click(
+                motor_speichern,
+                inputs=[motor_name, motor_modell, auslass_laenge, schall_ms, hubraum_ccm, kurbel_faktor, vergaser_d_mm,
+                        ansaug_faktor, ansaug_laenge, hub_input3, pleuel_input3, kolbenweg_input, auslass_hoehe,
+                        ueberstroemer_hoehe, boost_hoehe, einlass_kolbenweg],
+                outputs=[motor_status, modell_filter],
+            )
+            motoren_import.upload(motoren_importieren, inputs=motoren_import, outputs=[motor_status, modell_filter])
+            export_btn.click(motoren_exportieren, outputs=motoren_export)
 
-# App starten und einen öffentlichen Link erstellen
-app.launch(share=True)
\ No newline at end of file
+# App starten und einen öffentlichen Link erstellen (nicht beim Import, z.B. durch die Benchmarks)
+if __name__ == "__main__":
+    app.launch(share=True)
\ No newline at end of file
@@ -1,118 +1,100 @@
 import streamlit as st
-import matplotlib.pyplot as plt
 import numpy as np
-import math
+import io
+import json
+import os
+import tempfile
+import threading
+from collections import Counter
+
+import abgastemperatur
+import auslegung
+import motorspeicher
+import steuerzeiten
+import zeitquerschnitt
+from gradscheibe import gradscheibe_png
+from gradscheiben_export import exportiere_gradscheiben
+from kinematik import kolbenweg_messwert, kurbelwinkel_messwert
+from resonanz import auslass_resonanz_messwert, einlass_resonanz_messwert
+from steuerzeiten import berechne_steuerzeiten
 
 # ==============================================================================
 # 1. BERECHNUNGSLOGIK (unverändert)
 # ==============================================================================
-@st.cache_data
-def kurbelwinkel_zu_hub_exakt(kurbelwinkel_grad, pleuelstange_mm, hub_mm):
-    if hub_mm <= 0 or pleuelstange_mm <= 0:
-        return 0.0
-    radius_mm = hub_mm / 2.0
-    if pleuelstange_mm < radius_mm:
-        raise ValueError("Pleuellänge muss größer als der Kurbelradius sein.")
-    kurbelwinkel_rad = math.radians(kurbelwinkel_grad)
-    l_r_verhaeltnis = pleuelstange_mm / radius_mm
-    
-    innerhalb_der_wurzel_wert = l_r_verhaeltnis**2 - math.sin(kurbelwinkel_rad)**2
-    if innerhalb_der_wurzel_wert < 0:
-        innerhalb_der_wurzel_wert = 0
+# Kinematik und Resonanzdrehzahlen liegen UI-frei in den Modulen kinematik und resonanz.
+# Die Funktionen liefern Messwerte (Zahl, Einheit, Fehlercode); formatiert wird erst in der Oberfläche.
+# Die Formeln brauchen Mikrosekunden und laufen ungecacht: Argumente hashen und Ergebnisse
+# pickeln wäre teurer als die Rechnung. Zwischengespeichert wird nur, was an der Grenze zur
+# Oberfläche teuer ist (Bilder, Dateien), begrenzt in Anzahl und Lebensdauer.
+CACHE_TTL_S = 3600
+CACHE_MAX_EINTRAEGE = {"gradscheibe_png": 64, "steuerzeiten_csv": 8}
 
-    kolbenweg_s = radius_mm * (
-        1 + l_r_verhaeltnis - math.cos(kurbelwinkel_rad) - math.sqrt(innerhalb_der_wurzel_wert)
-    )
-    return kolbenweg_s
-
-@st.cache_data
-def hub_zu_kurbelwinkel(kolbenweg_mm, pleuelstange_mm, hub_mm, toleranz=0.0001):
-    if hub_mm <= 0 or pleuelstange_mm <= 0 or kolbenweg_mm < 0:
-        return 0.0
-    if kolbenweg_mm > hub_mm:
-        return 180.0
-        
-    winkel_unten = 0.0
-    winkel_oben = 180.0
-    
-    for _ in range(100):
-        test_winkel = (winkel_unten + winkel_oben) / 2
-        berechneter_hub = kurbelwinkel_zu_hub_exakt(test_winkel, pleuelstange_mm, hub_mm)
-        
-        if abs(berechneter_hub - kolbenweg_mm) < toleranz:
-            return test_winkel
-        
-        if berechneter_hub > kolbenweg_mm:
-            winkel_oben = test_winkel
-        else:
-            winkel_unten = test_winkel
-            
-    return (winkel_unten + winkel_oben) / 2
-
-@st.cache_data
-def berechne_auslass_resonanz(laenge_m, oeffnungswinkel_grad, schallgeschwindigkeit_ms):
-    if laenge_m <= 0 or oeffnungswinkel_grad <= 0:
-        return "Eingabewerte müssen positiv sein."
-    # Formel n = (c_s * φ) / (12 * l_r)
-    drehzahl = (schallgeschwindigkeit_ms * oeffnungswinkel_grad) / (12 * laenge_m)
-    return f"{drehzahl:.0f} U/min"
-
-@st.cache_data
-def berechne_einlass_resonanz(oeffnungswinkel_grad, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor, ansaug_laenge):
-    kurbelhausvolumen_cm3 = hubraum_ccm*kurbel_faktor
-    querschnitt_cm2 = ansaug_faktor*(vergaser_d_mm/10/2)**2*math.pi
-    if kurbelhausvolumen_cm3 <= 0 or querschnitt_cm2 <= 0 or oeffnungswinkel_grad <=0:
-        return "Eingabewerte müssen positiv sein."
-    # Formel n = (1750 * φ) / sqrt(V_k / F_m)
-    # Hinweis aus dem Buch: Der effektive Winkel ist ca. 25-30° kleiner als der gemessene.
-    effektiver_winkel = oeffnungswinkel_grad - 25 
-    if effektiver_winkel <= 0:
-        return "Effektiver Winkel zu klein. Bitte größeren Öffnungswinkel angeben."
-    
-    verhaeltnis = kurbelhausvolumen_cm3 * ansaug_laenge / querschnitt_cm2
-    drehzahl = (1750 * effektiver_winkel) / math.sqrt(verhaeltnis)
-    return f"{drehzahl:.0f} U/min"
+@st.cache_resource
+def motor_speicher():
+    # Eine gemeinsame Motor-Ablage für alle Sitzungen; motoren.sqlite entsteht erst beim ersten Zugriff
+    return motorspeicher.Motorspeicher()
 
-# ==============================================================================
-# 2. PLOT-FUNKTION FÜR DIE GRADSCHEIBE
-# ==============================================================================
-@st.cache_data
-def plotte_gradscheibe(zuendwinkel):
-    fig, ax = plt.subplots(figsize=(10, 10), subplot_kw={'projection': 'polar'})
-    
-    ax.set_theta_zero_location('N')
-    ax.set_theta_direction(-1)
-    ax.set_yticklabels([])
-    ax.set_rgrids([])
-    ax.spines['polar'].set_visible(False)
-    ax.set_ylim(0, 1.2)
-
-    for grad in range(0, 360):
-        winkel_rad = np.deg2rad(grad)
-        if grad % 10 == 0:
-            ax.plot([winkel_rad, winkel_rad], [0.9, 1.0], color='black', linewidth=1.5)
-            ax.text(winkel_rad, 1.05, str(grad), ha='center', va='center', fontsize=12, weight='bold')
-        elif grad % 5 == 0:
-            ax.plot([winkel_rad, winkel_rad], [0.95, 1.0], color='black', linewidth=1)
-        else:
-            ax.plot([winkel_rad, winkel_rad], [0.98, 1.0], color='gray', linewidth=0.5)
-
-    if zuendwinkel is not None and 0 < zuendwinkel < 360:
-        zuendwinkel_rad = np.deg2rad(zuendwinkel)
-        ax.plot([zuendwinkel_rad, zuendwinkel_rad], [0.85, 1.0], color='red', linewidth=2.5, zorder=10)
-        ax.text(zuendwinkel_rad, 0.8, f'Zündung\n({zuendwinkel:.1f}°)', ha='center', va='center', fontsize=14, weight='bold', color='red', rotation=-zuendwinkel)
-
-    ax.text(0, 0, 'Gradscheibe\nOT bei 0°', ha='center', va='center', fontsize=16, weight='bold')
-    ax.annotate('Motordrehrichtung',
-                xy=np.deg2rad([300, 1]),
-                xytext=np.deg2rad([300, 0.6]),
-                arrowprops=dict(arrowstyle="<-", color="blue", linewidth=2, connectionstyle="arc3,rad=0.2"),
-                ha='center', va='center', fontsize=12, color='blue')
-    
-    return fig
+
+@st.cache_resource
+def _cache_zaehler():
+    # Über alle Sitzungen und Reruns hinweg: Aufrufe und tatsächliche Berechnungen je Funktion
+    return {"sperre": threading.Lock(), "aufrufe": Counter(), "berechnet": Counter()}
+
+
+def _zaehle(art, name):
+    zaehler = _cache_zaehler()
+    with zaehler["sperre"]:
+        zaehler[art][name] += 1
+
+
+@st.cache_data(max_entries=CACHE_MAX_EINTRAEGE["gradscheibe_png"], ttl=CACHE_TTL_S, show_spinner=False)
+def _gradscheibe_png(zuendwinkel):
+    _zaehle("berechnet", "gradscheibe_png")
+    return gradscheibe_png(zuendwinkel)
+
+
+@st.cache_data(max_entries=CACHE_MAX_EINTRAEGE["steuerzeiten_csv"], ttl=CACHE_TTL_S, show_spinner=False)
+def _steuerzeiten_csv(inhalt):
+    _zaehle("berechnet", "steuerzeiten_csv")
+    ausgabe = io.StringIO()
+    anzahl = steuerzeiten.steuerzeiten_csv(io.StringIO(inhalt.decode("utf-8")), ausgabe)
+    return anzahl, ausgabe.getvalue()
+
+
+def gradscheibe_bild(zuendwinkel):
+    """Gradscheibe als PNG-Bytes; gleiche Winkel kommen aus dem Zwischenspeicher."""
+    _zaehle("aufrufe", "gradscheibe_png")
+    return _gradscheibe_png(round(float(zuendwinkel), 2))
+
+
+def steuerzeiten_csv_ergebnis(inhalt):
+    """(Anzahl Zylinder, Ergebnis-CSV) für eine hochgeladene Datei; bei jedem Rerun ohne neue Rechnung."""
+    _zaehle("aufrufe", "steuerzeiten_csv")
+    return _steuerzeiten_csv(inhalt)
+
+
+def cache_statistik():
+    """
+    Trefferquote und Belegung der Zwischenspeicher.
+
+    Die Belegung ist eine obere Schranke: per TTL abgelaufene Einträge werden nicht abgezogen.
+    """
+    zaehler = _cache_zaehler()
+    with zaehler["sperre"]:
+        statistik = []
+        for name, max_eintraege in CACHE_MAX_EINTRAEGE.items():
+            aufrufe, berechnet = zaehler["aufrufe"][name], zaehler["berechnet"][name]
+            statistik.append({
+                "Zwischenspeicher": name,
+                "Aufrufe": aufrufe,
+                "Treffer": aufrufe - berechnet,
+                "Trefferquote": f"{(aufrufe - berechnet) / aufrufe:.0%}" if aufrufe else "-",
+                "Einträge": f"{min(berechnet, max_eintraege)} / {max_eintraege}",
+            })
+    return statistik
 
 # ==============================================================================
-# 3. STREAMLIT APP INTERFACE
+# 2. STREAMLIT APP INTERFACE
 # ==============================================================================
 
 # Seitenkonfiguration
@@ -134,6 +116,43 @@ tab_selection = st.sidebar.radio(
     ["Resonanzdrehzahl Auslass", "Resonanzdrehzahl Einlass", "Werkzeuge"]
 )
 
+# Gespeicherte Motoren: Laden übernimmt Eingaben und fertige Ergebnisse aus der Ablage, ohne neu zu rechnen
+st.sidebar.markdown("---")
+st.sidebar.subheader("Gespeicherte Motoren")
+modell_filter = st.sidebar.selectbox("Modell", ["Alle"] + motor_speicher().modelle())
+motor_namen = [motor["name"] for motor in motor_speicher().suche(None if modell_filter == "Alle" else modell_filter)]
+motor_auswahl = st.sidebar.selectbox("Motor", motor_namen)
+if st.sidebar.button("Motor laden", disabled=not motor_namen):
+    st.session_state.motor_geladen = motor_speicher().lade(motor_auswahl)
+    st.session_state.motor_aktuell = {}
+    zeiten_geladen = st.session_state.motor_geladen["ergebnisse"].get("steuerzeiten") or {}
+    if "auslass" in zeiten_geladen:
+        st.session_state.auslass_winkel_uebernommen = int(round(min(max(zeiten_geladen["auslass"]["dauer_grad"], 100), 200)))
+    if "einlass" in zeiten_geladen:
+        st.session_state.einlass_winkel_uebernommen = int(round(min(max(zeiten_geladen["einlass"]["dauer_grad"], 100), 180)))
+
+geladen = st.session_state.get("motor_geladen") or {"name": "", "modell": "", "eingaben": {}, "ergebnisse": {}}
+# Eingaben dieser Sitzung, die beim Speichern über die des geladenen Motors geschrieben werden
+aktuell = st.session_state.setdefault("motor_aktuell", {})
+if geladen["name"]:
+    st.sidebar.caption(f"Geladen: {geladen['name']} ({geladen['modell'] or 'ohne Modell'})")
+    for gruppe, titel in (("auslass_resonanz", "Resonanz Auslass"), ("einlass_resonanz", "Resonanz Einlass")):
+        if geladen["ergebnisse"].get(gruppe):
+            st.sidebar.markdown(f"**{titel}:** {geladen['ergebnisse'][gruppe]['text']}")
+motor_speichern_bereich = st.sidebar.container()
+
+
+def vorgabe(feld, standard, minimum=None, maximum=None):
+    """Eingabe des geladenen Motors im Typ des Standardwerts (auf den Reglerbereich begrenzt), sonst der Standardwert."""
+    wert = geladen["eingaben"].get(feld)
+    if wert is None:
+        return standard
+    if minimum is not None:
+        wert = max(wert, minimum)
+    if maximum is not None:
+        wert = min(wert, maximum)
+    return type(standard)(round(wert) if isinstance(standard, int) else wert)
+
 # ==============================================================================
 # TAB 1: RESONANZDREHZAHL AUSLASS
 # ==============================================================================
@@ -149,7 +168,7 @@ if tab_selection == "Resonanzdrehzahl Auslass":
             "Resonanzlänge (m)", 
             min_value=0.5, 
             max_value=1.5, 
-            value=0.85, 
+            value=vorgabe("resonanzlaenge_m", 0.85, 0.5, 1.5), 
             step=0.01,
             help="Länge vom Auslassschlitz bis zum Ende des Gegenkonus."
         )
@@ -157,21 +176,47 @@ if tab_selection == "Resonanzdrehzahl Auslass":
             "Auslass-Öffnungswinkel (°KW)", 
             min_value=100, 
             max_value=200, 
-            value=140,
+            value=st.session_state.get("auslass_winkel_uebernommen", 140),
             help="Gesamter Öffnungswinkel des Auslassschlitzes."
         )
-        schall_ms = st.slider(
-            "Schallgeschwindigkeit im Abgas (m/s)", 
-            min_value=330, 
-            max_value=600, 
-            value=500,
-            help="Normalerweise ca. 500 m/s."
+        schall_quelle = st.radio(
+            "Schallgeschwindigkeit", ["Fester Wert", "Aus Abgastemperatur"], horizontal=True
         )
+        if schall_quelle == "Fester Wert":
+            schall_ms = st.slider(
+                "Schallgeschwindigkeit im Abgas (m/s)", 
+                min_value=330, 
+                max_value=600, 
+                value=vorgabe("schall_ms", 500, 330, 600),
+                help="Normalerweise ca. 500 m/s."
+            )
+        else:
+            egt_auslass = st.slider("Abgastemperatur am Auslass (°C)", min_value=200, max_value=1000, value=650)
+            egt_grenz = st.slider("Abgastemperatur weit stromab (°C)", min_value=0, max_value=800, value=300)
+            egt_abklinglaenge = st.slider(
+                "Abklinglänge (m)", min_value=0.1, max_value=3.0, value=0.8, step=0.05,
+                help="Strecke, nach der der Temperaturunterschied auf etwa ein Drittel gefallen ist."
+            )
+            x_m = np.linspace(0.0, auslass_laenge, 201)
+            profil_k = abgastemperatur.temperaturprofil_abklingend(
+                x_m, egt_auslass + 273.15, egt_grenz + 273.15, egt_abklinglaenge
+            )
+            schall_ms = abgastemperatur.effektive_schallgeschwindigkeit(auslass_laenge, x_m, profil_k)
+            st.caption(f"Effektive Schallgeschwindigkeit über die Resonanzlänge: {schall_ms:.0f} m/s")
+        aktuell.update(resonanzlaenge_m=auslass_laenge, schall_ms=float(schall_ms))
     
     with col2:
         st.subheader("Ergebnis")
-        auslass_result = berechne_auslass_resonanz(auslass_laenge, auslass_winkel, schall_ms)
-        st.success(f"**Resonanzdrehzahl:** {auslass_result}")
+        auslass_result = auslass_resonanz_messwert(auslass_laenge, auslass_winkel, schall_ms)
+        if auslass_result.gueltig:
+            st.success(f"**Resonanzdrehzahl:** {auslass_result.formatiere()}")
+        else:
+            st.error(auslass_result.fehler)
+        
+        st.subheader("Auslegung")
+        auslass_ziel = st.number_input("Zieldrehzahl (U/min)", min_value=1000, value=9000, step=100, key="auslass_ziel")
+        benoetigte_laenge = auslegung.auslass_resonanzlaenge(auslass_ziel, auslass_winkel, schall_ms)
+        st.info(f"**Benötigte Resonanzlänge:** {benoetigte_laenge:.3f} m")
 
 # ==============================================================================
 # TAB 2: RESONANZDREHZAHL EINLASS
@@ -188,50 +233,68 @@ elif tab_selection == "Resonanzdrehzahl Einlass":
             "Einlass-Öffnungswinkel (°KW)", 
             min_value=100, 
             max_value=180, 
-            value=130,
+            value=st.session_state.get("einlass_winkel_uebernommen", 130),
             help="Gemessener Wert. Das Skript zieht intern 25° für den Anschwingvorgang ab."
         )
         hubraum_ccm = st.number_input(
             "Hubraum (cm³)", 
             min_value=1.0, 
-            value=50.0, 
+            value=vorgabe("hubraum_ccm", 50.0, 1.0), 
             step=1.0
         )
         kurbel_faktor = st.slider(
             "Faktor Kurbelhausvolumen", 
             min_value=2.0, 
             max_value=4.0, 
-            value=3.0, 
+            value=vorgabe("kurbel_faktor", 3.0, 2.0, 4.0), 
             step=0.1
         )
         vergaser_d_mm = st.number_input(
             "Vergaserdurchmesser (mm)", 
             min_value=1.0, 
-            value=13.0, 
+            value=vorgabe("vergaser_d_mm", 13.0, 1.0), 
             step=0.1
         )
         ansaug_faktor = st.slider(
             "Faktor Ansaugfläche", 
             min_value=1.0, 
             max_value=1.3, 
-            value=1.1, 
+            value=vorgabe("ansaug_faktor", 1.1, 1.0, 1.3), 
             step=0.01
         )
         ansaug_laenge = st.slider(
             "Länge Ansaugweg (cm)", 
             min_value=1.0, 
             max_value=20.0, 
-            value=16.0, 
+            value=vorgabe("ansaug_laenge_cm", 16.0, 1.0, 20.0), 
             step=0.1
         )
+        aktuell.update(hubraum_ccm=hubraum_ccm, kurbel_faktor=kurbel_faktor, vergaser_d_mm=vergaser_d_mm,
+                       ansaug_faktor=ansaug_faktor, ansaug_laenge_cm=ansaug_laenge)
     
     with col2:
         st.subheader("Ergebnis")
-        einlass_result = berechne_einlass_resonanz(
+        einlass_result = einlass_resonanz_messwert(
             einlass_winkel, hubraum_ccm, kurbel_faktor, 
             vergaser_d_mm, ansaug_faktor, ansaug_laenge
         )
-        st.success(f"**Resonanzdrehzahl:** {einlass_result}")
+        if einlass_result.gueltig:
+            st.success(f"**Resonanzdrehzahl:** {einlass_result.formatiere()}")
+        else:
+            st.error(einlass_result.fehler)
+        
+        st.subheader("Auslegung")
+        einlass_ziel = st.number_input("Zieldrehzahl (U/min)", min_value=1000, value=7000, step=100, key="einlass_ziel")
+        benoetigte_ansauglaenge = auslegung.einlass_ansauglaenge(
+            einlass_ziel, einlass_winkel, hubraum_ccm, kurbel_faktor, vergaser_d_mm, ansaug_faktor
+        )
+        benoetigter_vergaser = auslegung.einlass_vergaserdurchmesser(
+            einlass_ziel, einlass_winkel, hubraum_ccm, kurbel_faktor, ansaug_faktor, ansaug_laenge
+        )
+        st.info(
+            f"**Benötigte Ansauglänge:** {benoetigte_ansauglaenge:.1f} cm (bei {vergaser_d_mm:.1f} mm Vergaser)  \n"
+            f"**Benötigter Vergaser:** {benoetigter_vergaser:.1f} mm (bei {ansaug_laenge:.1f} cm Ansauglänge)"
+        )
 
 # ==============================================================================
 # TAB 3: WERKZEUGE
@@ -242,7 +305,7 @@ elif tab_selection == "Werkzeuge":
     # Untertabs für Werkzeuge
     werkzeug_tab = st.selectbox(
         "Wählen Sie ein Werkzeug:",
-        ["Hub → Winkel (Zündung)", "Winkel → Hub", "Druckbare Gradscheibe"]
+        ["Hub → Winkel (Zündung)", "Winkel → Hub", "Steuerzeiten", "Zeitquerschnitt", "Druckbare Gradscheibe"]
     )
     
     # Hub zu Winkel
@@ -252,21 +315,22 @@ elif tab_selection == "Werkzeuge":
         col1, col2 = st.columns(2)
         
         with col1:
-            hub_input1 = st.number_input("Hub (mm)", min_value=1.0, value=44.0, step=0.1, key="hub1")
-            pleuel_input1 = st.number_input("Pleuellänge (mm)", min_value=1.0, value=85.0, step=0.1, key="pleuel1")
-            kolbenweg_input = st.number_input("Kolbenweg vor OT (mm)", min_value=0.0, value=2.0, step=0.1)
+            hub_input1 = st.number_input("Hub (mm)", min_value=1.0, value=vorgabe("hub_mm", 44.0, 1.0), step=0.1, key="hub1")
+            pleuel_input1 = st.number_input("Pleuellänge (mm)", min_value=1.0, value=vorgabe("pleuel_mm", 85.0, 1.0), step=0.1, key="pleuel1")
+            kolbenweg_input = st.number_input("Kolbenweg vor OT (mm)", min_value=0.0, value=vorgabe("zuendung_mm", 2.0, 0.0), step=0.1)
+            aktuell.update(hub_mm=hub_input1, pleuel_mm=pleuel_input1, zuendung_mm=kolbenweg_input)
             
             if st.button("Winkel berechnen", type="primary"):
-                try:
-                    winkel_result = hub_zu_kurbelwinkel(kolbenweg_input, pleuel_input1, hub_input1)
-                    st.session_state.winkel_result = winkel_result
-                except Exception as e:
-                    st.error(f"Fehler bei der Berechnung: {e}")
+                st.session_state.winkel_result = kurbelwinkel_messwert(kolbenweg_input, pleuel_input1, hub_input1)
         
         with col2:
             st.subheader("Ergebnis")
             if 'winkel_result' in st.session_state:
-                st.success(f"**Benötigter Kurbelwinkel:** {st.session_state.winkel_result:.2f}° vor OT")
+                winkel_result = st.session_state.winkel_result
+                if winkel_result.gueltig:
+                    st.success(f"**Benötigter Kurbelwinkel:** {winkel_result.formatiere('.2f')} vor OT")
+                else:
+                    st.error(f"Fehler bei der Berechnung: {winkel_result.fehler}")
     
     # Winkel zu Hub
     elif werkzeug_tab == "Winkel → Hub":
@@ -275,15 +339,112 @@ elif tab_selection == "Werkzeuge":
         col1, col2 = st.columns(2)
         
         with col1:
-            hub_input2 = st.number_input("Hub (mm)", min_value=1.0, value=44.0, step=0.1, key="hub2")
-            pleuel_input2 = st.number_input("Pleuellänge (mm)", min_value=1.0, value=85.0, step=0.1, key="pleuel2")
+            hub_input2 = st.number_input("Hub (mm)", min_value=1.0, value=vorgabe("hub_mm", 44.0, 1.0), step=0.1, key="hub2")
+            pleuel_input2 = st.number_input("Pleuellänge (mm)", min_value=1.0, value=vorgabe("pleuel_mm", 85.0, 1.0), step=0.1, key="pleuel2")
             winkel_input2 = st.slider("Kurbelwinkel nach OT (°)", min_value=0, max_value=180, value=90)
+            aktuell.update(hub_mm=hub_input2, pleuel_mm=pleuel_input2)
+        
+        with col2:
+            st.subheader("Ergebnis")
+            hub_result = kolbenweg_messwert(winkel_input2, pleuel_input2, hub_input2)
+            if hub_result.gueltig:
+                st.success(f"**Kolbenweg vom OT:** {hub_result.formatiere('.3f')}")
+            else:
+                st.error(f"Fehler bei der Berechnung: {hub_result.fehler}")
+    
+    # Steuerzeiten
+    elif werkzeug_tab == "Steuerzeiten":
+        st.subheader("Steuerzeiten aus Kanalhöhen")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            hub_input3 = st.number_input("Hub (mm)", min_value=1.0, value=vorgabe("hub_mm", 44.0, 1.0), step=0.1, key="hub3")
+            pleuel_input3 = st.number_input("Pleuellänge (mm)", min_value=1.0, value=vorgabe("pleuel_mm", 85.0, 1.0), step=0.1, key="pleuel3")
+            auslass_hoehe = st.number_input("Zylinderoberkante bis Auslass (mm)", min_value=0.0, value=vorgabe("auslass_mm", 23.0, 0.0), step=0.1)
+            ueberstroemer_hoehe = st.number_input("Zylinderoberkante bis Überströmer (mm)", min_value=0.0, value=vorgabe("ueberstroemer_mm", 28.5, 0.0), step=0.1)
+            boost_hoehe = st.number_input(
+                "Zylinderoberkante bis Boost-Kanal (mm)", min_value=0.0, value=vorgabe("boost_mm", 0.0, 0.0), step=0.1,
+                help="0 = kein Boost-Kanal"
+            )
+            einlass_kolbenweg = st.number_input(
+                "Kolbenweg vor OT beim Öffnen des Einlasses (mm)", min_value=0.0, value=vorgabe("einlass_mm", 0.0, 0.0), step=0.1,
+                help="0 = kein kolbengesteuerter Einlass"
+            )
+            aktuell.update(hub_mm=hub_input3, pleuel_mm=pleuel_input3, auslass_mm=auslass_hoehe, ueberstroemer_mm=ueberstroemer_hoehe,
+                           boost_mm=boost_hoehe, einlass_mm=einlass_kolbenweg)
         
         with col2:
             st.subheader("Ergebnis")
+            kanal_hoehen = {"auslass": auslass_hoehe, "ueberstroemer": ueberstroemer_hoehe}
+            if boost_hoehe > 0:
+                kanal_hoehen["boost"] = boost_hoehe
+            try:
+                zeiten = berechne_steuerzeiten(
+                    kanal_hoehen, hub_input3, pleuel_input3,
+                    einlass_kolbenweg if einlass_kolbenweg > 0 else None
+                )
+                st.table([
+                    {
+                        "Kanal": kanal,
+                        "Öffnet (°n.OT)": f"{werte['oeffnet_grad']:.1f}",
+                        "Schließt (°n.OT)": f"{werte['schliesst_grad']:.1f}",
+                        "Dauer (°KW)": f"{werte['dauer_grad']:.1f}",
+                        "Vorauslass (°KW)": f"{werte['vorauslass_grad']:.1f}" if "vorauslass_grad" in werte else "",
+                    }
+                    for kanal, werte in zeiten.items()
+                ])
+                if st.button("Steuerdauern in die Resonanzrechner übernehmen"):
+                    # Auf den Bereich der Schieberegler begrenzen
+                    st.session_state.auslass_winkel_uebernommen = int(round(min(max(zeiten["auslass"]["dauer_grad"], 100), 200)))
+                    if "einlass" in zeiten:
+                        st.session_state.einlass_winkel_uebernommen = int(round(min(max(zeiten["einlass"]["dauer_grad"], 100), 180)))
+                    st.success("Steuerdauern übernommen.")
+            except Exception as e:
+                st.error(f"Fehler bei der Berechnung: {e}")
+        
+        st.markdown("#### Stapelverarbeitung")
+        zylinder_csv = st.file_uploader(
+            "Zylinder-CSV", type="csv",
+            help="Spalten: name, hub_mm, pleuel_mm, auslass_mm, ueberstroemer_mm, boost_mm, einlass_mm"
+        )
+        if zylinder_csv is not None:
             try:
-                hub_result = kurbelwinkel_zu_hub_exakt(winkel_input2, pleuel_input2, hub_input2)
-                st.success(f"**Kolbenweg vom OT:** {hub_result:.3f} mm")
+                anzahl, ergebnis_csv = steuerzeiten_csv_ergebnis(zylinder_csv.getvalue())
+                st.success(f"{anzahl} Zylinder berechnet.")
+                st.download_button("Steuerzeiten herunterladen", ergebnis_csv, file_name="steuerzeiten.csv", mime="text/csv")
+            except Exception as e:
+                st.error(f"Fehler bei der Berechnung: {e}")
+    
+    # Zeitquerschnitt
+    elif werkzeug_tab == "Zeitquerschnitt":
+        st.subheader("Spezifischer Zeitquerschnitt")
+        
+        col1, col2 = st.columns([1, 2])
+        
+        with col1:
+            hub_input4 = st.number_input("Hub (mm)", min_value=1.0, value=vorgabe("hub_mm", 44.0, 1.0), step=0.1, key="hub4")
+            pleuel_input4 = st.number_input("Pleuellänge (mm)", min_value=1.0, value=vorgabe("pleuel_mm", 85.0, 1.0), step=0.1, key="pleuel4")
+            hubraum_input4 = st.number_input("Hubraum (cm³)", min_value=1.0, value=vorgabe("hubraum_ccm", 50.0, 1.0), step=1.0, key="hubraum4")
+            kante_input = st.number_input("Zylinderoberkante bis Kanaloberkante (mm)", min_value=0.0, value=23.0, step=0.1)
+            breite_input = st.number_input("Kanalbreite (mm)", min_value=0.1, value=26.0, step=0.1)
+            hoehe_input = st.number_input("Kanalhöhe (mm)", min_value=0.1, value=18.0, step=0.1)
+            eckradius_input = st.number_input("Eckradius (mm)", min_value=0.0, value=4.0, step=0.1)
+            anzahl_input = st.number_input("Anzahl gleicher Kanäle", min_value=1, value=1, step=1)
+            aktuell.update(hub_mm=hub_input4, pleuel_mm=pleuel_input4, hubraum_ccm=hubraum_input4)
+            drehzahl_bereich = st.slider("Drehzahlbereich (U/min)", min_value=1000, max_value=20000, value=(4000, 12000), step=100)
+        
+        with col2:
+            try:
+                drehzahlen = np.arange(drehzahl_bereich[0], drehzahl_bereich[1] + 1, 100)
+                werte = zeitquerschnitt.spezifischer_zeitquerschnitt(
+                    drehzahlen, hubraum_input4, hub_input4, pleuel_input4,
+                    kante_input, breite_input, hoehe_input, eckradius_input, anzahl_input
+                )
+                st.line_chart(
+                    {"Drehzahl (U/min)": drehzahlen, "Zeitquerschnitt (s/m)": werte},
+                    x="Drehzahl (U/min)", y="Zeitquerschnitt (s/m)"
+                )
             except Exception as e:
                 st.error(f"Fehler bei der Berechnung: {e}")
     
@@ -294,21 +455,74 @@ elif tab_selection == "Werkzeuge":
         col1, col2 = st.columns([1, 2])
         
         with col1:
+            # Gespeicherter Zündwinkel des geladenen Motors aus den Gradscheiben-Markierungen
+            zuendwinkel_geladen = next(
+                (markierung["winkel"] for markierung in (geladen["ergebnisse"].get("gradscheibe") or {}).get("markierungen", [])
+                 if markierung["text"] == "Zündung"),
+                21.86,
+            )
             winkel_fuer_scheibe = st.number_input(
                 "Zündwinkel hervorheben (°)", 
                 min_value=0.0, 
                 max_value=360.0, 
-                value=21.86, 
+                value=zuendwinkel_geladen, 
                 step=0.1
             )
         
         with col2:
             try:
-                fig = plotte_gradscheibe(winkel_fuer_scheibe)
-                st.pyplot(fig)
-                plt.close(fig)  # Speicher freigeben
+                # Nur die Zündmarkierung wird neu gezeichnet, die Scheibe kommt aus dem Zwischenspeicher
+                # PNG-Bytes statt RGBA-Array: kleiner im Zwischenspeicher und ohne erneutes Kodieren pro Rerun
+                scheibe_png = gradscheibe_bild(winkel_fuer_scheibe)
+                st.image(scheibe_png)
+                st.download_button("Gradscheibe herunterladen (PNG)", scheibe_png, file_name="gradscheibe.png", mime="image/png")
             except Exception as e:
                 st.error(f"Fehler beim Erstellen der Gradscheibe: {e}")
+        
+        st.markdown("#### Stapelexport (maßstabsgetreu)")
+        scheiben_json = st.file_uploader(
+            "Scheiben-Liste (JSON)", type="json",
+            help='Liste von {"name": ..., "durchmesser_mm": ..., "markierungen": [{"winkel": ..., "text": ...}]}'
+        )
+        if scheiben_json is not None and st.button("PDF erzeugen"):
+            try:
+                with tempfile.TemporaryDirectory() as ordner:
+                    pfad = os.path.join(ordner, "gradscheiben.pdf")
+                    anzahl = exportiere_gradscheiben(json.loads(scheiben_json.getvalue()), pfad)
+                    with open(pfad, "rb") as datei:
+                        pdf_daten = datei.read()
+                st.success(f"{anzahl} Gradscheiben erzeugt.")
+                st.download_button("Gradscheiben herunterladen", pdf_daten, file_name="gradscheiben.pdf", mime="application/pdf")
+            except Exception as e:
+                st.error(f"Fehler beim Export: {e}")
+
+# Motor speichern, importieren und exportieren (nach den Eingaben, damit deren Werte vorliegen)
+with motor_speichern_bereich:
+    with st.expander("Motor speichern"):
+        motor_name = st.text_input("Name", value=geladen["name"])
+        motor_modell = st.text_input("Modell", value=geladen["modell"])
+        if st.button("Speichern", disabled=not motor_name.strip()):
+            st.session_state.motor_geladen = motor_speicher().speichere(
+                motor_name.strip(), {**geladen["eingaben"], **aktuell}, motor_modell.strip() or None
+            )
+            st.success(f"{motor_name.strip()} gespeichert.")
+    with st.expander("Import / Export"):
+        motoren_datei = st.file_uploader("Motoren (CSV oder JSON)", type=["csv", "json"])
+        if motoren_datei is not None and st.button("Importieren"):
+            try:
+                statistik = motor_speicher().importiere(
+                    io.StringIO(motoren_datei.getvalue().decode("utf-8")),
+                    "json" if motoren_datei.name.endswith(".json") else "csv",
+                )
+                st.success(f"{statistik['motoren']} Motoren importiert.")
+            except Exception as e:
+                st.error(f"Fehler beim Import: {e}")
+        motoren_csv = io.StringIO()
+        motor_speicher().exportiere(motoren_csv, "csv")
+        st.download_button("Alle Motoren exportieren (CSV)", motoren_csv.getvalue(), file_name="motoren.csv", mime="text/csv")
+
+with st.sidebar.expander("Cache-Statistik"):
+    st.table(cache_statistik())
 
 # Footer
 st.markdown("---")
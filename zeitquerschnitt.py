@@ -0,0 +1,121 @@
+"""
+Spezifischer Zeitquerschnitt der kolbengesteuerten Kanäle ohne UI-Abhängigkeiten.
+
+Die offene Kanalfläche wird über den Kurbelwinkel integriert (Kolbenweg aus
+kurbelwinkel_zu_hub_exakt) und durch Hubraum und Drehzahl geteilt:
+
+    Zeitquerschnitt = ∫ A dt / V_h = ∫ A dφ / (6 * n * V_h)
+
+Mit A in mm², φ in °KW, n in U/min und V_h in cm³ ergibt sich der Wert direkt in s/m.
+Das Winkelintegral hängt nur von der Geometrie ab und wird pro Geometrie einmal berechnet
+und zwischengespeichert; jede weitere Drehzahl kostet danach nur noch eine Division.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from kinematik import kurbelwinkel_zu_hub_exakt
+
+
+def _kreissegment_stammfunktion(t, radius):
+    # Stammfunktion von sqrt(R² - t²)
+    return 0.5 * (t * np.sqrt(np.maximum(radius**2 - t**2, 0)) + radius**2 * np.arcsin(np.clip(t / radius, -1, 1)))
+
+
+def kanalflaeche(oeffnung_mm, breite_mm, hoehe_mm, eckradius_mm=0.0):
+    """
+    Berechnet die freigegebene Fläche eines Kanals mit gerundeten Ecken.
+
+    Der Kanal ist ein Rechteck mit vier gleichen Eckradien und wird von der Oberkante her
+    vom Kolben freigegeben.
+
+    Args:
+        oeffnung_mm (float | np.ndarray): Freigegebene Höhe ab Kanaloberkante in mm.
+        breite_mm (float): Kanalbreite (Sehne) in mm.
+        hoehe_mm (float): Kanalhöhe in mm.
+        eckradius_mm (float): Eckradius in mm, 0 für scharfe Ecken.
+
+    Returns:
+        float | np.ndarray: Die offene Kanalfläche in mm².
+    """
+    oeffnung = np.clip(np.asarray(oeffnung_mm, dtype=float), 0, hoehe_mm)
+    flaeche = breite_mm * oeffnung
+    radius = min(eckradius_mm, breite_mm / 2, hoehe_mm / 2)
+    if radius > 0:
+        # Obere Ecken: pro Ecke fehlt ∫ (R - sqrt(R² - t²)) dt für t von R - y bis R
+        y = np.minimum(oeffnung, radius)
+        oben = radius * y - (_kreissegment_stammfunktion(radius, radius) - _kreissegment_stammfunktion(radius - y, radius))
+        # Untere Ecken: pro Ecke fehlt ∫ (R - sqrt(R² - t²)) dt für t von 0 bis v
+        v = np.clip(oeffnung - (hoehe_mm - radius), 0, radius)
+        unten = radius * v - _kreissegment_stammfunktion(v, radius)
+        flaeche = flaeche - 2 * (oben + unten)
+    return float(flaeche) if np.ndim(oeffnung_mm) == 0 else flaeche
+
+
+@lru_cache(maxsize=256)
+def kanalflaechen_profil(hub_mm, pleuelstange_mm, kante_mm, breite_mm, hoehe_mm, eckradius_mm=0.0, anzahl=1, schrittweite_grad=0.1):
+    """
+    Berechnet die offene Kanalfläche über eine Kurbelumdrehung, einmal pro Geometrie.
+
+    Args:
+        hub_mm (float): Der Gesamthub des Motors in mm.
+        pleuelstange_mm (float): Die Länge der Pleuelstange in mm.
+        kante_mm (float): Abstand Zylinderoberkante bis Kanaloberkante in mm.
+        breite_mm (float): Kanalbreite in mm.
+        hoehe_mm (float): Kanalhöhe in mm.
+        eckradius_mm (float): Eckradius in mm.
+        anzahl (int): Anzahl gleicher Kanäle (z.B. 2 Überströmer).
+        schrittweite_grad (float): Winkelauflösung in °KW.
+
+    Returns:
+        tuple: (Kurbelwinkel in °KW, offene Fläche in mm²) als schreibgeschützte Arrays.
+    """
+    # Eine Geometrie für alle Winkel: ungültig ist hier ein Fehler, nicht ein NaN-Profil
+    if pleuelstange_mm < hub_mm / 2.0:
+        raise ValueError("Pleuellänge muss größer als der Kurbelradius sein.")
+    winkel = np.arange(0.0, 360.0 + schrittweite_grad / 2, schrittweite_grad)
+    kolbenweg = kurbelwinkel_zu_hub_exakt(winkel, pleuelstange_mm, hub_mm)
+    flaeche = anzahl * kanalflaeche(kolbenweg - kante_mm, breite_mm, hoehe_mm, eckradius_mm)
+    # Das Profil wird geteilt zwischengespeichert und darf nicht verändert werden
+    winkel.flags.writeable = False
+    flaeche.flags.writeable = False
+    return winkel, flaeche
+
+
+@lru_cache(maxsize=256)
+def winkelquerschnitt(hub_mm, pleuelstange_mm, kante_mm, breite_mm, hoehe_mm, eckradius_mm=0.0, anzahl=1, schrittweite_grad=0.1):
+    """
+    Integriert die offene Kanalfläche über den Kurbelwinkel (Trapezregel).
+
+    Args: wie kanalflaechen_profil.
+
+    Returns:
+        float: ∫ A dφ in mm²·°KW.
+    """
+    winkel, flaeche = kanalflaechen_profil(
+        hub_mm, pleuelstange_mm, kante_mm, breite_mm, hoehe_mm, eckradius_mm, anzahl, schrittweite_grad
+    )
+    return float(np.sum((flaeche[1:] + flaeche[:-1]) * np.diff(winkel)) / 2)
+
+
+def spezifischer_zeitquerschnitt(drehzahl_upm, hubraum_ccm, hub_mm, pleuelstange_mm, kante_mm, breite_mm, hoehe_mm,
+                                 eckradius_mm=0.0, anzahl=1, schrittweite_grad=0.1):
+    """
+    Berechnet den spezifischen Zeitquerschnitt eines Kanals über einen Drehzahlbereich.
+
+    Args:
+        drehzahl_upm (float | np.ndarray): Drehzahl(en) in U/min, z.B. np.arange(4000, 12001, 100).
+        hubraum_ccm (float): Hubraum in cm³.
+        Übrige Args: wie kanalflaechen_profil.
+
+    Returns:
+        float | np.ndarray: Der spezifische Zeitquerschnitt in s/m.
+    """
+    integral = winkelquerschnitt(
+        float(hub_mm), float(pleuelstange_mm), float(kante_mm), float(breite_mm), float(hoehe_mm),
+        float(eckradius_mm), int(anzahl), float(schrittweite_grad)
+    )
+    drehzahl = np.asarray(drehzahl_upm, dtype=float)
+    with np.errstate(divide="ignore"):
+        ergebnis = integral / (6.0 * drehzahl * hubraum_ccm)
+    return float(ergebnis) if np.ndim(drehzahl_upm) == 0 else ergebnis